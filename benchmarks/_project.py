@@ -0,0 +1,63 @@
+"""Generate throwaway projects with many modules and models for benchmarks."""
+
+import sys
+import textwrap
+from pathlib import Path
+
+
+def make_project(root: Path, n_modules: int, n_models: int, package="benchproj"):
+    """
+    Write ``package`` under ``root`` with ``n_modules`` installed modules, each
+    declaring ``n_models`` models, and return the settings module path.
+    """
+    pkg = Path(root, package)
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+
+    labels = []
+    for i in range(n_modules):
+        label = f"mod{i}"
+        labels.append(f"{package}.{label}")
+        mod = pkg / label
+        mod.mkdir()
+        (mod / "__init__.py").write_text("")
+        models = ["from fastapi_backend.db import fields, models\n"]
+        for j in range(n_models):
+            models.append(
+                textwrap.dedent(
+                    f"""
+                    class {label.capitalize()}Item{j}(models.Model):
+                        id = fields.IntField(primary_key=True)
+                        name = fields.CharField(max_length=64)
+                        value = fields.IntField(default=0)
+                    """
+                )
+            )
+        (mod / "models.py").write_text("".join(models))
+
+    (pkg / "settings.py").write_text(
+        textwrap.dedent(
+            f"""
+            from pathlib import Path
+            from fastapi_backend.conf import DefaultSettings
+
+
+            class Settings(DefaultSettings):
+                BASE_DIR: Path = Path(__file__).parent
+                INSTALLED_MODULES: list[str] = {labels!r}
+
+
+            settings = Settings()
+            """
+        )
+    )
+    return f"{package}.settings"
+
+
+def subprocess_env(root: Path, settings_module: str) -> dict:
+    import os
+
+    env = dict(os.environ)
+    env["FASTAPI_SETTINGS_MODULE"] = settings_module
+    env["PYTHONPATH"] = os.pathsep.join([str(root), *sys.path])
+    return env
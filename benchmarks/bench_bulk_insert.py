@@ -0,0 +1,100 @@
+"""
+Importing rows into SQLite: a per-row ``create()`` loop, Tortoise's
+``bulk_create()`` and ``Model.insert_many()`` (multi-row INSERT ...
+RETURNING, chunks sized to the parameter limit), with and without a
+wrapping transaction.
+
+    python benchmarks/bench_bulk_insert.py [rows]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+
+
+class Item(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=64)
+    value = fields.IntField(default=0)
+
+    class Meta:
+        app = "bench"
+
+
+def items(rows: int) -> list[Item]:
+    return [Item(name=f"item{i}", value=i) for i in range(rows)]
+
+
+async def create_loop(objects):
+    for item in objects:
+        await item.save()
+
+
+async def create_loop_atomic(objects):
+    async with in_transaction():
+        await create_loop(objects)
+
+
+async def bulk_create(objects):
+    # executemany, primary keys are not returned
+    await Item.bulk_create(objects)
+
+
+async def insert_many(objects):
+    await Item.insert_many(objects)
+
+
+async def insert_many_atomic(objects):
+    await Item.insert_many(objects, atomic=True)
+
+
+async def timed(strategy, rows: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        await Tortoise.init(
+            config={
+                "connections": {
+                    "default": {
+                        "engine": "fastapi_backend.db.backends.sqlite",
+                        "credentials": {"file_path": str(Path(tmp, "bench.sqlite"))},
+                    }
+                },
+                "apps": {"bench": {"models": [__name__]}},
+            }
+        )
+        try:
+            await Tortoise.generate_schemas()
+            objects = items(rows)
+            start = time.perf_counter()
+            await strategy(objects)
+            elapsed = time.perf_counter() - start
+            assert await Item.all().count() == rows
+        finally:
+            await Tortoise.close_connections()
+    return elapsed
+
+
+def main(rows: int = 100_000):
+    strategies = [
+        create_loop,
+        create_loop_atomic,
+        bulk_create,
+        insert_many,
+        insert_many_atomic,
+    ]
+    print(f"{rows} rows into SQLite (instances built beforehand)")
+    print(f"{'strategy':>20} {'seconds':>8} {'rows/s':>10}")
+    for strategy in strategies:
+        elapsed = asyncio.run(timed(strategy, rows))
+        print(f"{strategy.__name__:>20} {elapsed:>8.2f} {rows / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,65 @@
+"""
+Cold-start cost of a scaffolding management command through the CLI.
+
+Runs ``createproject`` through the real ``cli()`` entry point, which resolves
+it from the core command manifest without loading settings or module
+configs, and through the same CLI with every installed module's commands
+discovered first, as any command requiring settings is. Every run is a
+fresh interpreter against a generated project, so the numbers include
+imports, settings validation and module config discovery.
+
+    python benchmarks/bench_cli_bootstrap.py [modules] [models-per-module]
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _project import make_project, subprocess_env
+
+RUNS = 5
+
+SNIPPETS = {
+    "cli": "from fastapi_backend.management import cli; cli({tokens!r})",
+    "full discovery": (
+        "from cyclopts import App;"
+        "from fastapi_backend.management.cli import lazy_autodiscover;"
+        "app = App(); lazy_autodiscover(app); app({tokens!r})"
+    ),
+}
+
+
+def main(n_modules: int = 40, n_models: int = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_module = make_project(Path(tmp), n_modules, n_models)
+        env = subprocess_env(Path(tmp), settings_module)
+        env["CACHE_DIR"] = str(Path(tmp, "cache"))
+        output = Path(tmp, "out")
+
+        print(f"{n_modules} modules x {n_models} models, best/median of {RUNS}")
+        results = {}
+        for label, snippet in SNIPPETS.items():
+            timings = []
+            # the first run warms pyc caches and writes the manifests
+            for run in range(RUNS + 1):
+                tokens = ["createproject", f"{label[0]}{run}", "--path", str(output)]
+                cmd = [sys.executable, "-c", snippet.format(tokens=tokens)]
+                start = time.perf_counter()
+                subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+                if run:
+                    timings.append(time.perf_counter() - start)
+            results[label] = min(timings)
+            print(
+                f"  {label:<15} best {min(timings) * 1000:8.1f} ms"
+                f"  median {statistics.median(timings) * 1000:8.1f} ms"
+            )
+
+        saved = results["full discovery"] - results["cli"]
+        print(f"  createproject saves {saved * 1000:.1f} ms per invocation")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,125 @@
+"""
+Encoding a list endpoint's rows as JSON: the pydantic path (a model from
+``pydantic_model_creator``, validation and ``jsonable_encoder``, once with
+the pydantic model created per request as endpoints commonly do) against
+``ModelJSONResponse`` and its compiled per-model serializer, for instances
+and ``values()`` rows. Times are CPU seconds per response.
+
+    python benchmarks/bench_model_serialization.py [rows] [repeat]
+"""
+
+import asyncio
+import datetime
+import decimal
+import functools
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from tortoise import Tortoise
+from tortoise.contrib.pydantic import pydantic_model_creator
+
+from fastapi_backend.core.responses import ModelJSONResponse
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+
+
+class Item(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=64)
+    description = fields.TextField(null=True)
+    price = fields.DecimalField(max_digits=10, decimal_places=2)
+    quantity = fields.IntField(default=0)
+    active = fields.BooleanField(default=True)
+    created = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        app = "bench"
+
+
+def pydantic_per_request(items, rows):
+    schema = pydantic_model_creator(Item, name=f"Item{time.perf_counter_ns()}")
+    data = [schema.model_validate(item) for item in items]
+    return JSONResponse(jsonable_encoder(data)).body
+
+
+@functools.cache
+def item_schema():
+    return pydantic_model_creator(Item, name="ItemCached")
+
+
+def pydantic_cached(items, rows):
+    data = [item_schema().model_validate(item) for item in items]
+    return JSONResponse(jsonable_encoder(data)).body
+
+
+def serializer_instances(items, rows):
+    return ModelJSONResponse(items).body
+
+
+def serializer_rows(items, rows):
+    return ModelJSONResponse(rows, model=Item).body
+
+
+async def load(rows: int, tmp: str):
+    await Tortoise.init(
+        config={
+            "connections": {
+                "default": {
+                    "engine": "fastapi_backend.db.backends.sqlite",
+                    "credentials": {"file_path": str(Path(tmp, "bench.sqlite"))},
+                }
+            },
+            "apps": {"bench": {"models": [__name__]}},
+        }
+    )
+    try:
+        await Tortoise.generate_schemas()
+        await Item.insert_many(
+            [
+                Item(
+                    name=f"item {i}",
+                    description="lorem ipsum " * 4 if i % 2 else None,
+                    price=decimal.Decimal(i) / 100,
+                    quantity=i,
+                    created=datetime.datetime.now(datetime.timezone.utc),
+                )
+                for i in range(rows)
+            ]
+        )
+        items = await Item.all()
+        values = await Item.all().values(*Item._meta.fields_db_projection)
+    finally:
+        await Tortoise.close_connections()
+    return items, values
+
+
+def main(rows: int = 5000, repeat: int = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        items, values = asyncio.run(load(rows, tmp))
+
+    strategies = [
+        pydantic_per_request,
+        pydantic_cached,
+        serializer_instances,
+        serializer_rows,
+    ]
+    print(f"{rows} rows per response, best of {repeat}")
+    print(f"{'strategy':>22} {'ms':>9} {'rows/s':>11} {'bytes':>9}")
+    for strategy in strategies:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.process_time()
+            body = strategy(items, values)
+            best = min(best, time.process_time() - start)
+        print(
+            f"{strategy.__name__:>22} {best * 1e3:>9.2f} "
+            f"{rows / best:>11.0f} {len(body):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
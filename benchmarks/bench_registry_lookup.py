@@ -0,0 +1,76 @@
+"""
+ModelMetaclass cost as the number of installed modules grows.
+
+Registers fake module configs on the global registry, then creates models
+spread across those modules, timing module lookup and the full metaclass.
+
+    python benchmarks/bench_registry_lookup.py [total-models]
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+from fastapi_backend.modules import ModuleConfig, modules
+
+
+class BenchConfig(ModuleConfig):
+    path = Path(".")
+
+
+def linear_lookup(obj_name):
+    """The previous scan-and-sort implementation, for comparison."""
+    candidates = []
+    for module_config in modules.module_configs.values():
+        if obj_name.startswith(module_config.name):
+            subpath = obj_name.removeprefix(module_config.name)
+            if subpath == "" or subpath[0] == ".":
+                candidates.append(module_config)
+    if candidates:
+        return sorted(candidates, key=lambda ac: -len(ac.name))[0]
+
+
+def per_call_us(func, names, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            func(name)
+        best = min(best, time.perf_counter() - start)
+    return best / len(names) * 1e6
+
+
+def main(total_models: int = 4000):
+    n_modules_steps = (10, 100, 500, 1000)
+    configs = [
+        BenchConfig(f"bench.pkg{i}.mod{i}", ModuleType(f"mod{i}"))
+        for i in range(max(n_modules_steps))
+    ]
+
+    print(f"{total_models} model lookups / class creations per step")
+    print(f"{'modules':>8} {'linear us':>10} {'trie us':>8} {'metaclass us':>13}")
+    for step, n_modules in enumerate(n_modules_steps):
+        modules.module_configs = {cfg.label: cfg for cfg in configs[:n_modules]}
+        modules._module_trie = modules._build_module_trie()
+
+        names = [f"{configs[i % n_modules].name}.models" for i in range(total_models)]
+        linear = per_call_us(linear_lookup, names, repeat=1)
+        lookup = per_call_us(modules.get_containing_module_config, names)
+
+        start = time.perf_counter()
+        for i, name in enumerate(names):
+            type(
+                f"S{step}Item{i}",
+                (Model,),
+                {"__module__": name, "id": fields.IntField(primary_key=True)},
+            )
+        metaclass = (time.perf_counter() - start) / total_models * 1e6
+
+        print(f"{n_modules:>8} {linear:>10.2f} {lookup:>8.2f} {metaclass:>13.2f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
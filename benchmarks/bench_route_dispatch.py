@@ -0,0 +1,98 @@
+"""
+Request dispatch cost as the number of routes grows, comparing FastAPI's
+linear route scan with the radix dispatcher.
+
+Routes are spread over module routers included under their own prefix, as
+create_app does for module ``routes`` submodules, plus routes declared on
+the application itself. Each request runs the full ASGI stack against a
+trivial endpoint.
+
+    python benchmarks/bench_route_dispatch.py [requests-per-step]
+"""
+
+import asyncio
+import sys
+import time
+
+from fastapi import APIRouter, FastAPI
+
+from fastapi_backend.core.routing import install_radix_dispatcher
+
+ROUTES_PER_MODULE = 50
+
+
+async def endpoint():
+    return None
+
+
+def build_app(n_routes: int, radix: bool) -> tuple[FastAPI, list[str]]:
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    paths = []
+    # half on the app itself, half in module routers
+    for i in range(n_routes // 2):
+        app.add_api_route(f"/app/res{i}/{{obj_id}}", endpoint)
+        paths.append(f"/app/res{i}/1")
+    for m in range(n_routes // 2 // ROUTES_PER_MODULE):
+        router = APIRouter()
+        for i in range(ROUTES_PER_MODULE):
+            router.add_api_route(f"/res{i}/{{obj_id}}", endpoint)
+            paths.append(f"/mod{m}/res{i}/1")
+        app.include_router(router, prefix=f"/mod{m}")
+    if radix:
+        install_radix_dispatcher(app)
+    return app, paths
+
+
+async def _drive(app, paths):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for path in paths:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("bench", 80),
+            "client": ("bench", 1),
+        }
+        await app(scope, receive, send)
+
+
+def per_request_us(app, paths, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(_drive(app, paths))
+        best = min(best, time.perf_counter() - start)
+    return best / len(paths) * 1e6
+
+
+def main(requests: int = 2000):
+    print(f"{requests} requests per step, best of 3")
+    print(f"{'routes':>7} {'linear us':>10} {'radix us':>9} {'speedup':>8}")
+    for n_routes in (100, 1000, 2000, 5000):
+        linear, paths = build_app(n_routes, radix=False)
+        radix, _ = build_app(n_routes, radix=True)
+        # spread requests evenly over every route
+        step = max(1, len(paths) // requests)
+        sample = (paths[::step] * (requests // len(paths[::step]) + 1))[:requests]
+        linear_us = per_request_us(linear, sample)
+        radix_us = per_request_us(radix, sample)
+        print(
+            f"{n_routes:>7} {linear_us:>10.1f} {radix_us:>9.1f} "
+            f"{linear_us / radix_us:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
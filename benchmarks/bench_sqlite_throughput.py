@@ -0,0 +1,99 @@
+"""
+SQLite read/write throughput: Tortoise's stock engine against the tuned
+``fastapi_backend.db.backends.sqlite`` engine (SQLITE_* pragmas, as built by
+``get_tortoise_config`` from default settings), without and with a read pool
+of SQLITE_READ_POOL_SIZE connections, so the pool's own effect on reads
+under concurrent writes shows apart from the pragmas'.
+
+Runs concurrent readers, concurrent writers and both at once, each for a
+fixed duration, and prints operations per second.
+
+    python benchmarks/bench_sqlite_throughput.py [concurrency] [seconds] [pool]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tortoise import Tortoise
+
+from fastapi_backend.conf import settings
+from fastapi_backend.db.config import _connection_config
+
+ROWS = 20_000
+READ = "SELECT COUNT(*), SUM(value) FROM item WHERE value % 7 = ?"
+WRITE = "INSERT INTO item (value) VALUES (?)"
+
+
+def tuned_credentials(path: Path, read_pool_size: int) -> dict:
+    project = settings.model_copy(
+        update={
+            "BASE_DIR": path.parent,
+            "DB_NAME": path.name,
+            "SQLITE_READ_POOL_SIZE": read_pool_size,
+        }
+    )
+    return _connection_config(project)
+
+
+async def run(connection: dict, concurrency: int, seconds: float) -> dict:
+    await Tortoise.init(
+        config={
+            "connections": {"default": connection},
+            "apps": {"bench": {"models": ["fastapi_backend.db.fields"]}},
+        }
+    )
+    conn = Tortoise.get_connection("default")
+    await conn.execute_script(
+        "CREATE TABLE item (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)"
+    )
+    await conn.execute_many(WRITE, [[i] for i in range(ROWS)])
+
+    async def worker(query, counter, stop):
+        i = 0
+        while time.perf_counter() < stop:
+            await conn.execute_query(query, [i % 7])
+            counter[0] += 1
+            i += 1
+
+    results = {}
+    for name, readers, writers in (
+        ("read", concurrency, 0),
+        ("write", 0, concurrency),
+        ("mixed", concurrency, concurrency),
+    ):
+        reads, writes = [0], [0]
+        stop = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(worker(READ, reads, stop) for _ in range(readers)),
+            *(worker(WRITE, writes, stop) for _ in range(writers)),
+        )
+        results[name] = (reads[0] / seconds, writes[0] / seconds)
+
+    await Tortoise.close_connections()
+    return results
+
+
+def main(concurrency: int = 8, seconds: float = 2.0, read_pool_size: int = 4):
+    setups = {
+        "stock": lambda path: {
+            "engine": "tortoise.backends.sqlite",
+            "credentials": {"file_path": str(path)},
+        },
+        "tuned": lambda path: tuned_credentials(path, 0),
+        "pooled": lambda path: tuned_credentials(path, read_pool_size),
+    }
+    print(f"{concurrency} concurrent tasks per role, {seconds}s per workload")
+    print(f"{'setup':>6} {'workload':>9} {'reads/s':>10} {'writes/s':>10}")
+    for setup, connection in setups.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "bench.sqlite")
+            results = asyncio.run(run(connection(path), concurrency, seconds))
+        for workload, (reads, writes) in results.items():
+            print(f"{setup:>6} {workload:>9} {reads:>10.0f} {writes:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(*(float(a) if "." in a else int(a) for a in sys.argv[1:]))
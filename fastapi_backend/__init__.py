@@ -1,5 +1,10 @@
 def setup():
+    from pathlib import Path
     from fastapi_backend.modules import modules
+    from fastapi_backend.modules.manifest import MANIFEST_FILE_NAME
     from fastapi_backend.conf import settings
 
-    modules.populate(settings.INSTALLED_MODULES)
+    modules.populate(
+        settings.INSTALLED_MODULES,
+        manifest=Path(settings.CACHE_DIR, MANIFEST_FILE_NAME),
+    )
@@ -1,3 +1,11 @@
-from .loader import DefaultSettings, settings
-
 __all__ = ["DefaultSettings", "settings"]
+
+
+def __getattr__(name: str):
+    # Importing the loader discovers the user settings module and validates
+    # it, so it only happens once settings are actually asked for.
+    if name in __all__:
+        from . import loader
+
+        return getattr(loader, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
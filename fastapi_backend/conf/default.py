@@ -1,11 +1,17 @@
+import hashlib
+import os
 from pathlib import Path
 from pydantic import Field, AnyUrl, field_validator
-from typing import Literal
+from typing import Any, Literal
 
 
 _SUPPORTED_DB_PROVIDER = Literal["postgresql", "sqlite"]
 _SUPPORTED_DB_DRIVER = Literal["psycopg2"]
 _SUPPORTED_DB_ASYNC_DRIVER = Literal["aiosqlite", "asyncpg"]
+_SQLITE_JOURNAL_MODE = Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL"]
+_SQLITE_SYNCHRONOUS = Literal["OFF", "NORMAL", "FULL", "EXTRA"]
+_SQLITE_TEMP_STORE = Literal["DEFAULT", "FILE", "MEMORY"]
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 _DB_PROVIDER_DRIVER_MAP = {
     "sqlite": {"sync": [None], "async": ["aiosqlite"]},
@@ -65,6 +71,15 @@ def _build_db_url(env: dict, mode: Literal["sync", "async"]):
     )
 
 
+def _default_cache_dir(env: dict) -> Path:
+    # per project in the user's cache directory, never inside an installed package
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    project = str(Path(env["BASE_DIR"]).resolve())
+    return Path(
+        root, "fastapi_backend", hashlib.sha1(project.encode()).hexdigest()[:16]
+    )
+
+
 class DefaultMixin:
     # GENERAL
     DEBUG: bool = True
@@ -73,6 +88,9 @@ class DefaultMixin:
 
     # FS
     BASE_DIR: Path = Path(__file__).parent.parent
+    # Command and module manifests and the OpenAPI document; by default a
+    # directory of BASE_DIR in the user's cache (XDG_CACHE_HOME)
+    CACHE_DIR: Path = Field(default_factory=_default_cache_dir)
 
     # DATABASE
     DB_PROVIDER: _SUPPORTED_DB_PROVIDER = "sqlite"
@@ -91,6 +109,31 @@ class DefaultMixin:
     DATABASE_ASYNC_URL: AnyUrl = Field(
         default_factory=lambda e: _build_db_url(e, "async")
     )
+    # Extra connections by alias; "default", built from the DB_* settings, is
+    # the primary. Values override DB_*/SQLITE_* settings for that connection
+    # and {"REPLICA": True} marks a read replica of the primary.
+    DATABASES: dict[str, dict[str, Any]] = {}
+    DATABASE_ROUTERS: list[str] = []
+
+    # DATABASE POOL
+    DB_POOL_MIN_SIZE: int = Field(default=1, ge=0)
+    DB_POOL_MAX_SIZE: int = Field(default=10, ge=1)
+    DB_POOL_MAX_IDLE_LIFETIME: float = 300.0
+    DB_POOL_ACQUIRE_TIMEOUT: float | None = None
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_CONNECT_TIMEOUT: float = 60.0
+
+    # SQLITE
+    SQLITE_JOURNAL_MODE: _SQLITE_JOURNAL_MODE = "WAL"
+    SQLITE_SYNCHRONOUS: _SQLITE_SYNCHRONOUS = "NORMAL"
+    SQLITE_MMAP_SIZE: int = Field(default=256 * 1024 * 1024, ge=0)
+    SQLITE_CACHE_SIZE: int = -64000  # negative: KiB, positive: pages
+    SQLITE_BUSY_TIMEOUT: int = Field(default=5000, ge=0)  # ms
+    SQLITE_TEMP_STORE: _SQLITE_TEMP_STORE = "MEMORY"
+    # Read-only connections serving SELECTs outside transactions (WAL only);
+    # off by default as reads measured slower under concurrent writes, see
+    # benchmarks/bench_sqlite_throughput.py
+    SQLITE_READ_POOL_SIZE: int = Field(default=0, ge=0)
 
     @field_validator("DB_DRIVER")
     @classmethod
@@ -102,5 +145,64 @@ class DefaultMixin:
     def validate_async_driver(cls, v, info):
         return _validate_driver_field(v, info, "async")
 
+    # QUERY CACHE
+    # e.g. "fastapi_backend.db.cache.LocMemQueryCache"; None disables cached()
+    QUERY_CACHE_BACKEND: str | None = None
+    QUERY_CACHE_TTL: float | None = 60.0
+    QUERY_CACHE_OPTIONS: dict[str, Any] = {}
+
+    # CACHES
+    # Cache backends by alias, each {"BACKEND": dotted path, "TIMEOUT":
+    # seconds or None, "KEY_PREFIX": str, "OPTIONS": backend kwargs}
+    CACHES: dict[str, dict[str, Any]] = {
+        "default": {"BACKEND": "fastapi_backend.core.cache.backends.LocMemCache"}
+    }
+    # Serve responses of endpoints marked with cache_response() from CACHES;
+    # off by default as cache hits skip routing and the endpoint's dependencies
+    RESPONSE_CACHE: bool = False
+
+    # METRICS
+    # Per route request and database time histograms, and a Server-Timing
+    # header with the database time of each response
+    REQUEST_METRICS: bool = True
+    REQUEST_METRICS_SERVER_TIMING: bool = True
+    REQUEST_METRICS_BUCKETS: list[float] = list(_LATENCY_BUCKETS)
+    # Path of the Prometheus text endpoint, e.g. "/metrics"; off by default as
+    # it exposes routes, pools and caches to anyone who can reach the app, so
+    # only enable it where that path is kept private (by a proxy or network)
+    METRICS_PATH: str | None = None
+
+    # N+1 DETECTION
+    # With DEBUG on, a SELECT shape run this many times from one call site
+    # during a request is reported by warning, logging or raising
+    NPLUSONE_THRESHOLD: int = Field(default=5, ge=2)
+    NPLUSONE_ACTION: Literal["warn", "log", "raise"] = "warn"
+
+    # DATALOADER
+    # Batch lazy relation loads awaited together during a request into one
+    # query per relation and keep their results for the rest of the request
+    DATALOADER: bool = True
+
+    # ROUTING
+    # Match requests through a tree of static path segments compiled at
+    # startup instead of trying every route in turn
+    RADIX_ROUTING: bool = False
+
+    # OPENAPI
+    # Serve an OpenAPI document built at startup once per fingerprint of the
+    # installed modules, models and routes and kept under CACHE_DIR between
+    # starts
+    OPENAPI_PRECOMPUTE: bool = True
+    OPENAPI_GZIP: bool = True
+
     # MODULES
     INSTALLED_MODULES: list[str] = []
+    MODULES_READY_TIMEOUT: float | None = 30.0
+    MODULES_READY_SLOW_THRESHOLD: float | None = 1.0
+    # Build per-model SQL and serializers and await ModuleConfig.warmup()
+    # during startup, after the ready() hooks
+    MODULES_WARMUP: bool = True
+    MODULES_WARMUP_TIMEOUT: float | None = 60.0
+    # 503 until startup and warmup finished, then 200 with their timings;
+    # None disables it
+    READINESS_PATH: str | None = "/ready"
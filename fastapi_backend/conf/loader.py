@@ -3,6 +3,7 @@ import sys
 from typing import Any, ClassVar, Self
 from pydantic_settings import BaseSettings
 from .default import DefaultMixin
+from fastapi_backend.utils.profiling import span
 import os
 import importlib
 import warnings
@@ -32,7 +33,8 @@ def _autodiscover_once() -> None:
         if module:
             _autodiscover_in_progress = True
             try:
-                importlib.import_module(module)
+                with span("settings.autodiscover", module):
+                    importlib.import_module(module)
             finally:
                 _autodiscover_in_progress = False
         _autodiscover_done = True
@@ -60,7 +62,8 @@ class DefaultSettings(DefaultMixin, BaseSettings):
 
     def __init__(self, **values):
         # normal pydantic-settings init (env parsing/validation)
-        super().__init__(**values)
+        with span("settings.validate", self.__class__.__qualname__):
+            super().__init__(**values)
 
         # Apply subclass defaults *only for real pydantic fields*
         cls = self.__class__
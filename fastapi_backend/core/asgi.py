@@ -1,18 +1,119 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from pathlib import Path
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from tortoise.contrib.fastapi import register_tortoise
 from fastapi_backend.conf import settings
+from fastapi_backend.db.config import get_tortoise_config, uses_routing
+from fastapi_backend.db.routers import RoutingScopeMiddleware
 from fastapi_backend.modules import modules
+from fastapi_backend.utils.profiling import span
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.ready_timings = await modules.run_ready_hooks(
+        timeout=settings.MODULES_READY_TIMEOUT,
+        slow_threshold=settings.MODULES_READY_SLOW_THRESHOLD,
+    )
+    app.state.warmup_timings = {}
+    if settings.MODULES_WARMUP:
+        app.state.warmup_timings = await modules.run_warmup(
+            timeout=settings.MODULES_WARMUP_TIMEOUT,
+            slow_threshold=settings.MODULES_READY_SLOW_THRESHOLD,
+        )
+    if settings.OPENAPI_PRECOMPUTE:
+        # at startup, so routes added after create_app() are documented too
+        from fastapi_backend.core.openapi import OPENAPI_DIR_NAME, precompute_openapi
+
+        with span("openapi.precompute"):
+            precompute_openapi(
+                app,
+                modules,
+                Path(settings.CACHE_DIR, OPENAPI_DIR_NAME),
+                compress=settings.OPENAPI_GZIP,
+            )
+    app.state.ready = True
+    yield
+
+
+async def readiness(request: Request):
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        return JSONResponse({"ready": False}, status_code=503)
+    return JSONResponse(
+        {
+            "ready": True,
+            "ready_timings": state.ready_timings,
+            "warmup_timings": state.warmup_timings,
+        }
+    )
 
 
 def create_app():
 
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
 
     # Register ORM Context
-    register_tortoise(
-        app,
-        db_url=str(settings.DATABASE_ASYNC_URL),
-        modules=modules.to_tortoise_modules(),
-    )
+    with span("tortoise.register"):
+        register_tortoise(app, config=get_tortoise_config())
+
+    for module_config in modules.module_configs.values():
+        if module_config.router is not None:
+            with span("routes.include", module_config.label):
+                app.include_router(
+                    module_config.router, prefix=module_config.get_routes_prefix()
+                )
+
+    if uses_routing(settings, modules):
+        app.add_middleware(RoutingScopeMiddleware)
+
+    if settings.DATALOADER:
+        from fastapi_backend.db.loader import DataLoaderMiddleware
+
+        app.add_middleware(DataLoaderMiddleware)
+
+    if settings.DEBUG:
+        from fastapi_backend.db.nplusone import NPlusOneMiddleware
+
+        app.add_middleware(
+            NPlusOneMiddleware,
+            threshold=settings.NPLUSONE_THRESHOLD,
+            action=settings.NPLUSONE_ACTION,
+        )
+
+    if settings.RESPONSE_CACHE:
+        from fastapi_backend.core.cache import ResponseCacheMiddleware
+
+        app.add_middleware(ResponseCacheMiddleware)
+
+    if settings.REQUEST_METRICS:
+        from fastapi_backend.core.metrics import (
+            RequestMetrics,
+            RequestMetricsMiddleware,
+            metrics_endpoint,
+        )
+
+        app.state.request_metrics = RequestMetrics(settings.REQUEST_METRICS_BUCKETS)
+        app.add_middleware(
+            RequestMetricsMiddleware,
+            metrics=app.state.request_metrics,
+            server_timing=settings.REQUEST_METRICS_SERVER_TIMING,
+        )
+        if settings.METRICS_PATH:
+            app.add_route(
+                settings.METRICS_PATH,
+                metrics_endpoint(app.state.request_metrics),
+                include_in_schema=False,
+            )
+
+    if settings.READINESS_PATH:
+        app.add_route(settings.READINESS_PATH, readiness, include_in_schema=False)
+
+    if settings.RADIX_ROUTING:
+        from fastapi_backend.core.routing import install_radix_dispatcher
+
+        install_radix_dispatcher(app)
 
     return app
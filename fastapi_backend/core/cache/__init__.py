@@ -0,0 +1,15 @@
+from .backends import DEFAULT_TIMEOUT, MISSING, BaseCache
+from .caches import get_cache, invalidate_tags, model_tag, use_tags
+from .middleware import ResponseCacheMiddleware, cache_response
+
+__all__ = [
+    "DEFAULT_TIMEOUT",
+    "MISSING",
+    "BaseCache",
+    "ResponseCacheMiddleware",
+    "cache_response",
+    "get_cache",
+    "invalidate_tags",
+    "model_tag",
+    "use_tags",
+]
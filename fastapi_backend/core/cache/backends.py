@@ -0,0 +1,253 @@
+"""
+Cache backends configured through the CACHES setting.
+
+Values are pickled. Besides plain keys every backend keeps a version per
+tag: ``bump_tags()`` changes the versions of its tags, and callers storing
+entries under tags compare the versions they stored with the current ones
+(see ``fastapi_backend.core.cache.middleware``).
+"""
+
+import asyncio
+import hashlib
+import os
+import pickle
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+MISSING = object()
+DEFAULT_TIMEOUT = object()
+
+
+class BaseCache:
+    """
+    Backend interface. ``timeout`` is the default lifetime of entries in
+    seconds, None for no expiry.
+    """
+
+    def __init__(self, timeout: float | None = 300, key_prefix: str = ""):
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    def make_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}" if self.key_prefix else key
+
+    def get_expiry(self, timeout) -> float | None:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        return None if timeout is None else time.time() + timeout
+
+    async def get(self, key: str) -> Any:
+        """Return the value stored for ``key`` or ``MISSING``."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, timeout=DEFAULT_TIMEOUT):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+    async def get_tag_versions(self, tags: list[str]) -> list:
+        raise NotImplementedError
+
+    async def bump_tags(self, tags: list[str]):
+        raise NotImplementedError
+
+
+class LocMemCache(BaseCache):
+    """
+    Per-process LRU evicting beyond ``max_entries`` entries or ``max_size``
+    bytes of pickled values. Tags bumped in other processes aren't seen.
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = 300,
+        key_prefix: str = "",
+        max_entries: int = 1024,
+        max_size: int | None = 64 * 1024 * 1024,
+    ):
+        super().__init__(timeout, key_prefix)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+        self._tags: dict[str, int] = {}
+
+    def _pop(self, key: str):
+        _, data = self._entries.pop(key)
+        self.size -= len(data)
+
+    async def get(self, key):
+        key = self.make_key(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        expires, data = entry
+        if expires is not None and expires <= time.time():
+            self._pop(key)
+            return MISSING
+        self._entries.move_to_end(key)
+        return pickle.loads(data)
+
+    async def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        key = self.make_key(key)
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if self.max_size is not None and len(data) > self.max_size:
+            return
+        if key in self._entries:
+            self._pop(key)
+        self._entries[key] = (self.get_expiry(timeout), data)
+        self.size += len(data)
+        while len(self._entries) > self.max_entries or (
+            self.max_size is not None and self.size > self.max_size
+        ):
+            self._pop(next(iter(self._entries)))
+
+    async def delete(self, key):
+        key = self.make_key(key)
+        if key in self._entries:
+            self._pop(key)
+
+    async def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+        self.size = 0
+
+    async def get_tag_versions(self, tags):
+        return [self._tags.get(self.make_key(tag), 0) for tag in tags]
+
+    async def bump_tags(self, tags):
+        for tag in map(self.make_key, tags):
+            self._tags[tag] = self._tags.get(tag, 0) + 1
+
+
+class FileBasedCache(BaseCache):
+    """
+    Entries as files under ``location``, shared by every worker of a host.
+    Files are replaced atomically; beyond ``max_entries`` the oldest third is
+    removed. Tag versions are random tokens, so concurrent bumps from two
+    workers can't end on a version an entry was stored with.
+
+    File I/O runs in a worker thread. As entries are unpickled, directories
+    are created private to the user and files owned by another are ignored.
+    """
+
+    cache_suffix = ".cache"
+    cull_every = 32
+
+    def __init__(
+        self,
+        location: str | Path,
+        timeout: float | None = 300,
+        key_prefix: str = "",
+        max_entries: int = 10000,
+    ):
+        super().__init__(timeout, key_prefix)
+        self.location = Path(location)
+        self.max_entries = max_entries
+        self._tags_dir = self.location / "tags"
+        self._sets = 0
+
+    def _path(self, directory: Path, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return directory / f"{digest}{self.cache_suffix}"
+
+    def _write(self, path: Path, data: bytes):
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read(path: Path) -> bytes:
+        with open(path, "rb") as f:
+            if hasattr(os, "getuid") and os.fstat(f.fileno()).st_uid != os.getuid():
+                raise PermissionError(f"{path} is owned by another user")
+            return f.read()
+
+    def _entry_files(self) -> list[Path]:
+        try:
+            return list(self.location.glob(f"*{self.cache_suffix}"))
+        except OSError:
+            return []
+
+    def _cull(self):
+        files = self._entry_files()
+        if len(files) <= self.max_entries:
+            return
+
+        def mtime(path):
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0
+
+        for path in sorted(files, key=mtime)[: max(len(files) // 3, 1)]:
+            path.unlink(missing_ok=True)
+
+    def _get(self, key):
+        path = self._path(self.location, self.make_key(key))
+        try:
+            expires, value = pickle.loads(self._read(path))
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return MISSING
+        if expires is not None and expires <= time.time():
+            path.unlink(missing_ok=True)
+            return MISSING
+        return value
+
+    def _set(self, key, value, timeout, cull: bool):
+        path = self._path(self.location, self.make_key(key))
+        data = pickle.dumps((self.get_expiry(timeout), value), pickle.HIGHEST_PROTOCOL)
+        self._write(path, data)
+        if cull:
+            self._cull()
+
+    def _clear(self):
+        for path in self._entry_files():
+            path.unlink(missing_ok=True)
+        for path in self._tags_dir.glob(f"*{self.cache_suffix}"):
+            path.unlink(missing_ok=True)
+
+    def _get_tag_versions(self, tags):
+        versions = []
+        for tag in tags:
+            try:
+                path = self._path(self._tags_dir, self.make_key(tag))
+                versions.append(self._read(path).decode())
+            except OSError:
+                versions.append("0")
+        return versions
+
+    def _bump_tags(self, tags):
+        for tag in map(self.make_key, tags):
+            self._write(self._path(self._tags_dir, tag), os.urandom(8).hex().encode())
+
+    async def get(self, key):
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        # listing the directory is O(entries); only do it every few writes
+        self._sets += 1
+        cull = not self._sets % self.cull_every
+        await asyncio.to_thread(self._set, key, value, timeout, cull)
+
+    async def delete(self, key):
+        path = self._path(self.location, self.make_key(key))
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+
+    async def clear(self):
+        await asyncio.to_thread(self._clear)
+
+    async def get_tag_versions(self, tags):
+        return await asyncio.to_thread(self._get_tag_versions, tags)
+
+    async def bump_tags(self, tags):
+        await asyncio.to_thread(self._bump_tags, tags)
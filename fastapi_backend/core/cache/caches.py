@@ -0,0 +1,60 @@
+"""
+Caches configured by alias in the CACHES setting:
+
+    CACHES = {
+        "default": {"BACKEND": "fastapi_backend.core.cache.backends.LocMemCache"},
+        "shared": {
+            "BACKEND": "fastapi_backend.core.cache.backends.FileBasedCache",
+            "TIMEOUT": 600,
+            "OPTIONS": {"location": "/var/tmp/app-cache"},
+        },
+    }
+
+``cache_response`` stores endpoint responses in them. Entries tagged with a
+model expire whenever rows of that model are written, which bumps the tag
+in the aliases that hold tagged entries only (see ``use_tags``).
+"""
+
+from fastapi_backend.utils.loaders import import_string
+from .backends import BaseCache
+
+_caches: dict[str, BaseCache] = {}
+# aliases storing entries under tags
+_tagged_aliases: set[str] = set()
+
+
+def get_cache(alias: str = "default") -> BaseCache:
+    """The backend configured for ``alias``, created on first use."""
+    cache = _caches.get(alias)
+    if cache is None:
+        from fastapi_backend.conf import settings
+
+        try:
+            config = settings.CACHES[alias]
+        except KeyError:
+            raise ValueError(f"The cache {alias!r} isn't configured in CACHES")
+        backend = import_string(config["BACKEND"])
+        cache = _caches[alias] = backend(
+            timeout=config.get("TIMEOUT", 300),
+            key_prefix=config.get("KEY_PREFIX", ""),
+            **config.get("OPTIONS", {}),
+        )
+    return cache
+
+
+def model_tag(model) -> str:
+    return f"model:{model._meta.app}.{model.__name__}"
+
+
+def use_tags(alias: str = "default"):
+    """Have ``invalidate_tags()`` bump tags in the ``alias`` cache."""
+    _tagged_aliases.add(alias)
+
+
+async def invalidate_tags(*tags: str):
+    """Expire the entries stored under any of ``tags`` in every cache using tags."""
+    from fastapi_backend.conf import settings
+
+    for alias in settings.CACHES:
+        if alias in _tagged_aliases:
+            await get_cache(alias).bump_tags(list(tags))
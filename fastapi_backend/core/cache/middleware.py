@@ -0,0 +1,378 @@
+"""
+Response caching for endpoints marked with ``cache_response``.
+
+    @router.get("/products/{product_id}")
+    @cache_response(600, tags=[Product], vary=["accept-language"])
+    async def product(product_id: int): ...
+
+``ResponseCacheMiddleware`` stores the complete successful responses (status,
+headers and body bytes) of marked endpoints to GET requests, keyed by path,
+query string and the values of the request headers the endpoint or its
+response (in its Vary header) varies on, and answers later GET and HEAD
+requests from them without routing or running the endpoint. Every stored
+response gets an ETag, and requests whose If-None-Match matches it get a 304.
+
+As hits skip the endpoint's dependencies (authentication, permissions, rate
+limits), endpoints with dependencies, their route's or router's included,
+are refused unless marked with ``skip_dependencies=True``. Requests with
+credentials (Authorization or Cookie headers) are neither answered from nor
+stored in the cache unless the endpoint lists the header in ``vary``, and
+neither are responses varying on undeclared credentials.
+
+As in Django's cache middleware, the options of an endpoint and the headers
+its responses vary on are learned per path from its first response, so
+cached responses are found before routing; that first response is not
+stored. Only paths matching the route of a marked endpoint are looked up.
+Entries record the versions of their tags from before the endpoint ran and
+are ignored once any of them changed, e.g. after a write to a tagged model
+(see ``fastapi_backend.db.cache``).
+"""
+
+import hashlib
+import inspect
+import re
+import warnings
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+from starlette._utils import get_route_path
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Mount, compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from fastapi_backend.core.routing import route_template
+from .backends import DEFAULT_TIMEOUT, MISSING
+from .caches import get_cache, model_tag, use_tags
+
+# request headers carrying credentials
+PRIVATE_HEADERS = ("authorization", "cookie")
+
+
+@dataclass(frozen=True)
+class CacheOptions:
+    timeout: Any
+    tags: tuple[str, ...]
+    vary: tuple[str, ...]
+    cache: str
+    skip_dependencies: bool = False
+
+
+class LearnedOptions(NamedTuple):
+    options: CacheOptions
+    # request headers keying the entries: the declared and the response's
+    vary: tuple[str, ...]
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    # route template, reported to per-route metrics on hits
+    route: str | None
+    tag_versions: tuple
+
+
+class CachedRoute(NamedTuple):
+    path: str
+
+
+def cache_response(
+    timeout: float | None = DEFAULT_TIMEOUT,
+    *,
+    tags=(),
+    vary=(),
+    cache: str = "default",
+    skip_dependencies: bool = False,
+):
+    """
+    Mark an endpoint whose responses ``ResponseCacheMiddleware`` stores for
+    ``timeout`` seconds (the cache's TIMEOUT by default) in the ``cache``
+    alias. ``tags`` are strings or models, ``vary`` request header names;
+    list "authorization" or "cookie" there to cache responses per credentials.
+
+    Cache hits don't run the endpoint's dependencies, so endpoints with any
+    are refused unless ``skip_dependencies`` says every client may get the
+    responses stored for another, e.g. when a dependency only parses input.
+    """
+    options = CacheOptions(
+        timeout,
+        tuple(tag if isinstance(tag, str) else model_tag(tag) for tag in tags),
+        tuple(header.lower() for header in vary),
+        cache,
+        skip_dependencies,
+    )
+
+    def decorator(endpoint):
+        if not skip_dependencies and _declares_dependencies(endpoint):
+            raise RuntimeError(
+                f"{endpoint.__qualname__} has dependencies that cached responses "
+                "would skip; pass skip_dependencies=True to cache it anyway"
+            )
+        if options.tags:
+            use_tags(options.cache)
+        endpoint.__response_cache__ = options
+        return endpoint
+
+    return decorator
+
+
+def _declares_dependencies(endpoint) -> bool:
+    """Whether a parameter of ``endpoint`` is a ``Depends()`` or ``Security()``."""
+    from fastapi.params import Depends
+
+    for parameter in inspect.signature(endpoint).parameters.values():
+        if isinstance(parameter.default, Depends):
+            return True
+        metadata = getattr(parameter.annotation, "__metadata__", ())
+        if any(isinstance(item, Depends) for item in metadata):
+            return True
+    return False
+
+
+def _has_dependencies(route, inherited: bool = False) -> bool:
+    dependant = getattr(route, "dependant", None)
+    return inherited or bool(getattr(dependant, "dependencies", None))
+
+
+def _endpoint_options(scope: Scope) -> CacheOptions | None:
+    """Options of the endpoint that handled ``scope`` if it may be cached."""
+    route = scope.get("route")
+    options = getattr(getattr(route, "endpoint", None), "__response_cache__", None)
+    if options is None or options.skip_dependencies:
+        return options
+    # an included route's dependencies are those of its inclusion
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    if _has_dependencies(context or route):
+        return None
+    return options
+
+
+def _cached_route_patterns(routes, prefix: str = "", dependencies: bool = False):
+    """Path regexes of the routes of endpoints marked with ``cache_response``."""
+    for route in routes:
+        context = getattr(route, "include_context", None)
+        if context is not None:
+            yield from _cached_route_patterns(
+                route.original_router.routes,
+                prefix + context.prefix,
+                dependencies or bool(context.dependencies),
+            )
+        elif isinstance(route, Mount):
+            yield from _cached_route_patterns(
+                route.routes, prefix + route.path, dependencies
+            )
+        else:
+            endpoint = getattr(route, "endpoint", None)
+            options = getattr(endpoint, "__response_cache__", None)
+            if options is None:
+                continue
+            if not options.skip_dependencies and _has_dependencies(route, dependencies):
+                warnings.warn(
+                    f"{prefix + route.path} is not cached: {endpoint.__qualname__} "
+                    "has route or router dependencies that cached responses would "
+                    "skip; pass skip_dependencies=True to cache_response() to "
+                    "cache it anyway",
+                    stacklevel=2,
+                )
+                continue
+            yield compile_path(prefix + route.path)[0]
+
+
+def _etag_matches(headers: Headers, etag: str) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _storable(message: Message) -> bool:
+    headers = Headers(raw=message["headers"])
+    cache_control = headers.get("cache-control", "").lower()
+    return (
+        message["status"] == 200
+        and "set-cookie" not in headers
+        and "private" not in cache_control
+        and "no-store" not in cache_control
+    )
+
+
+def _response_vary(message: Message) -> tuple[str, ...] | None:
+    """Request headers the response varies on, None for ``Vary: *``."""
+    names = []
+    for value in Headers(raw=message["headers"]).getlist("vary"):
+        for name in value.split(","):
+            name = name.strip().lower()
+            if name == "*":
+                return None
+            if name and name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+def _has_credentials(headers: Headers, declared: tuple[str, ...]) -> bool:
+    """Whether the request carries credentials the endpoint doesn't vary on."""
+    return any(name in headers and name not in declared for name in PRIVATE_HEADERS)
+
+
+class ResponseCacheMiddleware:
+    def __init__(self, app: ASGIApp, cache: str = "default"):
+        self.app = app
+        # holds the options learned per path
+        self.cache_alias = cache
+        self._patterns: re.Pattern | None = None
+        self._routes_count = -1
+
+    @staticmethod
+    def _path(scope: Scope) -> str:
+        return scope.get("root_path", "") + scope["path"]
+
+    def _key(self, scope: Scope, headers: Headers, vary: tuple[str, ...]) -> str:
+        parts = [self._path(scope), scope["query_string"].decode("latin-1")]
+        parts.extend(f"{name}:{headers.get(name, '')}" for name in vary)
+        digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()
+        return f"response:{digest}"
+
+    def _may_be_cached(self, scope: Scope) -> bool:
+        """Whether the path matches the route of a marked endpoint."""
+        app = scope.get("app")
+        routes = getattr(app, "routes", None)
+        if routes is None:
+            return True
+        if len(routes) != self._routes_count:
+            patterns = [p.pattern for p in _cached_route_patterns(routes)]
+            self._patterns = re.compile("|".join(patterns)) if patterns else None
+            self._routes_count = len(routes)
+        return (
+            self._patterns is not None
+            and self._patterns.match(get_route_path(scope)) is not None
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not self._may_be_cached(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        path_key = f"response-options:{self._path(scope)}"
+        learned = await get_cache(self.cache_alias).get(path_key)
+        key = tag_versions = None
+        if learned is not MISSING:
+            if _has_credentials(headers, learned.options.vary):
+                await self.app(scope, receive, send)
+                return
+            cache = get_cache(learned.options.cache)
+            key = self._key(scope, headers, learned.vary)
+            tag_versions = tuple(
+                await cache.get_tag_versions(list(learned.options.tags))
+            )
+            entry = await cache.get(key)
+            if entry is not MISSING and entry.tag_versions == tag_versions:
+                if entry.route is not None:
+                    scope["route"] = CachedRoute(entry.route)
+                await self._send_cached(scope, headers, entry, send)
+                return
+
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks = []
+        passthrough = False
+
+        async def capture(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                endpoint_options = _endpoint_options(scope)
+                if endpoint_options is None and learned is not MISSING:
+                    # the endpoint isn't cached anymore
+                    await get_cache(self.cache_alias).delete(path_key)
+                response_vary = _response_vary(message)
+                if (
+                    endpoint_options is None
+                    or response_vary is None
+                    or not _storable(message)
+                    or _has_credentials(headers, endpoint_options.vary)
+                    or any(
+                        name in PRIVATE_HEADERS and name not in endpoint_options.vary
+                        for name in response_vary
+                    )
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                vary = tuple(dict.fromkeys(endpoint_options.vary + response_vary))
+                if LearnedOptions(endpoint_options, vary) != learned:
+                    # learn the options now, store from the next request on
+                    await get_cache(self.cache_alias).set(
+                        path_key, LearnedOptions(endpoint_options, vary), None
+                    )
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._store_and_send(
+                scope, headers, learned.options, key, tag_versions, start, chunks, send
+            )
+
+        await self.app(scope, receive, capture)
+
+    async def _store_and_send(
+        self, scope, headers, options, key, tag_versions, start, chunks, send
+    ):
+        body = b"".join(chunks)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        response_headers = MutableHeaders(raw=list(start["headers"]))
+        response_headers["etag"] = etag
+        for name in options.vary:
+            response_headers.add_vary_header(name)
+
+        route = route_template(scope)
+        entry = CachedResponse(
+            start["status"], response_headers.raw, body, etag, route, tag_versions
+        )
+        await get_cache(options.cache).set(key, entry, options.timeout)
+        await self._send_cached(scope, headers, entry, send)
+
+    async def _send_cached(
+        self, scope: Scope, headers: Headers, entry: CachedResponse, send: Send
+    ):
+        if _etag_matches(headers, entry.etag):
+            not_modified = [
+                (name, value)
+                for name, value in entry.headers
+                if name in (b"etag", b"vary", b"cache-control")
+            ]
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": not_modified,
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": entry.headers,
+            }
+        )
+        body = b"" if scope["method"] == "HEAD" else entry.body
+        await send({"type": "http.response.body", "body": body})
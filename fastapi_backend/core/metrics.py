@@ -0,0 +1,179 @@
+"""
+Request metrics in the Prometheus text format.
+
+``RequestMetricsMiddleware`` runs every HTTP request in ``track_queries()``,
+sends the collected database stats as a ``Server-Timing`` header and adds
+them, per method and route template, to the histograms ``metrics_endpoint``
+exposes along with the connection pool metrics.
+"""
+
+import bisect
+import time
+from fastapi.responses import PlainTextResponse
+from fastapi_backend.core.routing import route_template
+from fastapi_backend.db.backends.pool import get_pool_metrics
+from fastapi_backend.db.instrumentation import track_queries
+from fastapi_backend.utils.memoize import get_memoize_metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+# Other request methods share one label, so clients can't add series at will
+HTTP_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "DELETE", "CONNECT", "OPTIONS", "TRACE", "PATCH")
+)
+OTHER_METHOD = "other"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        """(le, cumulative count) pairs, ending with "+Inf"."""
+        total = 0
+        for le, count in zip([*self.buckets, "+Inf"], self.counts):
+            total += count
+            yield le, total
+
+
+def _labels(labels: dict) -> str:
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{k}="{escape(v)}"' for k, v in labels.items())
+
+
+class RequestMetrics:
+    """Per route histograms of request and database time, queries and pool wait."""
+
+    HISTOGRAMS = {
+        "http_request_duration_seconds": "Request duration",
+        "http_request_db_duration_seconds": "Database time per request",
+        "http_request_db_pool_wait_seconds": "Connection wait time per request",
+        "http_request_db_queries": "Queries per request",
+        "http_request_db_rows": "Rows returned per request",
+    }
+    COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.routes: dict[tuple[str, str], dict[str, Histogram]] = {}
+
+    def observe(self, method: str, route: str, duration: float, stats):
+        histograms = self.routes.get((method, route))
+        if histograms is None:
+            histograms = self.routes[(method, route)] = {
+                name: Histogram(
+                    self.COUNT_BUCKETS
+                    if name.endswith(("queries", "rows"))
+                    else self.buckets
+                )
+                for name in self.HISTOGRAMS
+            }
+        histograms["http_request_duration_seconds"].observe(duration)
+        histograms["http_request_db_duration_seconds"].observe(stats.seconds_total)
+        histograms["http_request_db_pool_wait_seconds"].observe(stats.pool_wait_seconds)
+        histograms["http_request_db_queries"].observe(stats.queries)
+        histograms["http_request_db_rows"].observe(stats.rows)
+
+    def render(self) -> str:
+        lines = []
+        for name, help in self.HISTOGRAMS.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), histograms in sorted(self.routes.items()):
+                histogram = histograms[name]
+                labels = {"method": method, "route": route}
+                for le, count in histogram.samples():
+                    lines.append(
+                        f"{name}_bucket{{{_labels({**labels, 'le': le})}}} {count}"
+                    )
+                lines.append(f"{name}_sum{{{_labels(labels)}}} {histogram.sum}")
+                lines.append(
+                    f"{name}_count{{{_labels(labels)}}} {sum(histogram.counts)}"
+                )
+        lines.extend(render_pool_metrics(get_pool_metrics()))
+        lines.extend(render_memoize_metrics(get_memoize_metrics()))
+        return "\n".join(lines) + "\n"
+
+
+def render_pool_metrics(pools: dict[str, dict]) -> list[str]:
+    """Prometheus lines for a ``get_pool_metrics()`` snapshot."""
+    lines = []
+    if not pools:
+        return lines
+    for key in next(iter(pools.values())):
+        name = f"db_pool_{key}"
+        kind = (
+            "counter"
+            if key in ("acquired", "timeouts") or key.endswith("_total")
+            else "gauge"
+        )
+        lines.append(f"# TYPE {name} {kind}")
+        for connection, snapshot in sorted(pools.items()):
+            lines.append(
+                f"{name}{{{_labels({'connection': connection})}}} {snapshot[key]}"
+            )
+    return lines
+
+
+def render_memoize_metrics(functions: dict[str, dict]) -> list[str]:
+    """Prometheus lines for a ``get_memoize_metrics()`` snapshot."""
+    lines = []
+    if not functions:
+        return lines
+    for key in next(iter(functions.values())):
+        name = f"memoize_{key}" if key == "size" else f"memoize_{key}_total"
+        lines.append(f"# TYPE {name} {'gauge' if key == 'size' else 'counter'}")
+        for function, stats in sorted(functions.items()):
+            lines.append(f"{name}{{{_labels({'function': function})}}} {stats[key]}")
+    return lines
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware collecting ``RequestMetrics`` for every HTTP request."""
+
+    def __init__(self, app, metrics: RequestMetrics, server_timing: bool = True):
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                method = scope["method"]
+                self.metrics.observe(
+                    method if method in HTTP_METHODS else OTHER_METHOD,
+                    route_template(scope) or UNMATCHED_ROUTE,
+                    time.perf_counter() - start,
+                    stats,
+                )
+
+
+def metrics_endpoint(metrics: RequestMetrics):
+    """Endpoint serving ``metrics`` in the Prometheus text format."""
+
+    async def endpoint(request):
+        return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+    return endpoint
@@ -0,0 +1,195 @@
+"""
+OpenAPI document precomputed once per registry fingerprint.
+
+FastAPI builds the document on the first ``/openapi.json`` request in every
+worker, which takes seconds of CPU with hundreds of routes and models.
+``precompute_openapi`` fingerprints the installed modules, models and routes
+instead, loads the document serialized for that fingerprint from the cache
+directory or generates and stores it, and serves the stored bytes (gzipped
+for clients accepting it) from then on. The ``generateschema`` command fills
+the cache at build time so deployed workers only read it.
+"""
+
+import gzip
+import json
+import os
+import sys
+from functools import cached_property
+from pathlib import Path
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route, request_response
+
+OPENAPI_DIR_NAME = "openapi"
+
+
+def _mtime(module) -> int | None:
+    try:
+        return os.stat(module.__file__).st_mtime_ns
+    except (AttributeError, TypeError, OSError):
+        return None
+
+
+def iter_routes(routes, prefix: str = ""):
+    """Yield (prefix, route) for ``routes`` and those of included routers."""
+    for route in routes:
+        context = getattr(route, "include_context", None)
+        if context is not None:
+            # FastAPI includes routers lazily
+            yield from iter_routes(
+                route.original_router.routes, prefix + context.prefix
+            )
+        else:
+            yield prefix, route
+
+
+def app_fingerprint(app, registry) -> str:
+    """
+    Fingerprint of ``registry`` and of the routes of ``app``, including the
+    modification times of the installed modules' and endpoints' source files.
+    The OpenAPI route itself is left out, as ``install_document`` replaces it.
+    """
+    import fastapi
+
+    parts = [
+        fastapi.__version__,
+        f"{app.title}:{app.version}:{app.openapi_version}:{app.description}",
+    ]
+    source_modules = set()
+    for prefix, route in iter_routes(app.routes):
+        if not prefix and getattr(route, "path", None) == app.openapi_url:
+            continue
+        endpoint = getattr(route, "endpoint", None)
+        parts.append(
+            f"{prefix}{getattr(route, 'path', '')}:"
+            f"{sorted(getattr(route, 'methods', None) or ())}:"
+            f"{getattr(route, 'name', None)}:"
+            f"{getattr(endpoint, '__qualname__', None)}:"
+            f"{getattr(route, 'response_model', None)!r}"
+        )
+        source_modules.add(getattr(endpoint, "__module__", None))
+
+    installed = {cfg.name for cfg in registry.module_configs.values()}
+    prefixes = tuple(f"{name}." for name in installed)
+    for name, module in list(sys.modules.items()):
+        if name in source_modules or name in installed or name.startswith(prefixes):
+            parts.append(f"{name}:{_mtime(module)}")
+    return registry.fingerprint(*sorted(parts))
+
+
+class OpenAPIDocument:
+    """A serialized OpenAPI document and its gzip-compressed copy."""
+
+    def __init__(self, fingerprint: str, body: bytes, compressed: bytes | None):
+        self.fingerprint = fingerprint
+        self.body = body
+        self.compressed = compressed
+
+    @classmethod
+    def build(cls, app, fingerprint: str, compress: bool = True):
+        # FastAPI's own generation, bypassing an installed document
+        schema = type(app).openapi(app)
+        body = json.dumps(
+            schema, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        document = cls(fingerprint, body, gzip.compress(body) if compress else None)
+        document.__dict__["schema"] = schema
+        return document
+
+    @cached_property
+    def schema(self) -> dict:
+        return json.loads(self.body)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.fingerprint}"'
+
+
+def load_document(
+    directory: Path, fingerprint: str, compress: bool = True
+) -> OpenAPIDocument | None:
+    """The document stored in ``directory`` for ``fingerprint``, if any."""
+    path = Path(directory, f"{fingerprint}.json")
+    try:
+        body = path.read_bytes()
+    except OSError:
+        return None
+    compressed = None
+    if compress:
+        try:
+            compressed = path.with_suffix(".json.gz").read_bytes()
+        except OSError:
+            compressed = gzip.compress(body)
+    return OpenAPIDocument(fingerprint, body, compressed)
+
+
+def save_document(directory: Path, document: OpenAPIDocument):
+    """Store ``document`` in ``directory``, replacing other fingerprints."""
+    directory = Path(directory)
+    files = {f"{document.fingerprint}.json": document.body}
+    if document.compressed is not None:
+        files[f"{document.fingerprint}.json.gz"] = document.compressed
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, data in files.items():
+            tmp = directory / f"{name}.tmp"
+            tmp.write_bytes(data)
+            os.replace(tmp, directory / name)
+        for stale in directory.iterdir():
+            if stale.name not in files and stale.suffix != ".tmp":
+                stale.unlink()
+    except OSError:
+        # Read-only deployments keep the document in memory only.
+        pass
+
+
+def openapi_endpoint(app, document: OpenAPIDocument):
+    async def openapi(request: Request) -> Response:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        if root_path and app.root_path_in_servers:
+            servers = document.schema.get("servers", [])
+            if root_path not in {s.get("url") for s in servers}:
+                schema = dict(document.schema)
+                schema["servers"] = [{"url": root_path}] + servers
+                return JSONResponse(schema)
+
+        headers = {"ETag": document.etag, "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") == document.etag:
+            return Response(status_code=304, headers=headers)
+        if document.compressed is not None and "gzip" in request.headers.get(
+            "accept-encoding", ""
+        ):
+            headers["Content-Encoding"] = "gzip"
+            return Response(document.compressed, 200, headers, "application/json")
+        return Response(document.body, 200, headers, "application/json")
+
+    return openapi
+
+
+def install_document(app, document: OpenAPIDocument):
+    """Serve ``document`` as ``app``'s OpenAPI schema."""
+    app.openapi = lambda: document.schema
+    for route in app.router.routes:
+        if isinstance(route, Route) and route.path == app.openapi_url:
+            # in place, as a RadixDispatcher may already have indexed the route
+            route.endpoint = openapi_endpoint(app, document)
+            route.app = request_response(route.endpoint)
+
+
+def precompute_openapi(
+    app, registry, directory: Path, compress: bool = True, force: bool = False
+) -> OpenAPIDocument | None:
+    """
+    Load or generate ``app``'s OpenAPI document for its current fingerprint
+    and serve it. ``create_app()`` calls it at startup; routes added to
+    ``app`` after that are not documented.
+    """
+    if not app.openapi_url:
+        return None
+    fingerprint = app_fingerprint(app, registry)
+    document = None if force else load_document(directory, fingerprint, compress)
+    if document is None:
+        document = OpenAPIDocument.build(app, fingerprint, compress)
+        save_document(directory, document)
+    install_document(app, document)
+    return document
@@ -0,0 +1,245 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+    paginate = CursorPagination(ordering=("-created_at",), count="cached")
+
+    @router.get("/items")
+    async def items(page: CursorPage = Depends(paginate)) -> Page:
+        return await page.paginate(Item.filter(active=True))
+
+Model instances are serialized as objects of their database fields, like
+``values()`` rows; annotate the endpoint with ``Page[ItemSchema]`` to
+document and validate a schema of its own instead.
+
+Each page filters on the ordering fields and primary key of the last row
+of the previous one, encoded in an opaque cursor, so deep pages cost the
+same as the first. Ordering fields are expected to be non-null.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from collections import OrderedDict
+from typing import Generic, Literal, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, field_serializer
+from tortoise.expressions import Q
+
+T = TypeVar("T")
+
+CountMode = Literal["exact", "cached", "approximate"]
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+    count: int | None = None
+
+    @field_serializer("items", mode="wrap")
+    def _serialize_items(self, items, handler):
+        return handler([_as_dict(item) for item in items])
+
+
+def _as_dict(item):
+    if hasattr(item, "_meta") and not isinstance(item, BaseModel):
+        return {name: getattr(item, name) for name in item._meta.fields_db_projection}
+    return item
+
+
+def _field(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(values, list):
+        raise ValueError("cursor must encode a list")
+    return values
+
+
+class CountCache:
+    """
+    Counts kept for ``ttl`` seconds, then served stale while a background
+    task recounts, so only the very first request for a query waits on it.
+    Beyond ``maxsize`` queries the least recently counted ones are dropped.
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._counts: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, count):
+        cached = self._counts.get(key)
+        if cached is None:
+            return await self._refresh(key, count)
+        self._counts.move_to_end(key)
+        value, refreshed_at = cached
+        if time.monotonic() - refreshed_at > self.ttl and key not in self._refreshing:
+            task = asyncio.create_task(self._refresh(key, count))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return value
+
+    async def _refresh(self, key: str, count) -> int:
+        value = await count()
+        self._counts[key] = (value, time.monotonic())
+        self._counts.move_to_end(key)
+        while len(self._counts) > self.maxsize:
+            self._counts.popitem(last=False)
+        return value
+
+
+async def _estimated_count(queryset) -> int | None:
+    """Planner row estimate of an unfiltered table, where the database keeps one."""
+    db = queryset._choose_db()
+    if db.capabilities.dialect != "postgres":
+        return None
+    _, rows = await db.execute_query(
+        "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass($1)",
+        [queryset.model._meta.db_table],
+    )
+    # -1 until the table was first vacuumed or analyzed
+    if not rows or rows[0]["estimate"] < 0:
+        return None
+    return rows[0]["estimate"]
+
+
+class CursorPage:
+    """Request-bound pagination state handed to endpoints by ``CursorPagination``."""
+
+    def __init__(self, pagination: "CursorPagination", cursor: str | None, limit: int):
+        self.pagination = pagination
+        self.cursor = cursor
+        self.limit = limit
+
+    def _ordering(self, model) -> list[tuple[str, bool]]:
+        pk = model._meta.pk_attr
+        ordering = [
+            (name.lstrip("-"), name.startswith("-"))
+            for name in self.pagination.ordering
+        ]
+        if pk not in (name for name, _ in ordering):
+            ordering.append((pk, ordering[-1][1] if ordering else False))
+        for name, _ in ordering:
+            if name not in model._meta.fields_map:
+                raise ValueError(f"{model.__name__} has no field {name!r} to order by")
+        return ordering
+
+    def _after(self, model, ordering, values) -> Q:
+        # (a, b, pk) > (x, y, z) spelled out so every field keeps its direction
+        fields_map = model._meta.fields_map
+        values = [
+            fields_map[name].to_python_value(value)
+            for (name, _), value in zip(ordering, values)
+        ]
+        condition = None
+        for i, (name, descending) in enumerate(ordering):
+            term = Q(
+                **{prev: values[j] for j, (prev, _) in enumerate(ordering[:i])},
+                **{f"{name}__{'lt' if descending else 'gt'}": values[i]},
+            )
+            condition = term if condition is None else condition | term
+        return condition
+
+    async def paginate(self, queryset, values: tuple[str, ...] | None = None) -> Page:
+        """
+        Return the page of ``queryset`` after the request's cursor. With
+        ``values`` items are dicts of those fields, as from ``.values()``.
+        """
+        model = queryset.model
+        ordering = self._ordering(model)
+        page_query = queryset
+        if self.cursor is not None:
+            try:
+                cursor_values = decode_cursor(self.cursor)
+                if len(cursor_values) != len(ordering):
+                    raise ValueError("cursor does not match the ordering")
+                after = self._after(model, ordering, cursor_values)
+            except (ValueError, TypeError) as e:
+                raise HTTPException(status_code=400, detail="Invalid cursor") from e
+            page_query = page_query.filter(after)
+
+        page_query = page_query.order_by(
+            *(f"-{name}" if descending else name for name, descending in ordering)
+        ).limit(self.limit + 1)
+        if values is not None:
+            # the cursor may need fields the caller did not ask for
+            missing = [name for name, _ in ordering if name not in values]
+            rows = await page_query.values(*values, *missing)
+        else:
+            rows = await page_query
+
+        next_cursor = None
+        if len(rows) > self.limit:
+            rows = rows[: self.limit]
+            next_cursor = encode_cursor(
+                [_field(rows[-1], name) for name, _ in ordering]
+            )
+        if values is not None:
+            rows = [{name: row[name] for name in values} for row in rows]
+
+        return Page(
+            items=rows, next_cursor=next_cursor, count=await self.count(queryset)
+        )
+
+    async def count(self, queryset) -> int | None:
+        mode = self.pagination.count
+        if mode is None:
+            return None
+        if mode == "exact":
+            return await queryset.count()
+        if mode == "approximate" and not queryset._q_objects:
+            estimate = await _estimated_count(queryset)
+            if estimate is not None:
+                return estimate
+        count_query = queryset.count()
+        count_query._choose_db_if_not_chosen()
+        count_query._make_query()
+        sql, params = count_query.query.get_parameterized_sql()
+        key = repr((count_query._db.connection_name, sql, params))
+        return await self.pagination.count_cache.get(key, queryset.count)
+
+
+class CursorPagination:
+    """
+    Dependency factory reading ``cursor`` and ``limit`` query parameters.
+    ``ordering`` lists field names, "-" prefixed for descending order; the
+    primary key is always appended as a tie-breaker. ``count`` adds a total:
+    "exact" counts every request, "cached" serves a count refreshed in the
+    background every ``count_ttl`` seconds for up to ``count_cache_size``
+    distinct querysets, "approximate" uses the database's
+    row estimate for unfiltered querysets and falls back to "cached".
+    """
+
+    def __init__(
+        self,
+        ordering: tuple[str, ...] = (),
+        default_limit: int = 50,
+        max_limit: int = 200,
+        count: CountMode | None = None,
+        count_ttl: float = 60.0,
+        count_cache_size: int = 1024,
+    ):
+        self.ordering = tuple(ordering)
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.count = count
+        self.count_cache = CountCache(count_ttl, count_cache_size)
+
+    def __call__(
+        self,
+        cursor: str | None = Query(None, description="Opaque cursor of the next page"),
+        limit: int | None = Query(None, ge=1, description="Items per page"),
+    ) -> CursorPage:
+        limit = min(limit or self.default_limit, self.max_limit)
+        return CursorPage(self, cursor, limit)
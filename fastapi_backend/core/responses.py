@@ -0,0 +1,73 @@
+import json
+from fastapi.responses import Response, StreamingResponse
+from fastapi_backend.utils.encoding import json_default
+
+
+async def _ndjson_lines(rows, chunk_size: int):
+    encode = json.JSONEncoder(
+        default=json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode
+    buffer = []
+    size = 0
+    async for row in rows:
+        line = (encode(row) + "\n").encode()
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+class NDJSONResponse(StreamingResponse):
+    """
+    Stream an async iterable of rows (dicts or model instances, e.g. from
+    ``Model.stream()``) as newline-delimited JSON, sending a chunk whenever
+    ``chunk_size`` bytes are buffered.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, rows, chunk_size: int = 64 * 1024, **kwargs):
+        super().__init__(_ndjson_lines(rows, chunk_size), **kwargs)
+
+
+class ModelJSONResponse(Response):
+    """
+    JSON response of a model instance, or a list of instances or ``values()``
+    rows, encoded by the model's compiled serializer without building a
+    pydantic model. Rows and empty lists need ``model``; ``fields`` selects
+    a subset of the database fields.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content,
+        model=None,
+        fields: tuple[str, ...] | None = None,
+        **kwargs,
+    ):
+        self.model = model
+        self.fields = fields
+        super().__init__(content, **kwargs)
+
+    def render(self, content) -> bytes:
+        from fastapi_backend.db.serializers import get_serializer
+
+        many = isinstance(content, (list, tuple))
+        model = self.model
+        if model is None:
+            if many and not content:
+                return b"[]"
+            sample = content[0] if many else content
+            if not hasattr(sample, "_meta"):
+                raise ValueError("ModelJSONResponse needs model= to encode rows")
+            model = type(sample)
+        serializer = get_serializer(model, self.fields)
+        if many:
+            return serializer.dumps_many(content)
+        return serializer.dumps(content).encode()
@@ -0,0 +1,183 @@
+"""
+Prefix-indexed request dispatch.
+
+Starlette and FastAPI match a request by calling ``matches()`` on every route
+in order until one matches fully, which is linear in the number of routes.
+``RadixDispatcher`` compiles the router's routes once into a tree keyed by
+static path segments, so a request is only matched against the routes whose
+literal segments agree with its path, in their original order. Requests the
+index cannot settle (no full match, trailing slash redirects, low priority
+routes, telemetry) are handed to the router unchanged.
+"""
+
+from starlette._utils import get_route_path
+from starlette.routing import Host, Match, Mount
+from starlette.types import Receive, Scope, Send
+
+
+class _Node:
+    __slots__ = ("static", "param", "routes", "prefixed")
+
+    def __init__(self):
+        self.static: dict[str, _Node] = {}
+        self.param: _Node | None = None
+        # indices of routes ending at this node
+        self.routes: list[int] = []
+        # indices of routes matching this node and anything below it
+        self.prefixed: list[int] = []
+
+
+def _route_pattern(route) -> tuple[str, bool] | None:
+    """
+    The path pattern of ``route`` and whether it also matches every path
+    below it, or None if it can't be indexed by path.
+    """
+    if isinstance(route, Host):
+        return None
+    if isinstance(route, Mount):
+        return route.path, True
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path, False
+    # FastAPI includes routers lazily; index them under their prefix.
+    context = getattr(route, "include_context", None)
+    if context is not None:
+        return context.prefix, True
+    return None
+
+
+class RouteIndex:
+    """Tree of route indices over the static segments of their paths."""
+
+    def __init__(self, routes):
+        self.routes = list(routes)
+        self.root = _Node()
+        # routes that have to be tried for every path
+        self.anywhere: list[int] = []
+        for i, route in enumerate(self.routes):
+            pattern = _route_pattern(route)
+            if pattern is None:
+                self.anywhere.append(i)
+            else:
+                self._insert(i, *pattern)
+
+    def _insert(self, index: int, path: str, prefixed: bool):
+        node = self.root
+        segments = path.split("/")[1:] if path else []
+        for segment in segments:
+            if ":path}" in segment:
+                # a path convertor matches across segments
+                node.prefixed.append(index)
+                return
+            if "{" in segment:
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _Node())
+        if prefixed:
+            node.prefixed.append(index)
+        else:
+            node.routes.append(index)
+
+    def candidates(self, path: str) -> list:
+        """Routes that may match ``path``, in their original order."""
+        found = list(self.anywhere)
+        segments = path.split("/")[1:]
+        nodes = [self.root]
+        for segment in segments:
+            following = []
+            for node in nodes:
+                found.extend(node.prefixed)
+                child = node.static.get(segment)
+                if child is not None:
+                    following.append(child)
+                if node.param is not None and segment:
+                    following.append(node.param)
+            nodes = following
+            if not nodes:
+                break
+        for node in nodes:
+            found.extend(node.prefixed)
+            found.extend(node.routes)
+        return [self.routes[i] for i in sorted(set(found))]
+
+
+class RadixDispatcher:
+    """
+    ASGI app replacing a router's own route scan with a ``RouteIndex``.
+
+    The index is rebuilt whenever routes are added to the router.
+    """
+
+    def __init__(self, router):
+        self.router = router
+        self.index = RouteIndex(router.routes)
+
+    def compile(self) -> RouteIndex:
+        if len(self.router.routes) != len(self.index.routes):
+            self.index = RouteIndex(self.router.routes)
+        return self.index
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan" or scope.get("fastapi.telemetry") is not None:
+            await self.router.app(scope, receive, send)
+            return
+
+        if "router" not in scope:
+            scope["router"] = self.router
+
+        partial = None
+        for route in self.compile().candidates(get_route_path(scope)):
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                scope.update(child_scope)
+                await route.handle(scope, receive, send)
+                return
+            if match == Match.PARTIAL and partial is None:
+                partial = (route, child_scope)
+
+        if partial is not None:
+            route, child_scope = partial
+            scope.update(child_scope)
+            await route.handle(scope, receive, send)
+            return
+
+        await self.router.app(scope, receive, send)
+
+
+def install_radix_dispatcher(app) -> RadixDispatcher:
+    """Dispatch requests to ``app``'s routes through a ``RadixDispatcher``."""
+    router = app.router
+    if router.middleware_stack != router.app:
+        raise RuntimeError(
+            "The router of %r has its own middleware; the radix dispatcher "
+            "can only replace a bare route scan." % app
+        )
+    router.middleware_stack = RadixDispatcher(router)
+    return router.middleware_stack
+
+
+def route_template(scope: Scope) -> str | None:
+    """
+    The full path template of the route that handled ``scope``, including the
+    prefixes of included routers, or None if no route matched.
+    """
+    # FastAPI keeps the route of an included router with its own path only
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    if context is not None:
+        return context.path
+    path = getattr(scope.get("route"), "path", None)
+    if path is not None:
+        return path
+    # Starlette routes only leave their endpoint in the scope
+    endpoint = scope.get("endpoint")
+    router = scope.get("router")
+    if endpoint is None or router is None:
+        return None
+    for route in router.routes:
+        if getattr(route, "endpoint", None) is endpoint or (
+            isinstance(route, Mount) and route.app is endpoint
+        ):
+            return route.path
+    return None
@@ -0,0 +1,261 @@
+"""
+Pre-forking server running the application in uvicorn worker processes.
+
+``Arbiter`` binds the listening socket and forks ``workers`` processes
+sharing it. With ``preload`` the application is built (``setup()``,
+settings validation, model imports) once in the arbiter before forking, so
+workers start instantly and share those memory pages copy-on-write;
+otherwise every worker builds its own after the fork.
+
+The arbiter replaces workers that exit, e.g. after serving ``max_requests``
+requests, restarts all of them gracefully on SIGHUP (new workers first,
+then the old ones are asked to finish their requests) and shuts down
+gracefully on SIGINT or SIGTERM.
+"""
+
+import gc
+import inspect
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import time
+from fastapi_backend.utils.loaders import import_string
+
+logger = logging.getLogger("fastapi_backend.server")
+
+DEFAULT_APPLICATION = "fastapi_backend.core.get_application"
+# Exit status of a worker that could not build the application.
+WORKER_BOOT_ERROR = 3
+
+
+def load_application(path: str):
+    """
+    Import the ASGI application at the dotted ``path``, calling it first if
+    it is a factory taking no arguments.
+    """
+    application = import_string(path)
+    if inspect.isfunction(application) and not any(
+        p.default is p.empty for p in inspect.signature(application).parameters.values()
+    ):
+        application = application()
+    return application
+
+
+class Arbiter:
+    def __init__(
+        self,
+        application: str = DEFAULT_APPLICATION,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 1,
+        preload: bool = False,
+        loop: str = "auto",
+        http: str = "auto",
+        max_requests: int | None = None,
+        max_requests_jitter: int = 0,
+        graceful_timeout: float = 30.0,
+        log_level: str = "info",
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.application = application
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.preload = preload
+        self.loop = loop
+        self.http = http
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+
+        self.children: dict[int, float] = {}  # pid -> start time
+        self.retiring: dict[int, float] = {}  # pid -> termination deadline
+        self.signals: list[int] = []
+        self.socket: socket.socket | None = None
+        self.app = None
+        self._wakeup_r = self._wakeup_w = None
+
+    def bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def serve(self, sock: socket.socket, app):
+        """Serve ``app`` on ``sock`` in this (worker) process until it stops."""
+        import uvicorn
+
+        limit = None
+        if self.max_requests:
+            # jitter keeps workers from being recycled all at once
+            limit = self.max_requests + random.randint(0, self.max_requests_jitter)
+        config = uvicorn.Config(
+            app,
+            loop=self.loop,
+            http=self.http,
+            limit_max_requests=limit,
+            timeout_graceful_shutdown=self.graceful_timeout,
+            log_level=self.log_level,
+        )
+        uvicorn.Server(config).run(sockets=[sock])
+
+    def run(self) -> int:
+        """Run the arbiter until it is stopped, returning the exit status."""
+        self.socket = self.bind()
+        if not hasattr(os, "fork"):
+            # no fork (Windows): a single in-process worker
+            try:
+                self.serve(self.socket, load_application(self.application))
+            finally:
+                self.socket.close()
+            return 0
+        if self.preload:
+            self.app = load_application(self.application)
+            # objects built so far are never collected, so the collector
+            # doesn't touch (and copy) their pages in the workers
+            gc.freeze()
+        logger.info(
+            "Listening on %s:%s with %s workers", self.host, self.port, self.workers
+        )
+
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_w, False)
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, self._on_signal)
+
+        status = 0
+        try:
+            self.spawn_workers()
+            while True:
+                ready, _, _ = select.select([self._wakeup_r], [], [], 1.0)
+                if ready:
+                    os.read(self._wakeup_r, 4096)
+                status = self.reap()
+                if status:
+                    break
+                handled, self.signals = self.signals, []
+                if signal.SIGINT in handled or signal.SIGTERM in handled:
+                    break
+                if signal.SIGHUP in handled:
+                    self.restart()
+                self.kill_overdue()
+                self.spawn_workers()
+        finally:
+            self.stop()
+            self.socket.close()
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+        return status
+
+    def _on_signal(self, signum, frame):
+        self.signals.append(signum)
+        try:
+            os.write(self._wakeup_w, b"\0")
+        except BlockingIOError:
+            pass
+
+    def spawn_workers(self):
+        while len(self.children) < self.workers:
+            self.spawn_worker()
+
+    def spawn_worker(self) -> int:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return pid
+
+        # worker process
+        status = 0
+        try:
+            for signum in (
+                signal.SIGINT,
+                signal.SIGTERM,
+                signal.SIGHUP,
+                signal.SIGCHLD,
+            ):
+                signal.signal(signum, signal.SIG_DFL)
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            app = self.app
+            if app is None:
+                try:
+                    app = load_application(self.application)
+                except BaseException:
+                    logger.exception(
+                        "Worker %s failed to load the application", os.getpid()
+                    )
+                    status = WORKER_BOOT_ERROR
+                    return status
+            self.serve(self.socket, app)
+        except BaseException:
+            logger.exception("Worker %s crashed", os.getpid())
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def reap(self) -> int:
+        """Collect exited workers; non-zero if one failed to boot."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return 0
+            if not pid:
+                return 0
+            code = os.waitstatus_to_exitcode(status)
+            self.retiring.pop(pid, None)
+            if self.children.pop(pid, None) is None:
+                continue
+            if code == WORKER_BOOT_ERROR:
+                logger.error("Worker %s failed to boot, shutting down", pid)
+                return WORKER_BOOT_ERROR
+            logger.info("Worker %s exited with status %s, replacing it", pid, code)
+
+    def restart(self):
+        """Replace every worker, letting the old ones finish their requests."""
+        old = list(self.children)
+        logger.info("Restarting %s workers", len(old))
+        for pid in old:
+            self.children.pop(pid)
+        self.spawn_workers()
+        self.terminate(old)
+
+    def terminate(self, pids):
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                continue
+            self.retiring[pid] = deadline
+
+    def kill_overdue(self):
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now >= deadline:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.retiring.pop(pid)
+
+    def stop(self):
+        """Stop every worker gracefully, killing those past the timeout."""
+        self.terminate(list(self.children))
+        self.children.clear()
+        while self.retiring:
+            self.reap()
+            self.kill_overdue()
+            if self.retiring:
+                time.sleep(0.05)
@@ -0,0 +1,43 @@
+from tortoise.backends.asyncpg.client import (
+    AsyncpgDBClient as TortoiseAsyncpgClient,
+    TransactionWrapper as TortoiseTransactionWrapper,
+)
+from tortoise.backends.base.client import (
+    NestedTransactionContext,
+    TransactionContextPooled,
+)
+from fastapi_backend.db.instrumentation import InstrumentedClient
+from fastapi_backend.db.transaction import CommitHooksContext
+from .pool import InstrumentedPool, PoolMetrics
+
+
+class TransactionWrapper(InstrumentedClient, TortoiseTransactionWrapper):
+    def _in_transaction(self):
+        return NestedTransactionContext(TransactionWrapper(self))
+
+
+class AsyncpgDBClient(InstrumentedClient, TortoiseAsyncpgClient):
+    """
+    asyncpg client with an acquire timeout, pool metrics, commit hooks and
+    per-request query stats.
+    """
+
+    def __init__(self, acquire_timeout: float | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.acquire_timeout = acquire_timeout
+        self.metrics = PoolMetrics()
+
+    async def create_pool(self, **kwargs):
+        pool = await super().create_pool(**kwargs)
+        return InstrumentedPool(pool, self.metrics, self.acquire_timeout)
+
+    def _in_transaction(self):
+        return CommitHooksContext(
+            TransactionContextPooled(TransactionWrapper(self), self._pool_init_lock)
+        )
+
+    def pool_size(self) -> int:
+        return self._pool.get_size() if self._pool else 0
+
+
+client_class = AsyncpgDBClient
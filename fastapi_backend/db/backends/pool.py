@@ -0,0 +1,115 @@
+"""
+Connection acquisition metrics shared by the database backends.
+
+Every client created from ``fastapi_backend.db.backends`` engines carries a
+``PoolMetrics`` instance; ``get_pool_metrics()`` reports them per connection.
+"""
+
+import asyncio
+import time
+from fastapi_backend.db.instrumentation import record_pool_wait
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.in_use = 0
+        self.waiters = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.acquire_seconds_total = 0.0
+        self.acquire_seconds_max = 0.0
+
+    def snapshot(self, size: int) -> dict:
+        return {
+            "size": size,
+            "in_use": self.in_use,
+            "idle": max(size - self.in_use, 0),
+            "waiters": self.waiters,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "acquire_seconds_total": self.acquire_seconds_total,
+            "acquire_seconds_max": self.acquire_seconds_max,
+        }
+
+    async def acquire(self, waiter, timeout: float | None):
+        """Await ``waiter`` (a connection or lock acquisition) and record it."""
+        self.waiters += 1
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiters -= 1
+            elapsed = time.perf_counter() - start
+            self.acquire_seconds_total += elapsed
+            self.acquire_seconds_max = max(self.acquire_seconds_max, elapsed)
+            record_pool_wait(elapsed)
+        self.acquired += 1
+        self.in_use += 1
+        return result
+
+    def release(self):
+        self.in_use -= 1
+
+
+class InstrumentedLock(asyncio.Lock):
+    """Lock guarding a single connection, counted as a pool of one."""
+
+    def __init__(self, metrics: PoolMetrics, timeout: float | None = None):
+        super().__init__()
+        self.metrics = metrics
+        self.timeout = timeout
+
+    async def acquire(self):
+        return await self.metrics.acquire(super().acquire(), self.timeout)
+
+    def release(self):
+        super().release()
+        self.metrics.release()
+
+
+class InstrumentedPool:
+    """Proxy over a driver pool recording every acquire and release."""
+
+    def __init__(self, pool, metrics: PoolMetrics, timeout: float | None = None):
+        self._pool = pool
+        self.metrics = metrics
+        self.timeout = timeout
+
+    async def acquire(self, *, timeout: float | None = None):
+        return await self.metrics.acquire(
+            self._pool.acquire(), timeout if timeout is not None else self.timeout
+        )
+
+    async def release(self, connection, **kwargs):
+        try:
+            return await self._pool.release(connection, **kwargs)
+        finally:
+            self.metrics.release()
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+
+def get_pool_metrics() -> dict[str, dict]:
+    """
+    Return a metrics snapshot for every open Tortoise connection, read pools
+    being reported as ``"<connection>:read"``.
+    """
+    from tortoise.connection import get_connections
+
+    metrics = {}
+    for client in get_connections().all():
+        # inside a transaction the context holds the transaction wrapper
+        client = getattr(client, "_parent", client)
+        if hasattr(client, "metrics"):
+            metrics[client.connection_name] = client.metrics.snapshot(
+                client.pool_size()
+            )
+        if getattr(client, "read_pool", None) is not None:
+            metrics[f"{client.connection_name}:read"] = (
+                client.read_pool.metrics.snapshot(client.read_pool.pool_size())
+            )
+    return metrics
@@ -0,0 +1,158 @@
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import aiosqlite
+from tortoise.backends.base.client import NestedTransactionContext
+from tortoise.backends.sqlite.client import (
+    SqliteClient as TortoiseSqliteClient,
+    SqliteTransactionContext,
+    SqliteTransactionWrapper as TortoiseSqliteTransactionWrapper,
+    translate_exceptions,
+)
+from fastapi_backend.db.instrumentation import InstrumentedClient
+from fastapi_backend.db.transaction import CommitHooksContext
+from .pool import InstrumentedLock, PoolMetrics
+
+# Pragmas that only make sense for (or can only be set by) the writer.
+WRITER_ONLY_PRAGMAS = {"journal_mode", "journal_size_limit"}
+
+
+def _is_read_query(query: str) -> bool:
+    return query.lstrip()[:6].upper() == "SELECT"
+
+
+class ReadPool:
+    """
+    Read-only connections to a WAL database. Readers never block the writer
+    nor each other, so SELECTs outside transactions are spread over them
+    instead of queueing on the writer lock.
+    """
+
+    def __init__(self, file_path: str, size: int, pragmas: dict, timeout=None):
+        self.uri = f"{Path(file_path).resolve().as_uri()}?mode=ro"
+        self.size = size
+        self.pragmas = {
+            k: v for k, v in pragmas.items() if k not in WRITER_ONLY_PRAGMAS
+        }
+        self.timeout = timeout
+        self.metrics = PoolMetrics()
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._connections: list[aiosqlite.Connection] = []
+        self._opening = 0
+
+    async def _connect(self) -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(self.uri, uri=True, isolation_level=None)
+        connection._conn.row_factory = sqlite3.Row
+        for pragma, val in {**self.pragmas, "query_only": "ON"}.items():
+            cursor = await connection.execute(f"PRAGMA {pragma}={val}")
+            await cursor.close()
+        return connection
+
+    async def _get(self) -> aiosqlite.Connection:
+        if self._idle.empty() and len(self._connections) + self._opening < self.size:
+            self._opening += 1
+            try:
+                connection = await self._connect()
+            finally:
+                self._opening -= 1
+            self._connections.append(connection)
+            return connection
+        return await self._idle.get()
+
+    def pool_size(self) -> int:
+        return len(self._connections)
+
+    @asynccontextmanager
+    async def acquire(self):
+        connection = await self.metrics.acquire(self._get(), self.timeout)
+        try:
+            yield connection
+        finally:
+            self._idle.put_nowait(connection)
+            self.metrics.release()
+
+    async def close(self):
+        connections, self._connections = self._connections, []
+        self._idle = asyncio.Queue()
+        for connection in connections:
+            await connection.close()
+
+
+class SqliteTransactionWrapper(InstrumentedClient, TortoiseSqliteTransactionWrapper):
+    def _in_transaction(self):
+        return NestedTransactionContext(SqliteTransactionWrapper(self))
+
+
+class SqliteClient(InstrumentedClient, TortoiseSqliteClient):
+    """
+    SQLite client whose connection lock reports pool metrics and which, in
+    WAL mode, serves SELECTs outside transactions from a read-only pool.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        acquire_timeout: float | None = None,
+        read_pool_size: int = 0,
+        **kwargs,
+    ):
+        # Every other keyword becomes a PRAGMA, so ours are taken out first.
+        super().__init__(file_path, **kwargs)
+        self.metrics = PoolMetrics()
+        self._lock = InstrumentedLock(self.metrics, acquire_timeout)
+        self.read_pool = None
+        if (
+            read_pool_size
+            and file_path != ":memory:"
+            and str(self.pragmas["journal_mode"]).upper() == "WAL"
+        ):
+            self.read_pool = ReadPool(
+                file_path, read_pool_size, self.pragmas, acquire_timeout
+            )
+
+    def pool_size(self) -> int:
+        return 1 if self._connection else 0
+
+    def _in_transaction(self):
+        return CommitHooksContext(
+            SqliteTransactionContext(SqliteTransactionWrapper(self), self._lock)
+        )
+
+    async def close(self) -> None:
+        if self.read_pool is not None:
+            await self.read_pool.close()
+        await super().close()
+
+    @asynccontextmanager
+    async def _read_connection(self):
+        # The database file (and its WAL) is created by the writer connection.
+        if not self._connection:
+            await self.create_connection(with_db=True)
+        async with self.read_pool.acquire() as connection:
+            yield connection
+
+    async def _read_query(self, query: str, values: list | None):
+        query = query.replace("\x00", "'||CHAR(0)||'")
+        async with self._read_connection() as connection:
+            self.log.debug("%s: %s", query, values)
+            return await connection.execute_fetchall(query, values)
+
+    @translate_exceptions
+    async def execute_query(self, query: str, values: list | None = None):
+        if self.read_pool is None or not _is_read_query(query):
+            return await super().execute_query(query, values)
+        rows = await self._timed(self._read_query(query, values), query)
+        return len(rows), rows
+
+    @translate_exceptions
+    async def execute_query_dict(self, query: str, values: list | None = None):
+        if self.read_pool is None or not _is_read_query(query):
+            return await super().execute_query_dict(query, values)
+        return list(
+            map(dict, await self._timed(self._read_query(query, values), query))
+        )
+
+
+client_class = SqliteClient
@@ -0,0 +1,200 @@
+"""
+Bulk writes issuing one multi-row statement per chunk, with chunks sized
+to the bind parameter limit of the database.
+"""
+
+import functools
+import itertools
+import sqlite3
+from contextlib import asynccontextmanager
+
+# Bind parameters allowed in a single statement
+MAX_PARAMETERS = {
+    # SQLITE_MAX_VARIABLE_NUMBER defaults to 32766 since SQLite 3.32
+    "sqlite": 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999,
+    # asyncpg encodes the parameter count as a signed 16-bit integer
+    "postgres": 32767,
+}
+
+
+def chunk_size(db, params_per_row: int, batch_size: int | None = None) -> int:
+    """Rows per statement for ``db``, capped by ``batch_size`` when given."""
+    limit = MAX_PARAMETERS.get(db.capabilities.dialect, 999)
+    size = max(limit // max(params_per_row, 1), 1)
+    return min(size, batch_size) if batch_size else size
+
+
+@functools.lru_cache(maxsize=64)
+def _values_sql(dialect: str, rows: int, columns: int) -> str:
+    if dialect == "postgres":
+        numbers = itertools.count(1)
+        return ",".join(
+            "(" + ",".join(f"${next(numbers)}" for _ in range(columns)) + ")"
+            for _ in range(rows)
+        )
+    return ",".join(["(" + ",".join("?" * columns) + ")"] * rows)
+
+
+def _quote(name: str) -> str:
+    return '"%s"' % name.replace('"', '""')
+
+
+@asynccontextmanager
+async def _connection(model, using_db, atomic: bool):
+    from tortoise.transactions import in_transaction
+
+    db = using_db or model._choose_db(True)
+    if not atomic:
+        yield db
+        return
+    async with in_transaction(db.connection_name) as connection:
+        yield connection
+
+
+def _insert_columns(model, custom_pk: bool) -> list[str]:
+    meta = model._meta
+    return [
+        name
+        for name in meta.fields_db_projection
+        if not meta.fields_map[name].generated or (custom_pk and name == meta.pk_attr)
+    ]
+
+
+def _match_returned(model, rows, returned, key_columns: tuple[str, ...]):
+    """Yield (index, object, pk) for the ``returned`` (pk, *key) rows."""
+    meta = model._meta
+    to_python = meta.pk.to_python_value
+    if not key_columns:
+        for (i, obj), pk in zip(rows, sorted(to_python(row[0]) for row in returned)):
+            yield i, obj, pk
+        return
+
+    # RETURNING lists the pk, then the other key columns in order
+    positions, position = [], 1
+    for c in key_columns:
+        if c == meta.pk_attr:
+            positions.append((0, to_python))
+        else:
+            positions.append((position, meta.fields_map[c].to_python_value))
+            position += 1
+    by_key = {
+        tuple(convert(row[j]) for j, convert in positions): to_python(row[0])
+        for row in returned
+    }
+    for i, obj in rows:
+        pk = by_key.get(tuple(getattr(obj, c) for c in key_columns))
+        if pk is not None:
+            yield i, obj, pk
+
+
+async def insert_many(
+    model,
+    objects,
+    *,
+    batch_size: int | None = None,
+    atomic: bool = False,
+    using_db=None,
+    on_conflict: tuple[str, ...] | None = None,
+    update_fields: tuple[str, ...] | None = None,
+) -> list:
+    """
+    INSERT ``objects`` with multi-row statements and return their primary
+    keys, which are also set on the objects. With ``on_conflict`` rows
+    clashing on those fields update ``update_fields`` instead (by default
+    every inserted field but the conflict target and primary key); rows
+    an empty ``update_fields`` skips (DO NOTHING) keep a None primary key.
+
+    RETURNING rows come in no guaranteed order, so they are matched to the
+    objects by the conflict target, by the primary key when it is inserted,
+    and otherwise by ascending generated keys, which a statement assigns in
+    the order of its VALUES.
+    """
+    from fastapi_backend.db.cache import invalidate
+
+    meta = model._meta
+    fields_map = meta.fields_map
+    objects = list(objects)
+    pks = [None] * len(objects)
+
+    async with _connection(model, using_db, atomic) as db:
+        dialect = db.capabilities.dialect
+        # objects with an explicit value for a generated pk insert it too
+        for custom_pk in (False, True):
+            group = [
+                (i, obj)
+                for i, obj in enumerate(objects)
+                if obj._custom_generated_pk is custom_pk
+            ]
+            if not group:
+                continue
+            columns = _insert_columns(model, custom_pk)
+            prefix = "INSERT INTO %s (%s) VALUES " % (
+                _quote(meta.db_table),
+                ",".join(_quote(meta.fields_db_projection[c]) for c in columns),
+            )
+            suffix = ""
+            if on_conflict:
+                fields = update_fields
+                if fields is None:
+                    fields = [
+                        c for c in columns if c not in on_conflict and c != meta.pk_attr
+                    ]
+                target = ",".join(
+                    _quote(meta.fields_db_projection[c]) for c in on_conflict
+                )
+                updates = ",".join(
+                    "{0}=EXCLUDED.{0}".format(_quote(meta.fields_db_projection[c]))
+                    for c in fields
+                )
+                suffix = f" ON CONFLICT ({target}) " + (
+                    f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+                )
+            if on_conflict:
+                key_columns = tuple(on_conflict)
+            elif custom_pk or not meta.pk.generated:
+                key_columns = (meta.pk_attr,)
+            else:
+                key_columns = ()
+            returning = [meta.db_pk_column] + [
+                meta.fields_db_projection[c] for c in key_columns if c != meta.pk_attr
+            ]
+            suffix += " RETURNING " + ",".join(map(_quote, returning))
+
+            converters = [(c, fields_map[c].to_db_value) for c in columns]
+            size = chunk_size(db, len(columns), batch_size)
+            for start in range(0, len(group), size):
+                rows = group[start : start + size]
+                params = [
+                    to_db(getattr(obj, c), obj)
+                    for _, obj in rows
+                    for c, to_db in converters
+                ]
+                sql = prefix + _values_sql(dialect, len(rows), len(columns)) + suffix
+                _, returned = await db.execute_query(sql, params)
+                for i, obj, pk in _match_returned(model, rows, returned, key_columns):
+                    setattr(obj, meta.pk_attr, pk)
+                    obj._saved_in_db = True
+                    pks[i] = pk
+
+    await invalidate(model)
+    return pks
+
+
+async def update_many(
+    model,
+    objects,
+    fields: tuple[str, ...],
+    *,
+    batch_size: int | None = None,
+    atomic: bool = False,
+    using_db=None,
+) -> int:
+    """
+    UPDATE ``fields`` of ``objects`` by primary key, a chunk of rows per
+    statement, and return the number of rows updated.
+    """
+    objects = list(objects)
+    async with _connection(model, using_db, atomic) as db:
+        # pk = ? THEN ? per field and row, plus the pk IN (...) list per field
+        size = chunk_size(db, 3 * len(fields), batch_size)
+        return await model.bulk_update(objects, fields, batch_size=size, using_db=db)
@@ -0,0 +1,170 @@
+"""
+Opt-in cache for query results, enabled by setting QUERY_CACHE_BACKEND.
+
+    items = await cached(Item.filter(active=True).values("id", "name"))
+
+Entries are keyed by the query's model, SQL and parameters plus a version
+of every table the query reads. Saving, updating or deleting rows of a
+model bumps its table version (after commit inside transactions), so every
+cached query over that model, including ones joining it, misses from then
+on. Raw SQL and many-to-many ``add()``/``remove()`` are not tracked; call
+``invalidate()`` for those. The same writes expire responses cached under
+the model's tag by ``fastapi_backend.core.cache``.
+"""
+
+import functools
+import hashlib
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any
+from fastapi_backend.utils.loaders import import_string
+
+MISSING = object()
+DEFAULT_TTL = object()
+
+
+class BaseQueryCache:
+    """
+    Backend interface. Values are opaque, ``ttl`` is in seconds (None for no
+    expiry) and versions are integers per table name, starting at 0.
+    """
+
+    def __init__(self, ttl: float | None = None):
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Any:
+        """Return the value stored for ``key`` or ``MISSING``."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float | None):
+        raise NotImplementedError
+
+    async def get_versions(self, tables: list[str]) -> list[int]:
+        raise NotImplementedError
+
+    async def bump_versions(self, tables: list[str]):
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+
+class LocMemQueryCache(BaseQueryCache):
+    """Per-process LRU of pickled results, evicting beyond ``max_entries``."""
+
+    def __init__(self, ttl: float | None = None, max_entries: int = 1024):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        expires, data = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return pickle.loads(data)
+
+    async def set(self, key, value, ttl):
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_versions(self, tables):
+        return [self._versions.get(table, 0) for table in tables]
+
+    async def bump_versions(self, tables):
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    async def clear(self):
+        self._entries.clear()
+        self._versions.clear()
+
+
+@functools.cache
+def get_query_cache() -> BaseQueryCache | None:
+    """Return the configured cache backend, or None when caching is disabled."""
+    from fastapi_backend.conf import settings
+
+    if settings.QUERY_CACHE_BACKEND is None:
+        return None
+    backend = import_string(settings.QUERY_CACHE_BACKEND)
+    return backend(ttl=settings.QUERY_CACHE_TTL, **settings.QUERY_CACHE_OPTIONS)
+
+
+def _read_tables(query) -> list[str]:
+    tables = {query.model._meta.db_table}
+    tables.update(table._table_name for table in query._joined_tables)
+    return sorted(tables)
+
+
+def _cache_key(query, sql: str, params: list, versions: list[int]) -> str:
+    meta = query.model._meta
+    shape = (
+        type(query).__qualname__,
+        getattr(query, "_single", False),
+        getattr(query, "_raise_does_not_exist", False),
+        getattr(query, "_flat", False),
+    )
+    digest = hashlib.sha1(repr((shape, sql, params, versions)).encode()).hexdigest()
+    return f"query:{meta.app}.{query.model.__name__}:{digest}"
+
+
+async def cached(query, ttl: float | None = DEFAULT_TTL):
+    """
+    Await ``query`` (a queryset, ``values()``, ``values_list()``, ``count()``
+    or ``exists()`` query) through the query cache. Queries run inside a
+    transaction bypass the cache.
+    """
+    from tortoise.backends.base.client import TransactionalDBClient
+
+    cache = get_query_cache()
+    if cache is None:
+        return await query
+    if getattr(query, "_prefetch_map", None):
+        raise ValueError("cached() does not support prefetch_related() querysets")
+
+    query._choose_db_if_not_chosen()
+    if isinstance(query._db, TransactionalDBClient):
+        return await query
+
+    query._make_query()
+    sql, params = query.query.get_parameterized_sql()
+    # versions are read before running the query, so a write landing while
+    # it runs leaves this entry under an already outdated key
+    tables = _read_tables(query)
+    key = _cache_key(query, sql, params, await cache.get_versions(tables))
+
+    value = await cache.get(key)
+    if value is MISSING:
+        value = await query._execute()
+        await cache.set(key, value, cache.ttl if ttl is DEFAULT_TTL else ttl)
+    return value
+
+
+async def invalidate(*models):
+    """
+    Expire cached queries reading any of ``models``' tables, cached responses
+    tagged with them and relations to them kept by the current
+    ``loader_scope()``.
+    """
+    from fastapi_backend.core.cache import invalidate_tags, model_tag
+    from fastapi_backend.db.loader import forget
+    from fastapi_backend.db.transaction import on_commit
+
+    forget(*models)
+    # Until commit other connections still read, and may cache, the old rows
+    await on_commit(functools.partial(invalidate_tags, *map(model_tag, models)))
+    cache = get_query_cache()
+    if cache is None:
+        return
+    tables = [model._meta.db_table for model in models]
+    await on_commit(functools.partial(cache.bump_versions, tables))
@@ -0,0 +1,75 @@
+from pathlib import Path
+from .routers import replica_aliases
+
+_ENGINES = {
+    "aiosqlite": "fastapi_backend.db.backends.sqlite",
+    "asyncpg": "fastapi_backend.db.backends.asyncpg",
+}
+
+
+def _connection_config(settings) -> dict:
+    engine = _ENGINES[settings.DB_ASYNC_DRIVER]
+    if settings.DB_PROVIDER == "sqlite":
+        credentials = {
+            "file_path": str(Path(settings.BASE_DIR, settings.DB_NAME or "db.sqlite")),
+            "acquire_timeout": settings.DB_POOL_ACQUIRE_TIMEOUT,
+            "read_pool_size": settings.SQLITE_READ_POOL_SIZE,
+            # the remaining credentials are applied as PRAGMAs on every connection
+            "journal_mode": settings.SQLITE_JOURNAL_MODE,
+            "synchronous": settings.SQLITE_SYNCHRONOUS,
+            "mmap_size": settings.SQLITE_MMAP_SIZE,
+            "cache_size": settings.SQLITE_CACHE_SIZE,
+            "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+            "temp_store": settings.SQLITE_TEMP_STORE,
+        }
+    else:
+        credentials = {
+            "host": settings.DB_HOST,
+            "port": settings.DB_PORT or 5432,
+            "user": settings.DB_USER,
+            "password": settings.DB_PASSWORD,
+            "database": settings.DB_NAME,
+            "minsize": settings.DB_POOL_MIN_SIZE,
+            "maxsize": settings.DB_POOL_MAX_SIZE,
+            "max_inactive_connection_lifetime": settings.DB_POOL_MAX_IDLE_LIFETIME,
+            "acquire_timeout": settings.DB_POOL_ACQUIRE_TIMEOUT,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "timeout": settings.DB_CONNECT_TIMEOUT,
+        }
+    return {"engine": engine, "credentials": credentials}
+
+
+def _connections_config(settings) -> dict:
+    connections = {"default": _connection_config(settings)}
+    for alias, overrides in settings.DATABASES.items():
+        overrides = {k: v for k, v in overrides.items() if k != "REPLICA"}
+        unknown = set(overrides) - set(type(settings).model_fields)
+        if unknown:
+            raise ValueError(
+                f"DATABASES[{alias!r}] has unknown settings: {', '.join(sorted(unknown))}"
+            )
+        connections[alias] = _connection_config(settings.model_copy(update=overrides))
+    return connections
+
+
+def uses_routing(settings, modules) -> bool:
+    """Whether queries need routing between several connections."""
+    return bool(
+        replica_aliases(settings)
+        or settings.DATABASE_ROUTERS
+        or any(cfg.database_routers for cfg in modules.module_configs.values())
+    )
+
+
+def get_tortoise_config() -> dict:
+    """Build the Tortoise ORM config from settings and the modules registry."""
+    from fastapi_backend.conf import settings
+    from fastapi_backend.modules import modules
+
+    config = {
+        "connections": _connections_config(settings),
+        "apps": modules.to_tortoise_modules(),
+    }
+    if uses_routing(settings, modules):
+        config["routers"] = ["fastapi_backend.db.routers.ModulesRouter"]
+    return config
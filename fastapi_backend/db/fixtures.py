@@ -0,0 +1,250 @@
+"""
+NDJSON fixtures, one ``{"model": "label.Model", "fields": {...}}`` object
+per line, as written by ``dumpdata`` and read by ``loaddata``.
+
+Dumps stream every table in primary key order and in foreign key
+dependency order, which loads rely on to stream as well: once a model's
+rows start, the rows of the models it references must be complete. Rows
+referencing rows of their own model that come later are held back until
+those are inserted. Many-to-many relations are not included.
+"""
+
+import asyncio
+import base64
+import json
+from tortoise.fields import data
+from fastapi_backend.utils.encoding import json_default, parse_duration
+
+
+def model_label(model) -> str:
+    return f"{model._meta.app}.{model.__name__}"
+
+
+def resolve_models(registry, labels=()) -> list:
+    """Models selected by "label" or "label.Model" entries, every model if empty."""
+    if not labels:
+        return [m for models in registry.all_models.values() for m in models.values()]
+    selected = {}
+    for label in labels:
+        if "." in label:
+            model = registry.get_model(label)
+            selected[model_label(model)] = model
+        elif label in registry.all_models:
+            for model in registry.all_models[label].values():
+                selected[model_label(model)] = model
+        else:
+            raise ValueError(f"No installed module with label '{label}'")
+    return list(selected.values())
+
+
+def dependencies(model) -> set:
+    """Models ``model`` references through foreign keys or one-to-one fields."""
+    meta = model._meta
+    related = {
+        meta.fields_map[name].related_model
+        for name in (*meta.fk_fields, *meta.o2o_fields)
+    }
+    related.discard(model)
+    return related
+
+
+def self_references(model) -> list[tuple[str, str]]:
+    """(source field, referenced field) of ``model``'s relations to itself."""
+    meta = model._meta
+    references = []
+    for name in (*meta.fk_fields, *meta.o2o_fields):
+        field = meta.fields_map[name]
+        if field.related_model is model:
+            references.append(
+                (field.source_field, field.to_field_instance.model_field_name)
+            )
+    return references
+
+
+def dependency_order(models) -> list:
+    """Sort ``models`` so each comes after the selected models it references."""
+    pending = {model: dependencies(model) & set(models) for model in models}
+    ordered = []
+    while pending:
+        ready = [model for model, deps in pending.items() if not deps]
+        if not ready:
+            raise RuntimeError(
+                "Circular foreign keys between: %s"
+                % ", ".join(sorted(model_label(m) for m in pending))
+            )
+        for model in ready:
+            del pending[model]
+        for deps in pending.values():
+            deps.difference_update(ready)
+        ordered.extend(ready)
+    return ordered
+
+
+def _from_json(field, value):
+    # durations and bytes are dumped as text by json_default
+    if isinstance(value, str):
+        if isinstance(field, data.TimeDeltaField):
+            return parse_duration(value)
+        if isinstance(field, data.BinaryField):
+            return base64.b64decode(value)
+    return field.to_python_value(value)
+
+
+async def dump(models, out, batch_size: int = 1000) -> int:
+    """Write the rows of ``models`` to the text stream ``out``, return the count."""
+    encode = json.JSONEncoder(
+        default=json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode
+    count = 0
+    for model in dependency_order(models):
+        label = model_label(model)
+        fields = tuple(model._meta.fields_db_projection)
+        async for row in model.all().stream(batch_size, values=fields):
+            out.write(encode({"model": label, "fields": row}))
+            out.write("\n")
+            count += 1
+    return count
+
+
+class _ModelLoader:
+    """Inserts one model's rows, in ``batch_size`` transactions, from a queue."""
+
+    def __init__(self, model, after: list["_ModelLoader"], batch_size: int):
+        self.model = model
+        self.after = after
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 2)
+        self.closed = False
+        self.count = 0
+        self.references = self_references(model)
+        # values of the referenced fields of the rows released so far
+        self.seen = {target: set() for _, target in self.references}
+        # (referenced field, value) -> rows waiting for that row
+        self.waiting: dict[tuple, list[dict]] = {}
+
+    async def close(self):
+        if not self.closed:
+            self.closed = True
+            # waits for room while the loader waits for the models it references
+            await self.queue.put(None)
+
+    def _blocker(self, fields: dict) -> tuple | None:
+        for source, target in self.references:
+            value = fields.get(source)
+            if (
+                value is not None
+                and value != fields.get(target)
+                and value not in self.seen[target]
+            ):
+                return target, value
+        return None
+
+    def release(self, fields: dict) -> list[dict]:
+        """
+        ``fields`` and the rows it unblocks, in insertion order, or nothing
+        while it references a row of its own model not released yet.
+        """
+        if not self.references:
+            return [fields]
+        released = []
+        pending = [fields]
+        while pending:
+            row = pending.pop(0)
+            blocker = self._blocker(row)
+            if blocker is not None:
+                self.waiting.setdefault(blocker, []).append(row)
+                continue
+            released.append(row)
+            for _, target in self.references:
+                self.seen[target].add(row.get(target))
+                pending.extend(self.waiting.pop((target, row.get(target)), ()))
+        return released
+
+    async def run(self, slots: asyncio.Semaphore):
+        # rows of the models referenced must be committed first
+        for loader in self.after:
+            await loader.task
+        fields_map = self.model._meta.fields_map
+        batch = []
+        while True:
+            fields = await self.queue.get()
+            if fields is not None:
+                rows = self.release(fields)
+            else:
+                # references to rows outside the fixture, left to the database
+                rows = [row for rows in self.waiting.values() for row in rows]
+                self.waiting.clear()
+            for row in rows:
+                batch.append(
+                    self.model(
+                        **{k: _from_json(fields_map[k], v) for k, v in row.items()}
+                    )
+                )
+            if batch and (fields is None or len(batch) >= self.batch_size):
+                async with slots:
+                    await self.model.insert_many(batch, atomic=True)
+                self.count += len(batch)
+                batch = []
+            if fields is None:
+                break
+        await _reset_sequence(self.model)
+
+
+async def _reset_sequence(model):
+    """Move a Postgres serial primary key past the loaded explicit values."""
+    meta = model._meta
+    db = model._choose_db(True)
+    if db.capabilities.dialect != "postgres" or not meta.pk.generated:
+        return
+    table, column = meta.db_table, meta.db_pk_column
+    await db.execute_query(
+        f"SELECT setval(pg_get_serial_sequence('\"{table}\"', '{column}'), "
+        f'COALESCE(MAX("{column}"), 1), MAX("{column}") IS NOT NULL) FROM "{table}"'
+    )
+
+
+async def load(registry, lines, batch_size: int = 1000, workers: int = 1) -> dict:
+    """
+    Insert the fixture ``lines`` and return the row count per model label.
+    Every model gets its own loader; up to ``workers`` of them insert at
+    once, each waiting for the models it references.
+    """
+    slots = asyncio.Semaphore(workers)
+    loaders: dict = {}
+    try:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                model = registry.get_model(record["model"])
+                fields = record["fields"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Invalid fixture line {number}: {e}") from e
+
+            loader = loaders.get(model)
+            if loader is None:
+                after = [loaders[m] for m in dependencies(model) if m in loaders]
+                for dep in after:
+                    await dep.close()
+                loader = loaders[model] = _ModelLoader(model, after, batch_size)
+                loader.task = asyncio.create_task(loader.run(slots))
+            elif loader.closed:
+                raise ValueError(
+                    f"Invalid fixture line {number}: {record['model']} rows after "
+                    "rows of a model referencing it; fixtures must be in "
+                    "dependency order as written by dumpdata"
+                )
+            await loader.queue.put(fields)
+
+        for loader in loaders.values():
+            await loader.close()
+        await asyncio.gather(*(loader.task for loader in loaders.values()))
+    except BaseException:
+        for loader in loaders.values():
+            loader.task.cancel()
+        await asyncio.gather(
+            *(loader.task for loader in loaders.values()), return_exceptions=True
+        )
+        raise
+    return {model_label(m): loader.count for m, loader in loaders.items()}
@@ -0,0 +1,112 @@
+"""
+Per-request database statistics.
+
+Clients created from ``fastapi_backend.db.backends`` engines, and the
+transaction wrappers they hand out, report every query to the
+``QueryStats`` opened by the innermost ``track_queries()`` block of the
+current context, which passes it on to the enclosing ones.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "db_query_stats", default=None
+)
+
+
+class QueryStats:
+    def __init__(self, parent: "QueryStats | None" = None):
+        self.parent = parent
+        self.queries = 0
+        self.rows = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+        self.pool_wait_seconds = 0.0
+
+    def add(self, seconds: float, rows: int, sql: str | None):
+        self.queries += 1
+        self.rows += rows
+        self.seconds_total += seconds
+        self.seconds_max = max(self.seconds_max, seconds)
+
+    def record_query(self, seconds: float, rows: int, sql: str | None = None):
+        stats = self
+        while stats is not None:
+            stats.add(seconds, rows, sql)
+            stats = stats.parent
+
+    def record_pool_wait(self, seconds: float):
+        stats = self
+        while stats is not None:
+            stats.pool_wait_seconds += seconds
+            stats = stats.parent
+
+    def server_timing(self) -> str:
+        """Format the stats as a ``Server-Timing`` header value."""
+        return (
+            f'db;dur={self.seconds_total * 1e3:.2f};desc="{self.queries} queries, '
+            f'{self.rows} rows", db-max;dur={self.seconds_max * 1e3:.2f}, '
+            f"db-pool;dur={self.pool_wait_seconds * 1e3:.2f}"
+        )
+
+
+@contextmanager
+def track_queries(stats: QueryStats | None = None):
+    """Collect the queries run inside the block into ``stats`` (or new stats)."""
+    if stats is None:
+        stats = QueryStats()
+    stats.parent = _current_stats.get()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def record_pool_wait(seconds: float):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record_pool_wait(seconds)
+
+
+def _result_rows(result) -> int:
+    # execute_query returns (rowcount, rows), execute_query_dict the rows
+    if isinstance(result, tuple):
+        return len(result[1])
+    if isinstance(result, list):
+        return len(result)
+    return 0
+
+
+class InstrumentedClient:
+    """Client mixin reporting the ``execute_*`` calls to ``track_queries()``."""
+
+    async def _timed(self, call, sql: str):
+        stats = _current_stats.get()
+        if stats is None:
+            return await call
+        start = time.perf_counter()
+        rows = 0
+        try:
+            result = await call
+            rows = _result_rows(result)
+            return result
+        finally:
+            stats.record_query(time.perf_counter() - start, rows, sql)
+
+    async def execute_insert(self, query: str, values: list):
+        return await self._timed(super().execute_insert(query, values), query)
+
+    async def execute_many(self, query: str, values: list):
+        return await self._timed(super().execute_many(query, values), query)
+
+    async def execute_query(self, query: str, values: list | None = None):
+        return await self._timed(super().execute_query(query, values), query)
+
+    async def execute_query_dict(self, query: str, values: list | None = None):
+        return await self._timed(super().execute_query_dict(query, values), query)
+
+    async def execute_script(self, query: str):
+        return await self._timed(super().execute_script(query), query)
@@ -0,0 +1,152 @@
+"""
+Request-scoped batching of relation loads.
+
+Inside ``loader_scope()`` (every request when ``DATALOADER`` is on, see
+``DataLoaderMiddleware``) awaiting a lazy foreign key, one-to-one or
+reverse foreign key relation of a ``Model`` instance goes through the
+scope's ``RelationLoader``. Loads of the same relation awaited in the same
+event loop iteration, e.g. gathered over a list of instances, are fetched
+with a single ``WHERE field IN (...)`` query, and every result is kept for
+the rest of the scope so loading it again costs no query. Writes through
+``Model`` drop the kept results of the written model.
+
+Batches are fetched in a task of their own; their queries are reported to
+N+1 detection with the relation and call site of their first load.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi_backend.db.nplusone import call_site, tracking_call_sites
+from fastapi_backend.db.relations import _tag
+
+_current_loader: ContextVar["RelationLoader | None"] = ContextVar(
+    "db_relation_loader", default=None
+)
+
+
+class _Batch:
+    __slots__ = ("relation", "site", "futures")
+
+    def __init__(self, relation, site: str | None):
+        self.relation = relation
+        self.site = site
+        # key -> future awaiting the fetch
+        self.futures: dict = {}
+
+
+class RelationLoader:
+    def __init__(self):
+        # (target, target_field, many) -> batch awaiting the next fetch
+        self._pending: dict[tuple, _Batch] = {}
+        # (target, target_field, many, key) -> loaded instance, list or None
+        self._loaded: dict[tuple, object] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def load(self, relation, key) -> asyncio.Future:
+        """Future of the ``relation`` target(s) whose target field is ``key``."""
+        loop = asyncio.get_running_loop()
+        batch_key = (relation.target, relation.target_field, relation.many)
+        try:
+            value = self._loaded[(*batch_key, key)]
+        except KeyError:
+            pass
+        else:
+            future = loop.create_future()
+            future.set_result(list(value) if relation.many else value)
+            return future
+
+        batch = self._pending.get(batch_key)
+        if batch is None:
+            site = call_site() if tracking_call_sites() else None
+            batch = self._pending[batch_key] = _Batch(relation, site)
+            loop.call_soon(self._dispatch, batch_key)
+        future = batch.futures.get(key)
+        if future is None:
+            future = batch.futures[key] = loop.create_future()
+        return future
+
+    def _dispatch(self, batch_key):
+        batch = self._pending.pop(batch_key)
+        task = asyncio.get_running_loop().create_task(self._fetch(batch_key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch_key, batch: _Batch):
+        target, target_field, many = batch_key
+        queryset = target.filter(**{f"{target_field}__in": list(batch.futures)})
+        try:
+            rows = await _tag(queryset, batch.relation, batch.site)
+        except BaseException as e:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        found: dict = (
+            {key: [] for key in batch.futures} if many else dict.fromkeys(batch.futures)
+        )
+        for row in rows:
+            key = getattr(row, target_field)
+            if many:
+                found[key].append(row)
+            else:
+                found[key] = row
+        for key, value in found.items():
+            self._loaded[(*batch_key, key)] = value
+            future = batch.futures[key]
+            if not future.done():
+                future.set_result(list(value) if many else value)
+
+    def forget(self, *models):
+        """Drop the kept results of relations targeting ``models``."""
+        models = set(models)
+        for key in [key for key in self._loaded if key[0] in models]:
+            del self._loaded[key]
+
+
+def get_loader(target=None) -> RelationLoader | None:
+    """
+    The current scope's loader, or None outside scopes and, when ``target``
+    is given, inside transactions on its connection, which load directly.
+    """
+    loader = _current_loader.get()
+    if loader is None or target is None:
+        return loader
+    from tortoise.backends.base.client import TransactionalDBClient
+
+    if isinstance(target._choose_db(), TransactionalDBClient):
+        return None
+    return loader
+
+
+def forget(*models):
+    """Drop results of the current scope's loader targeting ``models``."""
+    loader = _current_loader.get()
+    if loader is not None:
+        loader.forget(*models)
+
+
+@contextmanager
+def loader_scope():
+    """Batch and remember relation loads inside the block."""
+    token = _current_loader.set(RelationLoader())
+    try:
+        yield _current_loader.get()
+    finally:
+        _current_loader.reset(token)
+
+
+class DataLoaderMiddleware:
+    """ASGI middleware running every request in its own ``loader_scope()``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        with loader_scope():
+            await self.app(scope, receive, send)
@@ -1,16 +1,33 @@
 from tortoise.models import ModelMeta, MetaInfo, Model as TortoiseModel
 from tortoise.fields.relational import OneToOneFieldInstance
+from fastapi_backend.db import bulk, relations, serializers
+from fastapi_backend.db.cache import invalidate
+from fastapi_backend.db.queryset import Manager
 from fastapi_backend.modules.registry import ModulesRegistry, modules
+from fastapi_backend.utils.profiling import span
 
 __all__ = ["Model"]
 
 
 class ModelMetaInfo(MetaInfo):
-    __slots__ = MetaInfo.__slots__ + ("registry",)
+    __slots__ = MetaInfo.__slots__ + ("registry", "serializers")
 
     def __init__(self, meta):
         super().__init__(meta)
         self.registry: ModulesRegistry = getattr(meta, "registry", modules)
+        self.serializers: dict = {}
+        if getattr(meta, "manager", None) is None:
+            self.manager = Manager()
+
+    def _generate_lazy_fk_m2m_fields(self):
+        super()._generate_lazy_fk_m2m_fields()
+        relations.install(self)
+
+    def finalise_model(self):
+        super().finalise_model()
+        # relations have added their key columns, the default set is final
+        self.serializers.clear()
+        serializers.get_serializer(self._model)
 
 
 class ModelMetaclass(ModelMeta):
@@ -20,28 +37,29 @@ class ModelMetaclass(ModelMeta):
             return super().__new__(cls, name, bases, attrs)
 
         py_module = attrs.get("__module__", None)
-        meta_class: Model.Meta = attrs.get("Meta", type("Meta", (), {}))
-        is_abstract = getattr(meta_class, "abstract", False)
-
-        module_label = None
-        module_config = modules.get_containing_module_config(py_module)
-
-        if getattr(meta_class, "app", None) is None:
-            if module_config is None:
-                if not is_abstract:
-                    raise RuntimeError(
-                        "Model class %s.%s doesn't declare an explicit "
-                        "app and isn't in an application in "
-                        "INSTALLED_MODULES." % (py_module, name)
-                    )
-            else:
-                module_label = module_config.label
+        with span("models.metaclass", f"{py_module}.{name}"):
+            meta_class: Model.Meta = attrs.get("Meta", type("Meta", (), {}))
+            is_abstract = getattr(meta_class, "abstract", False)
 
-        meta_class.app = module_label
-        attrs["Meta"] = meta_class
-        new_class = super().__new__(cls, name, bases, attrs)
-        new_class._meta.registry.register_model(new_class._meta.app, new_class)
-        return new_class
+            module_label = None
+            module_config = modules.get_containing_module_config(py_module)
+
+            if getattr(meta_class, "app", None) is None:
+                if module_config is None:
+                    if not is_abstract:
+                        raise RuntimeError(
+                            "Model class %s.%s doesn't declare an explicit "
+                            "app and isn't in an application in "
+                            "INSTALLED_MODULES." % (py_module, name)
+                        )
+                else:
+                    module_label = module_config.label
+                meta_class.app = module_label
+
+            attrs["Meta"] = meta_class
+            new_class = super().__new__(cls, name, bases, attrs)
+            new_class._meta.registry.register_model(new_class._meta.app, new_class)
+            return new_class
 
     @staticmethod
     def build_meta(
@@ -78,3 +96,65 @@ class ModelMetaclass(ModelMeta):
 
 class Model(TortoiseModel, metaclass=ModelMetaclass):
     _meta = ModelMetaInfo(None)
+
+    @classmethod
+    def stream(cls, batch_size: int = 1000, values: tuple[str, ...] | None = None):
+        """Stream every row of the table, see ``QuerySet.stream``."""
+        return cls.all().stream(batch_size, values)
+
+    @classmethod
+    async def insert_many(
+        cls, objects, batch_size=None, atomic=False, using_db=None
+    ) -> list:
+        """Insert ``objects`` in multi-row chunks, returning their primary keys."""
+        return await bulk.insert_many(
+            cls, objects, batch_size=batch_size, atomic=atomic, using_db=using_db
+        )
+
+    @classmethod
+    async def upsert_many(
+        cls,
+        objects,
+        on_conflict: tuple[str, ...],
+        update_fields: tuple[str, ...] | None = None,
+        batch_size=None,
+        atomic=False,
+        using_db=None,
+    ) -> list:
+        """Insert ``objects``, updating rows that clash on ``on_conflict``."""
+        return await bulk.insert_many(
+            cls,
+            objects,
+            batch_size=batch_size,
+            atomic=atomic,
+            using_db=using_db,
+            on_conflict=on_conflict,
+            update_fields=update_fields,
+        )
+
+    @classmethod
+    async def update_many(
+        cls,
+        objects,
+        fields: tuple[str, ...],
+        batch_size=None,
+        atomic=False,
+        using_db=None,
+    ) -> int:
+        """Update ``fields`` of ``objects`` by primary key in chunks."""
+        return await bulk.update_many(
+            cls,
+            objects,
+            fields,
+            batch_size=batch_size,
+            atomic=atomic,
+            using_db=using_db,
+        )
+
+    async def save(self, *args, **kwargs):
+        await super().save(*args, **kwargs)
+        await invalidate(type(self))
+
+    async def delete(self, *args, **kwargs):
+        await super().delete(*args, **kwargs)
+        await invalidate(type(self))
@@ -0,0 +1,174 @@
+"""
+N+1 query detection and query count assertions.
+
+``detect_n_plus_one()`` fingerprints the SELECTs run in its block (a request
+when DEBUG is on, see ``NPlusOneMiddleware``) and reports a statement shape
+repeated ``threshold`` times from the same line of application code, naming
+the relation to prefetch when lazy relation access issued it.
+"""
+
+import logging
+import re
+import sys
+import warnings
+from contextlib import contextmanager
+from fastapi_backend.db.instrumentation import (
+    QueryStats,
+    _current_stats,
+    track_queries,
+)
+from fastapi_backend.db.relations import loading_relation, loading_site
+
+logger = logging.getLogger("fastapi_backend.db.nplusone")
+
+# Frames of these packages are skipped when looking for the call site.
+INTERNAL_MODULES = (
+    "fastapi_backend.db",
+    "fastapi_backend.core",
+    "tortoise",
+    "pypika",
+    "aiosqlite",
+    "asyncpg",
+    "asyncio",
+    "contextlib",
+    "starlette",
+    "fastapi",
+    "anyio",
+)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+class NPlusOneWarning(UserWarning):
+    pass
+
+
+class NPlusOneError(RuntimeError):
+    pass
+
+
+def fingerprint(sql: str) -> str:
+    """Shape of ``sql``: literals and placeholders as ``?``, IN lists collapsed."""
+    sql = _LITERALS.sub("?", sql)
+    sql = _IN_LISTS.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def call_site() -> str | None:
+    """
+    ``file:line in function`` of the innermost non-framework caller, or of
+    the first caller of the batched relation load running.
+    """
+    site = loading_site()
+    if site is not None:
+        return site
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(INTERNAL_MODULES):
+            code = frame.f_code
+            return f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def tracking_call_sites() -> bool:
+    """Whether a block of the current context reports queries by call site."""
+    stats = _current_stats.get()
+    while stats is not None:
+        if isinstance(stats, (QueryLog, NPlusOneDetector)):
+            return True
+        stats = stats.parent
+    return False
+
+
+class QueryLog(QueryStats):
+    """Query stats also keeping every statement with its call site."""
+
+    def __init__(self):
+        super().__init__()
+        self.statements: list[tuple[str, str | None]] = []
+
+    def add(self, seconds, rows, sql):
+        super().add(seconds, rows, sql)
+        if sql is not None:
+            self.statements.append((sql, call_site()))
+
+
+class NPlusOneDetector(QueryStats):
+    def __init__(self, threshold: int = 5, action: str = "warn"):
+        if action not in ("warn", "raise", "log"):
+            raise ValueError(f"Unknown N+1 action {action!r}")
+        super().__init__()
+        self.threshold = threshold
+        self.action = action
+        self.counts: dict[tuple[str, str | None], int] = {}
+        self.reports: list[str] = []
+
+    def add(self, seconds, rows, sql):
+        super().add(seconds, rows, sql)
+        if sql is None or not sql.lstrip()[:6].upper() == "SELECT":
+            return
+        key = (fingerprint(sql), call_site())
+        count = self.counts[key] = self.counts.get(key, 0) + 1
+        if count == self.threshold:
+            self.report(*key, loading_relation())
+
+    def report(self, shape: str, site: str | None, relation):
+        message = (
+            f"Possible N+1 query: ran {self.threshold} times from "
+            f"{site or 'an unknown call site'}: {shape}"
+        )
+        if relation is not None:
+            message += (
+                f"\nIt lazily loads {relation.model.__name__}.{relation.name}; "
+                f"consider {relation.suggestion()}"
+            )
+        self.reports.append(message)
+        if self.action == "raise":
+            raise NPlusOneError(message)
+        if self.action == "warn":
+            warnings.warn(message, NPlusOneWarning, stacklevel=2)
+        else:
+            logger.warning(message)
+
+
+@contextmanager
+def detect_n_plus_one(threshold: int = 5, action: str = "warn"):
+    """
+    Report SELECT shapes run ``threshold`` times from one call site inside
+    the block by warning, logging or raising ``NPlusOneError``.
+    """
+    with track_queries(NPlusOneDetector(threshold, action)) as detector:
+        yield detector
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fail with the statements run if the block runs more than ``limit`` queries."""
+    with track_queries(QueryLog()) as log:
+        yield log
+    if log.queries > limit:
+        statements = "\n".join(
+            f"{i}. {sql}  [{site}]" for i, (sql, site) in enumerate(log.statements, 1)
+        )
+        raise AssertionError(
+            f"{log.queries} queries executed, at most {limit} expected:\n{statements}"
+        )
+
+
+class NPlusOneMiddleware:
+    """ASGI middleware running every HTTP request in ``detect_n_plus_one()``."""
+
+    def __init__(self, app, threshold: int = 5, action: str = "warn"):
+        self.app = app
+        self.threshold = threshold
+        self.action = action
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        with detect_n_plus_one(self.threshold, self.action):
+            await self.app(scope, receive, send)
@@ -0,0 +1,99 @@
+from operator import attrgetter, itemgetter
+from tortoise.manager import Manager as TortoiseManager
+from tortoise.queryset import QuerySet as TortoiseQuerySet
+from fastapi_backend.db.cache import invalidate
+from fastapi_backend.db.relations import _loading_relation, _loading_site
+
+
+class WriteQuery:
+    """Awaitable proxy over a write query, invalidating its model once it ran."""
+
+    def __init__(self, query):
+        self.query = query
+
+    def __await__(self):
+        return self._execute().__await__()
+
+    async def _execute(self):
+        result = await self.query
+        await invalidate(self.query.model)
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.query, name)
+
+
+class QuerySet(TortoiseQuerySet):
+    __slots__ = ("_relation", "_loading_site")
+
+    def __init__(self, model):
+        super().__init__(model)
+        self._relation = None
+        self._loading_site = None
+
+    def _clone(self):
+        queryset = super()._clone()
+        queryset._relation = self._relation
+        queryset._loading_site = self._loading_site
+        return queryset
+
+    async def _execute(self):
+        if self._relation is None:
+            return await super()._execute()
+        token = _loading_relation.set(self._relation)
+        site_token = _loading_site.set(self._loading_site)
+        try:
+            return await super()._execute()
+        finally:
+            _loading_site.reset(site_token)
+            _loading_relation.reset(token)
+
+    async def stream(
+        self, batch_size: int = 1000, values: tuple[str, ...] | None = None
+    ):
+        """
+        Yield every matching row, fetching ``batch_size`` rows at a time in
+        primary key order with ``pk > last`` instead of OFFSET, so memory
+        stays bounded and late batches cost the same as the first. With
+        ``values`` rows are dicts of those fields (plus the primary key).
+        """
+        if self._limit is not None or self._offset is not None:
+            raise ValueError("stream() does not support limit() or offset()")
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        pk = self.model._meta.pk_attr
+        queryset = self.order_by(pk).limit(batch_size)
+        if values is not None:
+            if pk not in values:
+                values = (pk, *values)
+            get_pk = itemgetter(pk)
+        else:
+            get_pk = attrgetter(pk)
+
+        last = None
+        while True:
+            batch = queryset if last is None else queryset.filter(**{f"{pk}__gt": last})
+            rows = await (batch if values is None else batch.values(*values))
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            last = get_pk(rows[-1])
+
+    def update(self, **kwargs):
+        return WriteQuery(super().update(**kwargs))
+
+    def delete(self):
+        return WriteQuery(super().delete())
+
+    def bulk_create(self, objects, *args, **kwargs):
+        return WriteQuery(super().bulk_create(objects, *args, **kwargs))
+
+    def bulk_update(self, objects, fields, *args, **kwargs):
+        return WriteQuery(super().bulk_update(objects, fields, *args, **kwargs))
+
+
+class Manager(TortoiseManager):
+    def get_queryset(self) -> QuerySet:
+        return QuerySet(self._model)
@@ -0,0 +1,207 @@
+"""
+Lazy relation accessors of ``Model`` instances.
+
+They behave like Tortoise's own, except that:
+
+* the querysets they create carry the relation they load, which is current
+  (see ``loading_relation()``) while such a queryset runs, so query
+  instrumentation can tell relation loads apart from other queries; batched
+  loads also carry the call site of the code that awaited them first
+  (see ``loading_site()``), as they run in a task of their own;
+* inside a ``loader_scope()`` awaiting them goes through the scope's
+  ``RelationLoader``, which batches loads and remembers their results.
+"""
+
+from contextvars import ContextVar
+from functools import partial
+from tortoise.fields.relational import ReverseRelation as TortoiseReverseRelation
+
+_loading_relation: ContextVar["Relation | None"] = ContextVar(
+    "db_loading_relation", default=None
+)
+_loading_site: ContextVar[str | None] = ContextVar("db_loading_site", default=None)
+
+
+class Relation:
+    """
+    Relation ``name`` of ``model`` to ``target``: loading it for an instance
+    selects the ``target`` rows whose ``target_field`` equals the instance's
+    ``source_attr``, a single one unless ``many``.
+    """
+
+    __slots__ = ("model", "name", "target", "source_attr", "target_field", "many")
+
+    def __init__(self, model, name, target, source_attr, target_field, many):
+        self.model = model
+        self.name = name
+        self.target = target
+        self.source_attr = source_attr
+        self.target_field = target_field
+        self.many = many
+
+    @property
+    def joinable(self) -> bool:
+        # forward foreign keys and one-to-ones can be JOINed by select_related
+        return self.name in self.model._meta.fk_fields | self.model._meta.o2o_fields
+
+    def suggestion(self) -> str:
+        method = "select_related" if self.joinable else "prefetch_related"
+        return f"{self.model.__name__} querysets: .{method}({self.name!r})"
+
+    def __repr__(self):
+        return f"<Relation {self.model.__name__}.{self.name}>"
+
+
+def loading_relation() -> Relation | None:
+    """The relation loaded by the running queryset, if any."""
+    return _loading_relation.get()
+
+
+def loading_site() -> str | None:
+    """The call site the running relation load was awaited from, if recorded."""
+    return _loading_site.get()
+
+
+def _tag(queryset, relation: Relation, site: str | None = None):
+    if hasattr(queryset, "_relation"):
+        queryset._relation = relation
+        queryset._loading_site = site
+    return queryset
+
+
+class RelatedInstance:
+    """
+    Awaitable loading a single related instance through a ``RelationLoader``.
+    Anything but awaiting it, e.g. ``.only()`` or ``.values()``, goes to the
+    relation's queryset, which queries directly.
+    """
+
+    __slots__ = ("loader", "instance", "relation", "queryset")
+
+    def __init__(self, loader, instance, relation: Relation, queryset):
+        self.loader = loader
+        self.instance = instance
+        self.relation = relation
+        self.queryset = queryset
+
+    def __getattr__(self, name):
+        return getattr(self.queryset, name)
+
+    def __await__(self):
+        return self._load().__await__()
+
+    async def _load(self):
+        value = await self.loader.load(
+            self.relation, getattr(self.instance, self.relation.source_attr)
+        )
+        if value is not None:
+            setattr(self.instance, f"_{self.relation.name}", value)
+        return value
+
+
+class ReverseRelation(TortoiseReverseRelation):
+    def __init__(self, *args, relation: Relation):
+        super().__init__(*args)
+        self.relation = relation
+
+    @property
+    def _query(self):
+        return _tag(super()._query, self.relation)
+
+    def __await__(self):
+        from fastapi_backend.db.loader import get_loader
+
+        loader = get_loader(self.relation.target)
+        if loader is None:
+            return super().__await__()
+        return self._load(loader).__await__()
+
+    async def _load(self, loader):
+        if not self.instance._saved_in_db:
+            # the plain query raises the usual OperationalError
+            return await self._query
+        related = await loader.load(
+            self.relation, getattr(self.instance, self.from_field)
+        )
+        self._set_result_for_query(related)
+        return related
+
+
+def _rfk_getter(instance, _key, ftype, frelfield, from_field, relation):
+    value = getattr(instance, _key, None)
+    if value is None:
+        value = ReverseRelation(
+            ftype, frelfield, instance, from_field, relation=relation
+        )
+        setattr(instance, _key, value)
+    return value
+
+
+def _single_getter(instance, fget, relation):
+    from fastapi_backend.db.loader import get_loader
+
+    value = fget(instance)
+    if not hasattr(value, "_relation"):
+        # already loaded, or no related row to load
+        return value
+    value = _tag(value, relation)
+    loader = get_loader(relation.target)
+    if loader is None:
+        return value
+    return RelatedInstance(loader, instance, relation, value)
+
+
+def install(meta):
+    """Replace the lazy relation properties Tortoise generated for ``meta``."""
+    model = meta._model
+    for name in (*meta.fk_fields, *meta.o2o_fields):
+        field = meta.fields_map[name]
+        relation = Relation(
+            model,
+            name,
+            field.related_model,
+            field.source_field,
+            field.to_field_instance.model_field_name,
+            many=False,
+        )
+        prop = getattr(model, name)
+        fget = partial(_single_getter, fget=prop.fget, relation=relation)
+        setattr(model, name, property(fget, prop.fset, prop.fdel))
+
+    for name in meta.backward_o2o_fields:
+        field = meta.fields_map[name]
+        relation = Relation(
+            model,
+            name,
+            field.related_model,
+            field.to_field_instance.model_field_name,
+            field.relation_field,
+            many=False,
+        )
+        prop = getattr(model, name)
+        setattr(
+            model,
+            name,
+            property(partial(_single_getter, fget=prop.fget, relation=relation)),
+        )
+
+    for name in meta.backward_fk_fields:
+        field = meta.fields_map[name]
+        from_field = field.to_field_instance.model_field_name
+        relation = Relation(
+            model,
+            name,
+            field.related_model,
+            from_field,
+            field.relation_field,
+            many=True,
+        )
+        fget = partial(
+            _rfk_getter,
+            _key=f"_{name}",
+            ftype=field.related_model,
+            frelfield=field.relation_field,
+            from_field=from_field,
+            relation=relation,
+        )
+        setattr(model, name, property(fget))
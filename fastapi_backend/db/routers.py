@@ -0,0 +1,142 @@
+"""
+Database routing between the "default" (primary) connection and the
+replicas declared in ``DATABASES``.
+
+Routers are plain classes with ``db_for_read(model)`` and
+``db_for_write(model)`` returning a connection alias or None to defer to
+the next router. They are collected from ``settings.DATABASE_ROUTERS`` and
+from each ``ModuleConfig.database_routers``, with ``ReplicaRouter`` as the
+fallback; ``ModulesRouter`` chains them and is what Tortoise is given.
+"""
+
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi_backend.utils.loaders import import_string
+
+PRIMARY_ALIAS = "default"
+
+_routing_state: ContextVar[dict | None] = ContextVar("db_routing_state", default=None)
+
+
+@contextmanager
+def routing_scope():
+    """
+    Scope (usually one request) in which reads follow writes: once anything
+    is written, later reads in the scope go to the connection written to.
+    """
+    token = _routing_state.set({"pinned": False})
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+def pin_primary():
+    """Send the remaining reads of the current routing scope to the primary."""
+    state = _routing_state.get()
+    if state is not None:
+        state["pinned"] = True
+
+
+def is_pinned() -> bool:
+    state = _routing_state.get()
+    return state is not None and state["pinned"]
+
+
+def replica_aliases(settings) -> list[str]:
+    return [
+        alias
+        for alias, database in settings.DATABASES.items()
+        if database.get("REPLICA", False)
+    ]
+
+
+class BaseRouter:
+    def db_for_read(self, model) -> str | None:
+        return None
+
+    def db_for_write(self, model) -> str | None:
+        return None
+
+
+class ReplicaRouter(BaseRouter):
+    """Send writes to ``primary`` and spread reads round-robin over ``replicas``."""
+
+    def __init__(self, primary: str = PRIMARY_ALIAS, replicas=()):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._replicas = itertools.cycle(self.replicas) if self.replicas else None
+
+    def db_for_read(self, model):
+        if self._replicas is None:
+            return None
+        return next(self._replicas)
+
+    def db_for_write(self, model):
+        return self.primary
+
+
+class ModulesRouter:
+    """
+    Consult every configured router in turn. Reads inside a transaction, or
+    after a write in the same routing scope, go where writes would.
+    """
+
+    def __init__(self, routers: list | None = None):
+        if routers is None:
+            routers = self._configured_routers()
+        self.routers = routers
+
+    @staticmethod
+    def _configured_routers() -> list:
+        from fastapi_backend.conf import settings
+        from fastapi_backend.modules import modules
+
+        paths = list(settings.DATABASE_ROUTERS)
+        for cfg in modules.module_configs.values():
+            paths.extend(cfg.database_routers)
+        routers = [import_string(path)() for path in paths]
+        routers.append(ReplicaRouter(replicas=replica_aliases(settings)))
+        return routers
+
+    def _route(self, action: str, model) -> str | None:
+        for router in self.routers:
+            alias = getattr(router, action)(model)
+            if alias:
+                return alias
+        return None
+
+    def db_for_write(self, model):
+        pin_primary()
+        return self._route("db_for_write", model)
+
+    def db_for_read(self, model):
+        primary = self._route("db_for_write", model)
+        if is_pinned() or _in_transaction(primary or model._meta.default_connection):
+            return primary
+        return self._route("db_for_read", model)
+
+
+def _in_transaction(alias: str) -> bool:
+    from tortoise.backends.base.client import TransactionalDBClient
+    from tortoise.context import get_current_context
+
+    context = get_current_context()
+    if context is None:
+        return False
+    # in_transaction() swaps the alias' client for its transaction wrapper
+    return isinstance(context.connections.get(alias), TransactionalDBClient)
+
+
+class RoutingScopeMiddleware:
+    """ASGI middleware running every request in its own ``routing_scope()``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        with routing_scope():
+            await self.app(scope, receive, send)
@@ -0,0 +1,119 @@
+"""
+JSON serializers generated per model and field subset.
+
+Each serializer is compiled from generated source that reads the fields of
+an instance (or of a ``values()`` row) and concatenates their JSON text,
+the encoder of every field being picked once from its type instead of per
+value. The default field set of a model, its database columns as in
+``fields_db_projection``, is compiled when Tortoise finalises the model and
+other subsets on first use; all are kept on ``Model._meta``.
+"""
+
+import json
+import math
+from json.encoder import encode_basestring
+from tortoise.fields import data
+from fastapi_backend.utils.encoding import base64_text, duration_iso, json_default
+
+_dumps = json.JSONEncoder(
+    default=json_default, ensure_ascii=False, separators=(",", ":")
+).encode
+
+
+def _float(value) -> str:
+    # JSON has no NaN or infinities
+    return float.__repr__(float(value)) if math.isfinite(value) else "null"
+
+
+# Expressions encoding a non-null value ``{v}`` by field type, most specific first.
+_ENCODERS = (
+    (data.IntEnumFieldInstance, "_int({v}.value)"),
+    (data.CharEnumFieldInstance, "_dumps({v}.value)"),
+    (data.BooleanField, '("true" if {v} else "false")'),
+    (data.IntField, "_int({v})"),
+    (data.FloatField, "_float({v})"),
+    ((data.CharField, data.TextField), "_str({v})"),
+    ((data.DatetimeField, data.DateField, data.TimeField), "_quote({v}.isoformat())"),
+    ((data.DecimalField, data.UUIDField), "_quote(str({v}))"),
+    (data.TimeDeltaField, "_quote(_duration({v}))"),
+    (data.BinaryField, "_quote(_base64({v}))"),
+)
+
+_NAMESPACE = {
+    "_int": int.__repr__,
+    "_float": _float,
+    "_str": encode_basestring,
+    "_quote": lambda text: f'"{text}"',
+    "_dumps": _dumps,
+    "_duration": duration_iso,
+    "_base64": base64_text,
+}
+
+
+def _encoder(field) -> str:
+    for field_class, expression in _ENCODERS:
+        if isinstance(field, field_class):
+            return expression
+    return "_dumps({v})"
+
+
+def _compile(model, fields: tuple[str, ...], access: str):
+    """Compile ``serialize(obj)``, reading each field with ``access`` % name."""
+    fields_map = model._meta.fields_map
+    lines = ["def serialize(obj):"]
+    parts = []
+    for i, name in enumerate(fields):
+        value = f"v{i}"
+        lines.append(f"    {value} = {access % name}")
+        text = ("{" if i == 0 else ",") + encode_basestring(name) + ":"
+        encoded = _encoder(fields_map[name]).format(v=value)
+        parts.append(f"{text!r} + ('null' if {value} is None else {encoded})")
+    parts.append("'}'" if fields else "'{}'")
+    lines.append("    return " + " + ".join(parts))
+    namespace = dict(_NAMESPACE)
+    exec("\n".join(lines), namespace)
+    return namespace["serialize"]
+
+
+class ModelSerializer:
+    """JSON encoding of ``fields`` of ``model`` instances and ``values()`` rows."""
+
+    __slots__ = ("model", "fields", "instance", "row")
+
+    def __init__(self, model, fields: tuple[str, ...]):
+        unknown = [
+            name for name in fields if name not in model._meta.fields_db_projection
+        ]
+        if unknown:
+            raise ValueError(
+                "%s has no database fields %s" % (model.__name__, ", ".join(unknown))
+            )
+        self.model = model
+        self.fields = fields
+        self.instance = _compile(model, fields, "obj.%s")
+        self.row = _compile(model, fields, "obj[%r]")
+
+    def dumps(self, obj) -> str:
+        """JSON text of an instance or a row."""
+        return (self.row if isinstance(obj, dict) else self.instance)(obj)
+
+    def dumps_many(self, objects) -> bytes:
+        """JSON array of instances or rows, as UTF-8 bytes."""
+        objects = list(objects)
+        if not objects:
+            return b"[]"
+        serialize = self.row if isinstance(objects[0], dict) else self.instance
+        return ("[" + ",".join(map(serialize, objects)) + "]").encode()
+
+
+def get_serializer(model, fields: tuple[str, ...] | None = None) -> ModelSerializer:
+    """The serializer of ``fields`` (all database fields by default) of ``model``."""
+    if fields is None:
+        fields = tuple(model._meta.fields_db_projection)
+    else:
+        fields = tuple(fields)
+    serializers = model._meta.serializers
+    serializer = serializers.get(fields)
+    if serializer is None:
+        serializer = serializers[fields] = ModelSerializer(model, fields)
+    return serializer
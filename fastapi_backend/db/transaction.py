@@ -0,0 +1,59 @@
+"""
+Callbacks deferred until the surrounding transaction commits.
+
+The engines in ``fastapi_backend.db.backends`` wrap every outermost
+transaction in ``CommitHooksContext``, which runs the callbacks registered
+with ``on_commit()`` once the transaction committed and drops them if it
+rolled back.
+"""
+
+import inspect
+from contextvars import ContextVar
+
+_commit_hooks: ContextVar[list | None] = ContextVar("db_commit_hooks", default=None)
+
+
+async def _call(func):
+    result = func()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def on_commit(func):
+    """
+    Call ``func`` (a plain or async callable taking no arguments) after the
+    current transaction commits, or right away outside transactions.
+    """
+    hooks = _commit_hooks.get()
+    if hooks is None:
+        await _call(func)
+    else:
+        hooks.append(func)
+
+
+class CommitHooksContext:
+    """Proxy over a Tortoise transaction context collecting ``on_commit()`` hooks."""
+
+    def __init__(self, context):
+        self.context = context
+        self._token = None
+
+    async def __aenter__(self):
+        self._token = _commit_hooks.set([])
+        try:
+            return await self.context.__aenter__()
+        except BaseException:
+            _commit_hooks.reset(self._token)
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        hooks = _commit_hooks.get()
+        _commit_hooks.reset(self._token)
+        result = await self.context.__aexit__(exc_type, exc_val, exc_tb)
+        if exc_type is None:
+            for func in hooks:
+                await _call(func)
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.context, name)
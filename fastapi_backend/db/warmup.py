@@ -0,0 +1,24 @@
+"""
+Per-model state built ahead of traffic.
+
+Tortoise prepares the insert and delete SQL of a model when the first query
+creates its executor on a connection, the update SQL on the first save(),
+and a select is compiled through several lazily imported modules the first
+time a query runs. ``warm_model`` does all of it (and builds the model's
+default serializer) at startup, without touching the database.
+"""
+
+from fastapi_backend.db.serializers import get_serializer
+
+
+def warm_model(model):
+    """Build the cached SQL and serializer of ``model`` for its connections."""
+    connections = {}
+    for for_write in (True, False):
+        db = model._choose_db(for_write)
+        connections[db.connection_name] = db
+    for db in connections.values():
+        executor = db.executor_class(model=model, db=db)
+        executor.get_update_sql(None, None)
+    model.all().limit(1).sql()
+    get_serializer(model)
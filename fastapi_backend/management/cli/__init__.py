@@ -1,18 +1,12 @@
+import sys
 from cyclopts import App
-from fastapi_backend import setup
-from .discover import autodiscover
+from .discover import lazy_autodiscover
 
 
-def cli():
-    setup()
-
+def cli(tokens: list[str] | None = None):
+    if tokens is None:
+        tokens = sys.argv[1:]
     cli_app = App()
-    commands = autodiscover()
-
-    core_cmds = commands.pop("fastapi_backend", None)
-    if core_cmds:
-        cli_app.command(core_cmds, name="*")
-    for group, app in commands.items():
-        cli_app.command(group)(app)
+    lazy_autodiscover(cli_app, tokens=tokens)
 
-    cli_app()
+    cli_app(tokens)
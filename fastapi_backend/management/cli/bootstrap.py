@@ -0,0 +1,34 @@
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+
+class Bootstrap(IntEnum):
+    """How much of the framework a management command needs before it runs."""
+
+    NOTHING = 0
+    SETTINGS = 1
+    REGISTRY = 2
+    DATABASE = 3
+
+
+def bootstrap(level: Bootstrap):
+    """Load settings and populate the modules registry up to ``level``."""
+    if level >= Bootstrap.REGISTRY:
+        from fastapi_backend import setup
+
+        setup()
+    elif level >= Bootstrap.SETTINGS:
+        from fastapi_backend.conf import settings  # noqa: F401
+
+
+@asynccontextmanager
+async def open_database():
+    """Initialize Tortoise for the duration of a command."""
+    from tortoise import Tortoise
+    from fastapi_backend.db.config import get_tortoise_config
+
+    await Tortoise.init(config=get_tortoise_config())
+    try:
+        yield
+    finally:
+        await Tortoise.close_connections()
@@ -1,19 +1,23 @@
+import functools
+import inspect
 from abc import ABC, abstractmethod
 from cyclopts import App
 from fastapi_backend.utils.string import camel_to_snake
 from pathlib import Path
+from .bootstrap import Bootstrap, bootstrap, open_database
 
 
 class BaseCommand(ABC):
     help: str | None = None
     name: str | None = None
     alias: str | None = None
+    requires: Bootstrap = Bootstrap.REGISTRY
 
     def __init__(self, app: App):
         self.app = app
         self.console = app.console
         self.app.command(
-            self.handle,
+            self.entrypoint,
             name=self.command_name,
             help=self.help or self.handle.__doc__,
             alias=self.alias,
@@ -29,6 +33,31 @@ class BaseCommand(ABC):
                 return n.removesuffix("_command")
         return self.name
 
+    @functools.cached_property
+    def entrypoint(self):
+        """``handle`` wrapped to bootstrap only what ``requires`` asks for."""
+        handle = self.handle
+
+        if self.requires < Bootstrap.DATABASE:
+
+            @functools.wraps(handle)
+            def run(*args, **kwargs):
+                bootstrap(self.requires)
+                return handle(*args, **kwargs)
+
+            return run
+
+        @functools.wraps(handle)
+        async def run_with_database(*args, **kwargs):
+            bootstrap(self.requires)
+            async with open_database():
+                result = handle(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+        return run_with_database
+
     @abstractmethod
     def handle(self, **options):
         raise NotImplementedError()
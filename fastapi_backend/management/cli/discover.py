@@ -1,23 +1,81 @@
+import hashlib
 import importlib
+import json
+import os
 import pkgutil
 import inspect
+from pathlib import Path
 from cyclopts import App
+from .bootstrap import Bootstrap
 from .command import BaseCommand
-from fastapi_backend.management import commands
 from fastapi_backend.utils.loaders import module_has_submodule, import_module
 
+MANIFEST_VERSION = 2
+MANIFEST_FILE_NAME = "commands.json"
+LAZY_MODULE = "fastapi_backend.management.cli.lazy"
+CORE_LABEL = "fastapi_backend"
 
-def autodiscover():
+
+def _core_module():
     import fastapi_backend
-    from fastapi_backend.modules import modules, ModuleConfig
+    from fastapi_backend.modules import ModuleConfig
 
-    sub_commands = {}
+    return ModuleConfig(CORE_LABEL, fastapi_backend)
+
+
+def _installed_modules():
+    from fastapi_backend.conf import settings
+    from fastapi_backend.modules import modules
+    from fastapi_backend.modules.manifest import MANIFEST_FILE_NAME
+
+    # Commands are discovered from module configs alone; models are only
+    # imported once a command asks for the registry.
+    modules.populate_configs(
+        settings.INSTALLED_MODULES,
+        manifest=Path(settings.CACHE_DIR, MANIFEST_FILE_NAME),
+    )
+    return list(modules.module_configs.values())
+
+
+def _allowed_modules():
+    return _installed_modules() + [_core_module()]
+
+
+def core_manifest_path() -> Path:
+    """
+    Where the manifest of the core commands is kept. They are listed before
+    settings are loaded, so it is only under CACHE_DIR when the environment
+    sets it, and in the user's cache directory otherwise.
+    """
+    import fastapi_backend
+
+    root = os.environ.get("CACHE_DIR")
+    if not root:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        root = Path(cache_home, "fastapi_backend")
+    package = str(Path(fastapi_backend.__file__).parent.resolve())
+    digest = hashlib.sha1(package.encode()).hexdigest()[:16]
+    return Path(root, f"core-{digest}-{MANIFEST_FILE_NAME}")
 
-    allowed_modules = list(modules.module_configs.values()) + [
-        ModuleConfig("fastapi_backend", fastapi_backend)
-    ]
 
-    for cfg in allowed_modules:
+def _iter_commands(cfg):
+    for _, mod_name, _ in pkgutil.iter_modules(cfg.commands_module.__path__):
+        if module_has_submodule(cfg.commands_module, mod_name):
+            mod = import_module(f"{cfg.commands_module.__name__}.{mod_name}")
+            for _, obj in inspect.getmembers(mod, inspect.isclass):
+                if (
+                    issubclass(obj, BaseCommand)
+                    and obj is not BaseCommand
+                    and obj.__module__ == mod.__name__
+                ):
+                    yield obj
+
+
+def autodiscover():
+    """Import every command module and return eagerly registered apps."""
+    sub_commands = {}
+
+    for cfg in _allowed_modules():
         if cfg.commands_module is None:
             continue
         if not hasattr(cfg.commands_module, "__path__"):
@@ -29,13 +87,154 @@ def autodiscover():
             help=getattr(cfg.commands_module, "help", ""),
         )
 
-        for _, mod_name, _ in pkgutil.iter_modules(cfg.commands_module.__path__):
-            if module_has_submodule(cfg.commands_module, mod_name):
-                mod = import_module(f"{cfg.commands_module.__name__}.{mod_name}")
-                for _, obj in inspect.getmembers(mod, inspect.isclass):
-                    if issubclass(obj, BaseCommand) and obj is not BaseCommand:
-                        obj(app)
+        for obj in _iter_commands(cfg):
+            obj(app)
 
         sub_commands[cfg.label] = app
 
     return sub_commands
+
+
+def _commands_dir(cfg) -> Path:
+    return Path(cfg.path, "management", "commands")
+
+
+def fingerprint(configs) -> str:
+    """
+    Hash the command packages of ``configs`` by file name, size and mtime,
+    without importing anything.
+    """
+    digest = hashlib.sha1()
+    for cfg in configs:
+        cmd_dir = _commands_dir(cfg)
+        digest.update(f"{cfg.label}:{cfg.name}:{cmd_dir}\n".encode())
+        try:
+            entries = sorted(os.scandir(cmd_dir), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.name.endswith(".py"):
+                continue
+            stat = entry.stat()
+            digest.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def build_manifest(configs) -> dict:
+    """Import every command once and describe it by name and dotted path."""
+    groups = {}
+    for cfg in configs:
+        if cfg.commands_module is None:
+            continue
+        if not hasattr(cfg.commands_module, "__path__"):
+            continue
+
+        app = App(name=cfg.label)
+        entries = []
+        for obj in _iter_commands(cfg):
+            cmd = obj(app)
+            entries.append(
+                {
+                    "name": cmd.command_name,
+                    "alias": cmd.alias,
+                    "help": cmd.help or cmd.handle.__doc__,
+                    "path": f"{obj.__module__}.{obj.__qualname__}",
+                    "requires": int(obj.requires),
+                }
+            )
+
+        groups[cfg.label] = {
+            "alias": getattr(cfg.commands_module, "alias", None),
+            "help": getattr(cfg.commands_module, "help", ""),
+            "commands": entries,
+        }
+
+    return {
+        "version": MANIFEST_VERSION,
+        "fingerprint": fingerprint(configs),
+        "groups": groups,
+    }
+
+
+def load_manifest(configs, path: Path | None = None) -> dict:
+    """
+    Return the cached command manifest stored at ``path`` if it still matches
+    the command packages on disk, otherwise rebuild and save it.
+    """
+    if path is not None:
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = None
+        if (
+            isinstance(manifest, dict)
+            and manifest.get("version") == MANIFEST_VERSION
+            and manifest.get("fingerprint") == fingerprint(configs)
+        ):
+            return manifest
+
+    manifest = build_manifest(configs)
+
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(manifest), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            # Read-only deployments simply rebuild the manifest every time.
+            pass
+
+    return manifest
+
+
+def _register_lazy(app: App, entries):
+    for entry in entries:
+        app.command(
+            f"{LAZY_MODULE}:{entry['path']}",
+            name=entry["name"],
+            alias=entry["alias"],
+            help=entry["help"],
+        )
+
+
+def lazy_autodiscover(
+    cli_app: App, path: Path | None = None, tokens: list[str] | None = None
+):
+    """
+    Like ``autodiscover`` but registers import-path stubs from the cached
+    manifests on ``cli_app``, so only the command that actually runs gets
+    imported. Core commands are registered at the top level and every other
+    module gets its own sub-command group.
+
+    When ``tokens`` invoke a core command requiring ``Bootstrap.NOTHING``,
+    the installed modules' commands are left out, so neither settings nor
+    module configs are loaded.
+    """
+    core = load_manifest([_core_module()], core_manifest_path())
+    entries = core["groups"].get(CORE_LABEL, {"commands": []})["commands"]
+    # Registered directly instead of flattened with name="*": cyclopts
+    # resolves every command of a flattened sub-app while parsing.
+    _register_lazy(cli_app, entries)
+
+    name = next((token for token in tokens or () if not token.startswith("-")), None)
+    if any(
+        name is not None
+        and name in (entry["name"], entry["alias"])
+        and entry["requires"] == Bootstrap.NOTHING
+        for entry in entries
+    ):
+        return cli_app
+
+    if path is None:
+        from fastapi_backend.conf import settings
+
+        path = Path(settings.CACHE_DIR, MANIFEST_FILE_NAME)
+
+    manifest = load_manifest(_installed_modules(), path)
+    for label, group in manifest["groups"].items():
+        app = App(name=label, alias=group["alias"], help=group["help"])
+        _register_lazy(app, group["commands"])
+        cli_app.command(app)
+
+    return cli_app
@@ -0,0 +1,17 @@
+"""
+Resolution target for lazily registered commands.
+
+``lazy_autodiscover`` registers commands as cyclopts import paths of the form
+``fastapi_backend.management.cli.lazy:<dotted.path.to.Command>``; the command
+class is only imported once cyclopts resolves that attribute.
+"""
+
+from cyclopts import App
+from fastapi_backend.utils.loaders import import_string
+
+
+def __getattr__(name: str):
+    if "." not in name:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    command_cls = import_string(name)
+    return command_cls(App()).entrypoint
@@ -1,11 +1,12 @@
 from .createproject import validate_name
-from fastapi_backend.management.cli.command import BaseCommand
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
 from typing import Annotated
 from cyclopts import Parameter
 
 
 class Command(BaseCommand):
     help = "Create module inside project command"
+    requires = Bootstrap.SETTINGS
 
     def handle(
         self,
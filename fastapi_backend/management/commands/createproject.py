@@ -1,5 +1,5 @@
 from pathlib import Path
-from fastapi_backend.management.cli.command import BaseCommand
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
 from cyclopts import Parameter
 from typing import Annotated
 import string
@@ -12,6 +12,7 @@ def validate_name(type_, value: str):
 
 class Command(BaseCommand):
     help = "Create project command"
+    requires = Bootstrap.NOTHING
 
     def handle(
         self,
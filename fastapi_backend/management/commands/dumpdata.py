@@ -0,0 +1,31 @@
+from pathlib import Path
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
+from cyclopts import Parameter
+from typing import Annotated
+import sys
+
+
+class Command(BaseCommand):
+    help = "Write model rows as NDJSON fixtures"
+    requires = Bootstrap.DATABASE
+
+    async def handle(
+        self,
+        *labels: Annotated[
+            str, Parameter(help='Modules ("label") or models ("label.Model")')
+        ],
+        output: Annotated[Path, Parameter(help='File to write, "-" for stdout')] = Path(
+            "-"
+        ),
+        batch_size: Annotated[int, Parameter(help="Rows fetched per query")] = 1000,
+    ):
+        from fastapi_backend.db.fixtures import dump, resolve_models
+        from fastapi_backend.modules import modules
+
+        models = resolve_models(modules, labels)
+        if str(output) == "-":
+            await dump(models, sys.stdout, batch_size)
+            return None
+        with output.open("w", encoding="utf-8") as f:
+            count = await dump(models, f, batch_size)
+        return f"[green]Dumped {count} rows to {output}[/green]"
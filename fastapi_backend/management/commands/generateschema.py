@@ -0,0 +1,42 @@
+from pathlib import Path
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
+from cyclopts import Parameter
+from typing import Annotated
+import sys
+
+
+class Command(BaseCommand):
+    help = "Build the OpenAPI document cache served by the application"
+    requires = Bootstrap.REGISTRY
+
+    def handle(
+        self,
+        application: Annotated[
+            str, Parameter(help="Dotted path of the ASGI app or of a factory")
+        ] = "fastapi_backend.core.get_application",
+        output: Annotated[
+            Path | None, Parameter(help='Also write the document here, "-" for stdout')
+        ] = None,
+    ):
+        from fastapi_backend.conf import settings
+        from fastapi_backend.core.openapi import OPENAPI_DIR_NAME, precompute_openapi
+        from fastapi_backend.core.server import load_application
+        from fastapi_backend.modules import modules
+
+        app = load_application(application)
+        directory = Path(settings.CACHE_DIR, OPENAPI_DIR_NAME)
+        document = precompute_openapi(
+            app, modules, directory, compress=settings.OPENAPI_GZIP, force=True
+        )
+        if document is None:
+            return "[red]The application has no openapi_url[/red]"
+
+        if output is not None and str(output) == "-":
+            sys.stdout.write(document.body.decode("utf-8"))
+            return None
+        if output is not None:
+            output.write_bytes(document.body)
+        return (
+            f"[green]OpenAPI document {document.fingerprint} "
+            f"({len(document.body)} bytes) cached in {directory}[/green]"
+        )
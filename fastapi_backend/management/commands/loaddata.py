@@ -0,0 +1,30 @@
+from pathlib import Path
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
+from cyclopts import Parameter
+from typing import Annotated
+import sys
+
+
+class Command(BaseCommand):
+    help = "Insert NDJSON fixtures written by dumpdata"
+    requires = Bootstrap.DATABASE
+
+    async def handle(
+        self,
+        fixture: Annotated[Path, Parameter(help='File to read, "-" for stdin')],
+        batch_size: Annotated[
+            int, Parameter(help="Rows inserted per transaction")
+        ] = 1000,
+        workers: Annotated[int, Parameter(help="Models inserted concurrently")] = 1,
+    ):
+        from fastapi_backend.db.fixtures import load
+        from fastapi_backend.modules import modules
+
+        if str(fixture) == "-":
+            counts = await load(modules, sys.stdin, batch_size, workers)
+        else:
+            with fixture.open(encoding="utf-8") as f:
+                counts = await load(modules, f, batch_size, workers)
+        return (
+            f"[green]Loaded {sum(counts.values())} rows of {len(counts)} models[/green]"
+        )
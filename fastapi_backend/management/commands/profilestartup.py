@@ -0,0 +1,70 @@
+from pathlib import Path
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
+from cyclopts import Parameter
+from typing import Annotated
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+PROBE = "from fastapi_backend.utils.profiling import main; main()"
+
+
+class Command(BaseCommand):
+    help = "Profile project cold start by phase and module"
+    requires = Bootstrap.NOTHING
+
+    def handle(
+        self,
+        output: Annotated[
+            Path, Parameter(help="Chrome trace-event JSON file to write")
+        ] = Path("startup-profile.json"),
+        limit: Annotated[int, Parameter(help="Rows shown per table")] = 25,
+        database: Annotated[
+            bool, Parameter(help="Open the database and run ready() hooks")
+        ] = True,
+    ):
+        from rich.table import Table
+        from fastapi_backend.utils.profiling import (
+            PROFILE_ENV_VAR,
+            import_costs,
+            parse_importtime,
+            trace_events,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            spans_path = Path(tmp, "spans.json")
+            args = [sys.executable, "-X", "importtime", "-c", PROBE, str(spans_path)]
+            if not database:
+                args.append("--no-database")
+            proc = subprocess.run(
+                args,
+                env={**os.environ, PROFILE_ENV_VAR: "1"},
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                return f"[red]Startup failed:\n{proc.stderr[-2000:]}[/red]"
+            recorded = json.loads(spans_path.read_text(encoding="utf-8"))
+
+        spans = recorded["spans"]
+        costs = import_costs(parse_importtime(proc.stderr), recorded["modules"])
+
+        phases = Table(title="Startup phases")
+        phases.add_column("Phase")
+        phases.add_column("Name")
+        phases.add_column("ms", justify="right")
+        for s in sorted(spans, key=lambda s: -s["duration"])[:limit]:
+            phases.add_row(s["phase"], s["name"] or "", f"{s['duration'] * 1e3:.2f}")
+        self.console.print(phases)
+
+        imports = Table(title="Import cost (self time)")
+        imports.add_column("Module")
+        imports.add_column("ms", justify="right")
+        for name, cost in sorted(costs.items(), key=lambda i: -i[1])[:limit]:
+            imports.add_row(name, f"{cost * 1e3:.2f}")
+        self.console.print(imports)
+
+        output.write_text(json.dumps(trace_events(spans, costs)), encoding="utf-8")
+        return f"[green]Startup profile written: {output.resolve()}[/green]"
@@ -0,0 +1,63 @@
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
+from cyclopts import Parameter
+from typing import Annotated, Literal
+
+
+class Command(BaseCommand):
+    help = "Serve the application with uvicorn worker processes"
+    requires = Bootstrap.NOTHING
+
+    def handle(
+        self,
+        application: Annotated[
+            str, Parameter(help="Dotted path of the ASGI app or of a factory")
+        ] = "fastapi_backend.core.get_application",
+        host: Annotated[str, Parameter(help="Interface to bind")] = "127.0.0.1",
+        port: Annotated[int, Parameter(help="Port to bind")] = 8000,
+        workers: Annotated[int, Parameter(help="Worker processes")] = 1,
+        preload: Annotated[
+            bool,
+            Parameter(help="Build the app once before forking workers"),
+        ] = False,
+        loop: Annotated[
+            Literal["auto", "asyncio", "uvloop"], Parameter(help="Event loop")
+        ] = "auto",
+        http: Annotated[
+            Literal["auto", "h11", "httptools"], Parameter(help="HTTP parser")
+        ] = "auto",
+        max_requests: Annotated[
+            int | None, Parameter(help="Recycle workers after this many requests")
+        ] = None,
+        max_requests_jitter: Annotated[
+            int, Parameter(help="Random extra requests per worker")
+        ] = 0,
+        graceful_timeout: Annotated[
+            float, Parameter(help="Seconds workers get to finish on stop")
+        ] = 30.0,
+        log_level: Annotated[str, Parameter(help="Uvicorn log level")] = "info",
+    ):
+        import importlib.util
+        import logging
+        from fastapi_backend.core.server import Arbiter
+
+        if importlib.util.find_spec("uvicorn") is None:
+            return "[red]runserver needs uvicorn: pip install uvicorn[standard][/red]"
+
+        logging.basicConfig(level=log_level.upper(), format="[%(process)d] %(message)s")
+        arbiter = Arbiter(
+            application,
+            host=host,
+            port=port,
+            workers=workers,
+            preload=preload,
+            loop=loop,
+            http=http,
+            max_requests=max_requests,
+            max_requests_jitter=max_requests_jitter,
+            graceful_timeout=graceful_timeout,
+            log_level=log_level,
+        )
+        status = arbiter.run()
+        if status:
+            return "[red]A worker failed to boot[/red]"
+        return None
@@ -3,7 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Iterable
 
-from mako.template import Template
 from .fs_tempates import (
     MANAGE_PY_TEMPLATE,
     ASGI_PY_TEMPLATE,
@@ -34,6 +33,8 @@ class File:
         *,
         encoding: str = "utf-8",
     ) -> Path:
+        from mako.template import Template
+
         context = {**self.params, **(params or {})}
         if isinstance(self.template, Path):
             template_text = self.template.read_text(encoding=encoding)
@@ -19,6 +19,7 @@ MODELS_PY_NAME = "models"
 MIGRATIONS_PY_NAME = "migrations"
 COMMANDS_PY_NAME = "commands"
 MANAGEMENT_PY_NAME = "management"
+ROUTES_PY_NAME = "routes"
 
 
 def _path_from_py_module(module: ModuleType):
@@ -51,6 +52,18 @@ def _path_from_py_module(module: ModuleType):
 
 
 class ModuleConfig:
+    # Labels of modules whose ready() must finish before this one's starts.
+    depends_on: tuple[str, ...] = ()
+    # Overrides settings.MODULES_READY_TIMEOUT for this module's ready().
+    ready_timeout: float | None = None
+    # Overrides settings.MODULES_WARMUP_TIMEOUT for this module's warmup.
+    warmup_timeout: float | None = None
+    # Dotted paths of database routers consulted before the replica router.
+    database_routers: tuple[str, ...] = ()
+    # Prefix the ``router`` of the routes submodule is included under;
+    # defaults to "/<label>", "" includes it at the root.
+    routes_prefix: str | None = None
+
     def __init__(self, module_name: str, py_module: ModuleType):
 
         self.name: str = module_name
@@ -71,19 +84,53 @@ class ModuleConfig:
         self.models_py_module: ModuleType = None
         self.models: "list[Model]" = None
 
+        # Submodule presence already known from a modules manifest
+        self._known_submodules: dict[str, bool] = {}
+
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__, self.label)
 
+    def has_submodule(self, module_name: str) -> bool:
+        known = self._known_submodules.get(module_name)
+        if known is None:
+            known = module_has_submodule(self.py_module, module_name)
+            self._known_submodules[module_name] = known
+        return known
+
     @cached_property
     def migrations_module(self):
-        if module_has_submodule(self.py_module, MIGRATIONS_PY_NAME):
+        if self.has_submodule(MIGRATIONS_PY_NAME):
             return import_module(f"{self.name}.{MIGRATIONS_PY_NAME}")
         return None
 
+    @cached_property
+    def routes_module(self):
+        if self.has_submodule(ROUTES_PY_NAME):
+            return import_module(f"{self.name}.{ROUTES_PY_NAME}")
+        return None
+
+    @property
+    def router(self):
+        """The ``router`` of the routes submodule, or None without one."""
+        if self.routes_module is None:
+            return None
+        try:
+            return self.routes_module.router
+        except AttributeError:
+            raise RuntimeError(
+                "The routes module '%s' doesn't define a 'router'."
+                % self.routes_module.__name__
+            )
+
+    def get_routes_prefix(self) -> str:
+        if self.routes_prefix is None:
+            return f"/{self.label}"
+        return self.routes_prefix.rstrip("/")
+
     @cached_property
     def commands_module(self):
         cmd_module_name = f"{MANAGEMENT_PY_NAME}.{COMMANDS_PY_NAME}"
-        if module_has_submodule(self.py_module, cmd_module_name):
+        if self.has_submodule(cmd_module_name):
             return import_module(f"{self.name}.{cmd_module_name}")
         return None
 
@@ -161,10 +208,40 @@ class ModuleConfig:
 
         return mod_cfg_cls(module_name, py_module)
 
+    def to_manifest(self) -> dict:
+        """Describe this config so ``from_manifest`` can rebuild it without probing."""
+        cls = self.__class__
+        return {
+            "config": f"{cls.__module__}.{cls.__qualname__}",
+            "name": self.name,
+            "label": self.label,
+            "path": str(self.path),
+            "submodules": {
+                name: self.has_submodule(name)
+                for name in (
+                    MODELS_PY_NAME,
+                    MIGRATIONS_PY_NAME,
+                    ROUTES_PY_NAME,
+                    f"{MANAGEMENT_PY_NAME}.{COMMANDS_PY_NAME}",
+                )
+            },
+        }
+
+    @classmethod
+    def from_manifest(cls, data: dict):
+        mod_cfg_cls = import_string(data["config"])
+        module_config = mod_cfg_cls.__new__(mod_cfg_cls)
+        if not hasattr(mod_cfg_cls, "path"):
+            # Skip resolving the path again in __init__.
+            module_config.path = Path(data["path"])
+        module_config.__init__(data["name"], import_module(data["name"]))
+        module_config._known_submodules.update(data["submodules"])
+        return module_config
+
     def import_models(self):
         self.models = self.reg.all_models[self.label]
 
-        if module_has_submodule(self.py_module, MODELS_PY_NAME):
+        if self.has_submodule(MODELS_PY_NAME):
             models_module_name = f"{self.name}.{MODELS_PY_NAME}"
             self.models_py_module = import_module(models_module_name)
 
@@ -172,3 +249,9 @@ class ModuleConfig:
         """
         Override this
         """
+
+    async def warmup(self):
+        """
+        Override this to prepare lazily built state (schemas, caches, first
+        queries) before the application accepts traffic.
+        """
@@ -0,0 +1,78 @@
+"""
+Cache of resolved ``ModuleConfig.create`` results, so warm starts skip
+probing every installed module for its config class and submodules.
+"""
+
+import json
+import os
+from pathlib import Path
+from .config import MANAGEMENT_PY_NAME, MODULE_PY_NAME, ModuleConfig
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE_NAME = "modules.json"
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _watched_paths(data: dict) -> list[Path]:
+    # The package directory changes when submodules are added or removed,
+    # modules.py holds the config class and management/ holds commands/.
+    path = Path(data["path"])
+    return [path, path / f"{MODULE_PY_NAME}.py", path / MANAGEMENT_PY_NAME]
+
+
+def load_manifest(path: Path, installed_modules) -> list[ModuleConfig] | None:
+    """
+    Rebuild the module configs stored at ``path``, or return None if the
+    manifest is missing, was written for other INSTALLED_MODULES or any
+    watched file changed since.
+    """
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("installed") != list(installed_modules)
+    ):
+        return None
+
+    for data in manifest["modules"]:
+        watched = [_mtime(p) for p in _watched_paths(data)]
+        if watched != data["mtimes"]:
+            return None
+
+    return [ModuleConfig.from_manifest(data) for data in manifest["modules"]]
+
+
+def save_manifest(path: Path, installed_modules, configs: list[ModuleConfig]):
+    """Store ``configs`` resolved from ``installed_modules`` at ``path``."""
+    if not all(isinstance(entry, str) for entry in installed_modules):
+        return
+
+    entries = []
+    for cfg in configs:
+        data = cfg.to_manifest()
+        data["mtimes"] = [_mtime(p) for p in _watched_paths(data)]
+        entries.append(data)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "installed": list(installed_modules),
+        "modules": entries,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        # Read-only deployments simply resolve modules every time.
+        pass
@@ -1,13 +1,29 @@
+import hashlib
 import sys
+import time
+import logging
 from collections import defaultdict
+from types import MappingProxyType
 import warnings
+from pathlib import Path
 from .config import ModuleConfig
-import asyncio
+from .manifest import load_manifest, save_manifest
+from fastapi_backend.utils.profiling import span
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from fastapi_backend.db.models import Model
 
+logger = logging.getLogger(__name__)
+
+
+async def _warm_module(cfg: ModuleConfig):
+    from fastapi_backend.db.warmup import warm_model
+
+    for model in cfg.models.values():
+        warm_model(model)
+    await cfg.warmup()
+
 
 class ModulesRegistry:
     def __init__(self, installed_modules: tuple | None = None):
@@ -18,21 +34,59 @@ class ModulesRegistry:
         self.all_models: dict[str, dict[str, "Model"]] = defaultdict(dict)
         self.module_configs: dict[str, ModuleConfig] = {}
 
+        # Dotted-name trie over module_configs, see get_containing_module_config
+        self._module_trie: dict | None = None
+        # "label.Model" -> model, built by freeze()
+        self._model_index: dict[str, "Model"] | None = None
+
+        self.configs_ready = False
+        self.frozen = False
         self.ready = False
+        self.ready_timings: dict[str, float] = {}
+        self.warmup_timings: dict[str, float] = {}
 
         if installed_modules is not None:
             self.populate(installed_modules)
 
-    def populate(self, installed_modules=None):
+    def populate(self, installed_modules=None, manifest: Path | None = None):
         if self.ready:
             return
 
-        for entry in installed_modules:
-            if isinstance(entry, ModuleConfig):
-                module_config = entry
-            else:
-                module_config = ModuleConfig.create(entry)
+        self.populate_configs(installed_modules, manifest)
+
+        for module_config in self.module_configs.values():
+            with span("modules.import_models", module_config.label):
+                module_config.import_models()
+
+        self.freeze()
+        self.ready = True
 
+    def populate_configs(self, installed_modules=None, manifest: Path | None = None):
+        """
+        Create module configs without importing any models. With a
+        ``manifest`` path, configs are loaded from it when it is still valid
+        and saved to it otherwise.
+        """
+        if self.configs_ready:
+            return
+
+        configs = None
+        if manifest is not None:
+            with span("modules.manifest"):
+                configs = load_manifest(manifest, installed_modules)
+
+        if configs is None:
+            configs = []
+            for entry in installed_modules:
+                if isinstance(entry, ModuleConfig):
+                    configs.append(entry)
+                else:
+                    with span("modules.create", entry):
+                        configs.append(ModuleConfig.create(entry))
+            if manifest is not None:
+                save_manifest(manifest, installed_modules, configs)
+
+        for module_config in configs:
             if module_config.label in self.module_configs:
                 raise RuntimeError(
                     f"Module label arent unique, duplicates: {module_config.label}"
@@ -41,18 +95,156 @@ class ModulesRegistry:
             self.module_configs[module_config.label] = module_config
             module_config.reg = self
 
-        for module_config in self.module_configs.values():
-            module_config.import_models()
+        self._module_trie = self._build_module_trie()
+        self.configs_ready = True
 
-        tasks = []
-        for module_config in self.module_configs.values():
-            tasks.append(module_config.ready())
+    def _build_module_trie(self) -> dict:
+        trie = {}
+        for cfg in self.module_configs.values():
+            node = trie
+            for part in cfg.name.split("."):
+                node = node.setdefault(part, {})
+            node[None] = cfg
+        return trie
 
-        asyncio.gather(*tasks)
+    def freeze(self):
+        """
+        Make module configs and models read-only and index models by
+        "label.Model". No models can be registered afterwards.
+        """
+        if self.frozen:
+            return
 
-        self.ready = True
+        model_index = {}
+        frozen_models = {}
+        for label, models in self.all_models.items():
+            frozen_models[label] = MappingProxyType(dict(models))
+            for model_name, model in models.items():
+                model_index[f"{label}.{model_name}"] = model
+
+        for label, cfg in self.module_configs.items():
+            cfg.models = frozen_models.setdefault(label, MappingProxyType({}))
+
+        self.all_models = MappingProxyType(frozen_models)
+        self.module_configs = MappingProxyType(self.module_configs)
+        self._model_index = MappingProxyType(model_index)
+        self._module_trie = self._build_module_trie()
+        self.frozen = True
+
+    def ready_levels(self) -> list[list[ModuleConfig]]:
+        """
+        Group module configs into levels by ``depends_on``: every module only
+        depends on modules from earlier levels.
+        """
+        pending = {}
+        for label, cfg in self.module_configs.items():
+            for dep in cfg.depends_on:
+                if dep not in self.module_configs:
+                    raise RuntimeError(
+                        f"Module '{label}' depends on '{dep}', "
+                        "which isn't in INSTALLED_MODULES."
+                    )
+            pending[label] = set(cfg.depends_on)
+
+        levels = []
+        while pending:
+            level = [label for label, deps in pending.items() if not deps]
+            if not level:
+                raise RuntimeError(
+                    "Circular module dependencies: %s" % ", ".join(sorted(pending))
+                )
+            for label in level:
+                del pending[label]
+            for deps in pending.values():
+                deps.difference_update(level)
+            levels.append([self.module_configs[label] for label in level])
+        return levels
+
+    async def _run_hook(self, name: str, hook, cfg, timings, timeout):
+        import asyncio
+
+        start = time.perf_counter()
+        try:
+            with span(f"modules.{name}", cfg.label):
+                # e.g. ModuleConfig.ready_timeout overrides ``timeout``
+                own_timeout = getattr(cfg, f"{name}_timeout", None)
+                await asyncio.wait_for(hook(cfg), own_timeout or timeout)
+        finally:
+            timings[cfg.label] = time.perf_counter() - start
+
+    async def _run_hooks(self, name: str, hook, timings, timeout, slow_threshold):
+        import asyncio
+
+        for level in self.ready_levels():
+            results = await asyncio.gather(
+                *(self._run_hook(name, hook, cfg, timings, timeout) for cfg in level),
+                return_exceptions=True,
+            )
+
+            failed = []
+            for cfg, result in zip(level, results):
+                elapsed = timings[cfg.label]
+                if isinstance(result, TimeoutError):
+                    logger.error(
+                        "%s.%s() timed out after %.3fs", cfg.label, name, elapsed
+                    )
+                    failed.append(cfg.label)
+                elif isinstance(result, BaseException):
+                    logger.error(
+                        "%s.%s() failed after %.3fs",
+                        cfg.label,
+                        name,
+                        elapsed,
+                        exc_info=result,
+                    )
+                    failed.append(cfg.label)
+                elif slow_threshold is not None and elapsed > slow_threshold:
+                    logger.warning("%s.%s() is slow: %.3fs", cfg.label, name, elapsed)
+                else:
+                    logger.debug("%s.%s() took %.3fs", cfg.label, name, elapsed)
+
+            if failed:
+                raise RuntimeError(
+                    "%s() failed for modules: %s" % (name, ", ".join(failed))
+                )
+
+        return timings
+
+    async def run_ready_hooks(
+        self, timeout: float | None = None, slow_threshold: float | None = None
+    ):
+        """
+        Await every ``ModuleConfig.ready()`` hook. Hooks of one dependency
+        level run concurrently; a level starts once the previous one finished.
+        Slow hooks are logged, failed or timed out hooks abort startup.
+        """
+        return await self._run_hooks(
+            "ready",
+            lambda cfg: cfg.ready(),
+            self.ready_timings,
+            timeout,
+            slow_threshold,
+        )
+
+    async def run_warmup(
+        self, timeout: float | None = None, slow_threshold: float | None = None
+    ):
+        """
+        Build the per-model state otherwise created by the first queries
+        (see ``fastapi_backend.db.warmup``) for the models of every module,
+        then await its ``ModuleConfig.warmup()`` hook, in ``depends_on``
+        order like ``run_ready_hooks``. Timings include both.
+        """
+        return await self._run_hooks(
+            "warmup", _warm_module, self.warmup_timings, timeout, slow_threshold
+        )
 
     def register_model(self, module_label: str, model):
+        if self.frozen:
+            raise RuntimeError(
+                "Cannot register model '%s.%s', the modules registry is frozen."
+                % (module_label, model.__name__)
+            )
         model_name = model.__name__
         module_models = self.all_models[module_label]
 
@@ -77,14 +269,21 @@ class ModulesRegistry:
         module_models[model_name] = model
 
     def get_containing_module_config(self, obj_name: str) -> ModuleConfig:
-        candidates = []
-        for module_config in self.module_configs.values():
-            if obj_name.startswith(module_config.name):
-                subpath = obj_name.removeprefix(module_config.name)
-                if subpath == "" or subpath[0] == ".":
-                    candidates.append(module_config)
-        if candidates:
-            return sorted(candidates, key=lambda ac: -len(ac.name))[0]
+        """
+        Return the config of the innermost module containing the dotted
+        ``obj_name``, walking the trie once per name part.
+        """
+        if self._module_trie is None:
+            self._module_trie = self._build_module_trie()
+
+        found = None
+        node = self._module_trie
+        for part in obj_name.split("."):
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
 
     def get_module_config(self, module_label: str):
         cfg = self.module_configs.get(module_label, None)
@@ -95,17 +294,51 @@ class ModulesRegistry:
     def get_module_models(self, module_label: str):
         return self.get_module_config(module_label).models
 
-    def get_model(self, module_label: str, model_name: str):
-        model = self.all_models.get(module_label, {}).get(model_name, None)
+    def get_model(self, module_label: str, model_name: str | None = None):
+        """
+        Return a model by module label and name, or by a single
+        "label.Model" reference as used for relation targets.
+        """
+        if model_name is None:
+            module_label, _, model_name = module_label.rpartition(".")
+
+        if self._model_index is not None:
+            model = self._model_index.get(f"{module_label}.{model_name}")
+        else:
+            model = self.all_models.get(module_label, {}).get(model_name, None)
         if model is None:
             raise ValueError(f"Model {model_name} not found in module {module_label}")
         return model
 
+    def fingerprint(self, *extra: str) -> str:
+        """
+        Hash of the installed module configs and the fields of every model,
+        plus ``extra`` strings, identifying caches derived from the registry.
+        """
+        digest = hashlib.sha256()
+        for label, cfg in sorted(self.module_configs.items()):
+            cls = type(cfg)
+            digest.update(
+                f"{label}:{cfg.name}:{cls.__module__}.{cls.__qualname__}\n".encode()
+            )
+            for model_name, model in sorted(self.all_models.get(label, {}).items()):
+                digest.update(f"{model_name}:{model._meta.db_table}\n".encode())
+                for name, field in model._meta.fields_map.items():
+                    digest.update(
+                        f"{name}:{type(field).__name__}:{field.null}:{field.pk}:"
+                        f"{field.description}\n".encode()
+                    )
+        for part in extra:
+            digest.update(f"{part}\n".encode())
+        return digest.hexdigest()[:16]
+
     def to_tortoise_modules(self):
         apps = {}
         for cfg in self.module_configs.values():
+            if cfg.models_py_module is None:
+                continue
             apps[cfg.label] = {
-                "models": str(cfg.models_py_module.__name__),
+                "models": [str(cfg.models_py_module.__name__)],
             }
             if cfg.migrations_module is not None:
                 apps[cfg.label]["migrations"] = str(cfg.migrations_module.__name__)
@@ -0,0 +1,69 @@
+import base64
+import datetime
+import decimal
+import re
+import uuid
+from enum import Enum
+
+
+def duration_iso(value: datetime.timedelta) -> str:
+    """ISO 8601 duration of ``value`` in days, hours, minutes and seconds."""
+    sign = "-" if value < datetime.timedelta(0) else ""
+    value = abs(value)
+    minutes, seconds = divmod(value.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if value.microseconds:
+        seconds = f"{seconds}.{value.microseconds:06d}".rstrip("0")
+    time = "".join(
+        f"{amount}{unit}"
+        for amount, unit in ((hours, "H"), (minutes, "M"), (seconds, "S"))
+        if amount
+    )
+    days = f"{value.days}D" if value.days else ""
+    if not days and not time:
+        return "PT0S"
+    return f"{sign}P{days}" + (f"T{time}" if time else "")
+
+
+_DURATION = re.compile(
+    r"(-)?P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?"
+)
+
+
+def parse_duration(text: str) -> datetime.timedelta:
+    """Inverse of ``duration_iso``."""
+    match = _DURATION.fullmatch(text)
+    if match is None or text.endswith(("P", "T")):
+        raise ValueError(f"Invalid ISO 8601 duration {text!r}")
+    sign, days, hours, minutes, seconds = match.groups()
+    value = datetime.timedelta(
+        days=int(days or 0),
+        hours=int(hours or 0),
+        minutes=int(minutes or 0),
+        seconds=float(seconds or 0),
+    )
+    return -value if sign else value
+
+
+def base64_text(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+def json_default(value):
+    """
+    ``default`` hook for ``json`` encoding dates, durations (ISO 8601),
+    decimals, UUIDs, enums, bytes (base64) and models.
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return duration_iso(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64_text(value)
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "_meta"):
+        return {name: getattr(value, name) for name in value._meta.fields_db_projection}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
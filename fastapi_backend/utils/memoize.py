@@ -0,0 +1,172 @@
+"""
+Memoization of async functions with single-flight loading.
+
+    @memoize(ttl=60, maxsize=1024, stale_ttl=300)
+    async def exchange_rate(currency: str) -> Decimal: ...
+
+Results are kept per arguments for ``ttl`` seconds in an LRU of ``maxsize``
+entries. Concurrent calls with arguments that aren't cached await one shared
+call of the function instead of each running it, so an expiring hot key
+costs one load rather than one per waiting coroutine. With ``stale_ttl`` an
+expired result is still returned for that many seconds while a single
+background call refreshes it. Failed loads aren't cached; their exception
+is raised in every caller waiting for them.
+
+Hit, miss and eviction counters of every memoized function are published by
+the metrics endpoint (``memoize_*_total``).
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+_memoized: "weakref.WeakSet[Memoized]" = weakref.WeakSet()
+
+
+def _default_key(args: tuple, kwargs: dict) -> Hashable:
+    if kwargs:
+        return args + tuple(sorted(kwargs.items()))
+    return args
+
+
+class Memoized:
+    """An async function wrapped by ``memoize``."""
+
+    COUNTERS = ("hits", "stale_hits", "misses", "evictions")
+
+    def __init__(
+        self,
+        func,
+        ttl: float | None,
+        maxsize: int | None,
+        stale_ttl: float | None,
+        key: Callable[[tuple, dict], Hashable],
+    ):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.key = key
+        # key -> (value, expiry on the monotonic clock or None)
+        self._entries: OrderedDict[Hashable, tuple[object, float | None]] = (
+            OrderedDict()
+        )
+        self._loading: dict[Hashable, asyncio.Task] = {}
+        self.hits = self.stale_hits = self.misses = self.evictions = 0
+
+    def __repr__(self):
+        return "<Memoized %s.%s>" % (self.func.__module__, self.func.__qualname__)
+
+    def __get__(self, instance, owner):
+        # memoized methods get the instance as their first argument
+        if instance is None:
+            return self
+        return functools.partial(self, instance)
+
+    async def __call__(self, *args, **kwargs):
+        key = self.key(args, kwargs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            now = time.monotonic()
+            if expires is None or now < expires:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if self.stale_ttl is not None and now < expires + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._loading:
+                    self._load(key, args, kwargs).add_done_callback(
+                        self._log_refresh_error
+                    )
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        task = self._loading.get(key)
+        if task is None:
+            task = self._load(key, args, kwargs)
+        # one caller being cancelled mustn't cancel the load the others await
+        return await asyncio.shield(task)
+
+    def _load(self, key, args, kwargs) -> asyncio.Task:
+        task = asyncio.ensure_future(self._fill(key, args, kwargs))
+        self._loading[key] = task
+        task.add_done_callback(functools.partial(self._loaded, key))
+        return task
+
+    def _loaded(self, key, task: asyncio.Task):
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        if not task.cancelled():
+            # raised in the callers; don't warn if they were all cancelled
+            task.exception()
+
+    def _log_refresh_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "Refreshing %r failed, serving the stale result",
+                self,
+                exc_info=task.exception(),
+            )
+
+    async def _fill(self, key, args, kwargs):
+        value = await self.func(*args, **kwargs)
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, *args, **kwargs):
+        """Forget the result cached for these arguments."""
+        self._entries.pop(self.key(args, kwargs), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        stats = {name: getattr(self, name) for name in self.COUNTERS}
+        stats["size"] = len(self._entries)
+        return stats
+
+
+def memoize(
+    ttl: float | None = 60.0,
+    *,
+    maxsize: int | None = 1024,
+    stale_ttl: float | None = None,
+    key: Callable[[tuple, dict], Hashable] = _default_key,
+):
+    """
+    Cache the results of the decorated async function per arguments (which
+    must be hashable, or mapped to a hashable by ``key(args, kwargs)``).
+    """
+
+    def decorator(func) -> Memoized:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError("memoize() needs an async function, got %r" % func)
+        memoized = Memoized(func, ttl, maxsize, stale_ttl, key)
+        _memoized.add(memoized)
+        return memoized
+
+    return decorator
+
+
+def get_memoize_metrics() -> dict[str, dict[str, int]]:
+    """Counters of every memoized function by its dotted name."""
+    return {
+        f"{m.func.__module__}.{m.func.__qualname__}": m.stats() for m in list(_memoized)
+    }
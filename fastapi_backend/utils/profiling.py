@@ -0,0 +1,140 @@
+"""
+Startup phase spans, recorded only when ``FASTAPI_BACKEND_PROFILE_STARTUP`` is
+set (as the ``profilestartup`` command does for the process it profiles).
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+PROFILE_ENV_VAR = "FASTAPI_BACKEND_PROFILE_STARTUP"
+
+enabled = bool(os.getenv(PROFILE_ENV_VAR))
+spans: list[dict] = []
+
+
+def span(phase: str, name: str | None = None):
+    """Time the enclosed block as ``phase`` (e.g. "modules.create") of ``name``."""
+    if not enabled:
+        return nullcontext()
+    return _record(phase, name)
+
+
+@contextmanager
+def _record(phase: str, name: str | None):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append(
+            {
+                "phase": phase,
+                "name": name,
+                "start": start,
+                "duration": time.perf_counter() - start,
+            }
+        )
+
+
+def main():
+    """
+    Run a full cold start and write the recorded spans as JSON to the path
+    given as the first argument. Executed in a fresh interpreter by the
+    ``profilestartup`` command, usually with ``-X importtime``.
+    """
+    import asyncio
+
+    output = sys.argv[1]
+    open_database = "--no-database" not in sys.argv
+
+    with span("startup"):
+        with span("import", "fastapi_backend.conf"):
+            import fastapi_backend.conf  # noqa: F401
+
+        with span("setup"):
+            from fastapi_backend import setup
+
+            setup()
+
+        with span("create_app"):
+            from fastapi_backend.core.asgi import create_app
+
+            app = create_app()
+
+        if open_database:
+            from tortoise import Tortoise
+
+            init = Tortoise.init
+
+            async def timed_init(*args, **kwargs):
+                with span("tortoise.init"):
+                    return await init(*args, **kwargs)
+
+            Tortoise.init = timed_init
+
+            async def lifespan():
+                with span("lifespan"):
+                    async with app.router.lifespan_context(app):
+                        pass
+
+            asyncio.run(lifespan())
+
+    from fastapi_backend.modules import modules
+
+    installed = [cfg.name for cfg in modules.module_configs.values()]
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"spans": spans, "modules": installed}, f)
+
+
+def parse_importtime(text: str) -> list[tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self us, cumulative us)."""
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            imports.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            # header line ("self [us] | cumulative | imported package")
+            continue
+    return imports
+
+
+def import_costs(imports, installed_modules) -> dict[str, float]:
+    """
+    Sum import self time in seconds per installed module, attributing every
+    other import to its top-level package.
+    """
+    owners = sorted(installed_modules, key=len, reverse=True)
+    costs = {}
+    for name, self_us, _ in imports:
+        owner = next(
+            (m for m in owners if name == m or name.startswith(m + ".")),
+            name.partition(".")[0],
+        )
+        costs[owner] = costs.get(owner, 0.0) + self_us / 1e6
+    return costs
+
+
+def trace_events(recorded_spans, costs) -> dict:
+    """
+    Build a Chrome trace-event document (loadable in Perfetto, speedscope or
+    chrome://tracing) from recorded spans, with import costs attached.
+    """
+    origin = min((s["start"] for s in recorded_spans), default=0.0)
+    events = [
+        {
+            "name": f"{s['phase']} {s['name']}" if s["name"] else s["phase"],
+            "cat": s["phase"],
+            "ph": "X",
+            "ts": (s["start"] - origin) * 1e6,
+            "dur": s["duration"] * 1e6,
+            "pid": 0,
+            "tid": 0,
+        }
+        for s in recorded_spans
+    ]
+    return {"traceEvents": events, "imports": costs}
@@ -1,5 +1,5 @@
 import re
-import inflect
+from functools import cache
 
 
 def camel_to_snake(name: str) -> str:
@@ -16,11 +16,21 @@ def snake_to_camel(name: str, pascal: bool = False) -> str:
     return parts[0] + "".join(word.capitalize() for word in parts[1:])
 
 
-p_engine = inflect.engine()
+@cache
+def _inflect_engine():
+    import inflect
+
+    return inflect.engine()
+
+
+def __getattr__(name: str):
+    if name == "p_engine":
+        return _inflect_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def plural(name: str):
-    return p_engine.plural(name)
+    return _inflect_engine().plural(name)
 
 
 def normalize_modelname(modelname: str):
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Keep the manifests and caches written while testing out of the source tree
+# and the user's cache; settings read CACHE_DIR from the environment.
+_cache_dir = tempfile.mkdtemp(prefix="fastapi_backend-tests-")
+os.environ["CACHE_DIR"] = _cache_dir
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_cache_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def tortoise_db(tmp_path):
+    """
+    Run a coroutine against a fresh SQLite database of the models of
+    ``apps`` ({label: [module names]}) and return its result:
+
+        tortoise_db({"shop": [__name__]}, main)
+
+    Schemas are generated unless ``generate_schemas`` is false; ``name`` is
+    the database file under ``tmp_path``.
+    """
+    from tortoise import Tortoise
+
+    def run(apps, coro_factory, name="db.sqlite", generate_schemas=True):
+        config = {
+            "connections": {
+                "default": {
+                    "engine": "fastapi_backend.db.backends.sqlite",
+                    "credentials": {"file_path": str(tmp_path / name)},
+                }
+            },
+            "apps": {label: {"models": models} for label, models in apps.items()},
+        }
+
+        async def main():
+            await Tortoise.init(config=config)
+            try:
+                if generate_schemas:
+                    await Tortoise.generate_schemas()
+                return await coro_factory()
+            finally:
+                await Tortoise.close_connections()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,160 @@
+from fastapi import FastAPI
+
+from fastapi_backend.core.metrics import (
+    Histogram,
+    RequestMetrics,
+    RequestMetricsMiddleware,
+    metrics_endpoint,
+)
+from fastapi_backend.db import fields
+from fastapi_backend.db.instrumentation import track_queries
+from fastapi_backend.db.models import Model
+
+
+class Gauge(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=16)
+
+    class Meta:
+        app = "metricstest"
+
+
+APPS = {"metricstest": [__name__]}
+
+
+async def _get(app, path, method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+    headers = dict(messages[0]["headers"])
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], headers, body.decode()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram([0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert list(histogram.samples()) == [(0.1, 2), (1.0, 3), ("+Inf", 4)]
+    assert histogram.sum == 3.65
+
+
+def test_track_queries_nests(tortoise_db):
+    async def main():
+        with track_queries() as outer:
+            await Gauge.create(name="a")
+            with track_queries() as inner:
+                await Gauge.all()
+                await Gauge.filter(name="a").count()
+        return outer, inner
+
+    outer, inner = tortoise_db(APPS, main)
+    assert (inner.queries, inner.rows) == (2, 2)
+    assert (outer.queries, outer.rows) == (3, 2)
+    assert outer.seconds_total >= inner.seconds_total > 0
+
+
+def test_middleware_reports_server_timing_and_metrics(tortoise_db):
+    metrics = RequestMetrics([0.1, 1.0])
+    api = FastAPI()
+
+    @api.get("/gauges/{name}")
+    async def gauges(name: str):
+        await Gauge.create(name=name)
+        return await Gauge.filter(name=name).values("name")
+
+    api.add_route("/metrics", metrics_endpoint(metrics))
+    app = RequestMetricsMiddleware(api, metrics)
+
+    async def main():
+        first = await _get(app, "/gauges/a")
+        await _get(app, "/gauges/b")
+        await _get(app, "/missing")
+        await _get(app, "/missing", method="BREW")
+        return first, await _get(app, "/metrics")
+
+    (status, headers, _), (_, _, text) = tortoise_db(APPS, main)
+    assert status == 200
+    assert b'desc="2 queries, 1 rows"' in headers[b"server-timing"]
+
+    route = 'method="GET",route="/gauges/{name}"'
+    assert f"http_request_duration_seconds_count{{{route}}} 2" in text
+    assert f'http_request_db_queries_bucket{{{route},le="2"}} 2' in text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="<unmatched>"} 1'
+        in text
+    )
+    assert (
+        'http_request_duration_seconds_count{method="other",route="<unmatched>"} 1'
+        in text
+    )
+    assert "BREW" not in text
+    assert 'db_pool_acquired{connection="default"}' in text
+
+
+def test_routes_are_labelled_with_their_full_template(tortoise_db):
+    from fastapi import APIRouter
+
+    metrics = RequestMetrics([0.1])
+    api = FastAPI()
+    for prefix in ("/catalog", "/orders"):
+        router = APIRouter()
+
+        @router.get("/products")
+        async def products():
+            return []
+
+        api.include_router(router, prefix=prefix)
+    api.add_route("/metrics", metrics_endpoint(metrics))
+    app = RequestMetricsMiddleware(api, metrics)
+
+    async def main():
+        for path in ("/catalog/products", "/orders/products", "/missing"):
+            await _get(app, path)
+        await _get(app, "/metrics")
+        return await _get(app, "/metrics")
+
+    _, _, text = tortoise_db(APPS, main, generate_schemas=False)
+    for route, count in [
+        ("/catalog/products", 1),
+        ("/orders/products", 1),
+        ("/metrics", 1),
+        ("<unmatched>", 1),
+    ]:
+        assert (
+            f'http_request_duration_seconds_count{{method="GET",route="{route}"}} '
+            f"{count}" in text
+        )
+    assert 'route="/products"' not in text
+
+
+def test_metrics_endpoint_is_opt_in(monkeypatch):
+    from fastapi_backend.conf import settings
+    from fastapi_backend.core.asgi import create_app
+
+    def paths():
+        return {getattr(route, "path", None) for route in create_app().router.routes}
+
+    assert "/metrics" not in paths()
+    monkeypatch.setattr(settings, "METRICS_PATH", "/metrics")
+    assert "/metrics" in paths()
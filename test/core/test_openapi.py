@@ -0,0 +1,169 @@
+import asyncio
+import gzip
+import json
+
+from fastapi import APIRouter, FastAPI
+
+from fastapi_backend.core.openapi import app_fingerprint, precompute_openapi
+from fastapi_backend.modules.registry import ModulesRegistry
+
+
+async def _get(app, path, headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+    response_headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], response_headers, body
+
+
+def _app(extra_route=False):
+    app = FastAPI(title="Shop")
+    router = APIRouter()
+
+    @router.get("/orders/{order_id}")
+    async def order(order_id: int):
+        return order_id
+
+    if extra_route:
+
+        @router.delete("/orders/{order_id}")
+        async def delete_order(order_id: int):
+            return None
+
+    app.include_router(router, prefix="/shop")
+    return app
+
+
+def test_fingerprint_follows_routes(tmp_path):
+    registry = ModulesRegistry(())
+    app = _app()
+    fingerprint = app_fingerprint(app, registry)
+    precompute_openapi(app, registry, tmp_path)
+    assert app_fingerprint(app, registry) == fingerprint
+    assert app_fingerprint(_app(), registry) == app_fingerprint(_app(), registry)
+    assert app_fingerprint(_app(), registry) != app_fingerprint(
+        _app(extra_route=True), registry
+    )
+
+
+def test_document_is_served_from_cache(tmp_path, monkeypatch):
+    registry = ModulesRegistry(())
+    built = precompute_openapi(_app(), registry, tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"{built.fingerprint}.json",
+        f"{built.fingerprint}.json.gz",
+    ]
+
+    def fail(self):
+        raise AssertionError("should be loaded from the cache")
+
+    monkeypatch.setattr(FastAPI, "openapi", fail)
+    app = _app()
+    document = precompute_openapi(app, registry, tmp_path)
+    assert document.body == built.body
+    assert "/shop/orders/{order_id}" in app.openapi()["paths"]
+
+    async def main():
+        status, headers, body = await _get(app, "/openapi.json")
+        assert status == 200
+        assert json.loads(body)["info"]["title"] == "Shop"
+
+        status, headers, body = await _get(
+            app, "/openapi.json", [("accept-encoding", "gzip, br")]
+        )
+        assert headers["content-encoding"] == "gzip"
+        assert gzip.decompress(body) == document.body
+
+        status, _, body = await _get(
+            app, "/openapi.json", [("if-none-match", headers["etag"])]
+        )
+        assert (status, body) == (304, b"")
+
+    asyncio.run(main())
+
+
+def test_stale_documents_are_replaced(tmp_path):
+    registry = ModulesRegistry(())
+    precompute_openapi(_app(), registry, tmp_path, compress=False)
+    document = precompute_openapi(_app(extra_route=True), registry, tmp_path)
+    assert {p.name for p in tmp_path.iterdir()} == {
+        f"{document.fingerprint}.json",
+        f"{document.fingerprint}.json.gz",
+    }
+
+
+def test_apps_without_openapi_are_skipped(tmp_path):
+    app = FastAPI(openapi_url=None)
+    assert precompute_openapi(app, ModulesRegistry(()), tmp_path) is None
+
+
+def test_generateschema_document_is_used_at_startup(tmp_path, monkeypatch):
+    from cyclopts import App
+    from fastapi_backend.conf import settings
+    from fastapi_backend.core.asgi import create_app
+    from fastapi_backend.management.commands.generateschema import Command
+
+    monkeypatch.setattr(settings, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(settings, "OPENAPI_PRECOMPUTE", True)
+    cli = App(result_action="return_value")
+    Command(cli)
+    cli(["generateschema", "--application", "fastapi_backend.core.asgi.create_app"])
+    cached = sorted(p.name for p in (tmp_path / "openapi").iterdir())
+    assert len(cached) == 2
+
+    def fail(self):
+        raise AssertionError("should be loaded from the cache")
+
+    monkeypatch.setattr(FastAPI, "openapi", fail)
+    asyncio.run(_start(create_app()))
+    assert sorted(p.name for p in (tmp_path / "openapi").iterdir()) == cached
+
+
+async def _start(app):
+    from fastapi_backend.core.asgi import lifespan
+
+    async with lifespan(app):
+        pass
+
+
+def test_routes_added_after_create_app_are_documented(tmp_path, monkeypatch):
+    from fastapi_backend.conf import settings
+    from fastapi_backend.core.asgi import create_app
+
+    monkeypatch.setattr(settings, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(settings, "OPENAPI_PRECOMPUTE", True)
+    app = create_app()
+
+    @app.get("/late")
+    async def late():
+        return None
+
+    async def main():
+        await _start(app)
+        return await _get(app, "/openapi.json")
+
+    status, headers, body = asyncio.run(main())
+    assert status == 200
+    assert "etag" in headers
+    assert "/late" in json.loads(body)["paths"]
@@ -0,0 +1,165 @@
+import asyncio
+import itertools
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from fastapi_backend.core.pagination import CountCache, CursorPagination
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+
+
+class Entry(Model):
+    id = fields.IntField(primary_key=True)
+    score = fields.IntField()
+
+    class Meta:
+        app = "paginationtest"
+
+
+def run(tortoise_db, coro_factory):
+    async def main():
+        scores = [3, 1, 3, 2, 3, 1, 2]
+        await Entry.bulk_create([Entry(id=i, score=s) for i, s in enumerate(scores, 1)])
+        return await coro_factory()
+
+    return tortoise_db({"paginationtest": [__name__]}, main)
+
+
+def test_pages_follow_ordering_with_pk_tie_breaker(tortoise_db):
+    paginate = CursorPagination(ordering=("-score",), count="exact")
+
+    async def walk():
+        pages, cursor = [], None
+        while True:
+            page = await paginate(cursor=cursor, limit=3).paginate(
+                Entry.all(), values=("id",)
+            )
+            pages.append(page)
+            if page.next_cursor is None:
+                return pages
+            cursor = page.next_cursor
+
+    pages = run(tortoise_db, walk)
+
+    assert [[row["id"] for row in page.items] for page in pages] == [
+        [5, 3, 1],
+        [7, 4, 6],
+        [2],
+    ]
+    assert {page.count for page in pages} == {7}
+
+
+def test_filtered_model_pages(tortoise_db):
+    paginate = CursorPagination(default_limit=2)
+
+    async def pages():
+        first = await paginate(cursor=None, limit=None).paginate(
+            Entry.filter(score__gte=2)
+        )
+        second = await paginate(cursor=first.next_cursor, limit=None).paginate(
+            Entry.filter(score__gte=2)
+        )
+        return first, second
+
+    first, second = run(tortoise_db, pages)
+
+    assert [entry.id for entry in first.items] == [1, 3]
+    assert [entry.id for entry in second.items] == [4, 5]
+    assert first.count is None
+
+
+def test_invalid_cursor_is_a_bad_request(tortoise_db):
+    paginate = CursorPagination()
+
+    async def page():
+        with pytest.raises(HTTPException) as e:
+            await paginate(cursor="bm90LWpzb24", limit=None).paginate(Entry.all())
+        return e.value.status_code
+
+    assert run(tortoise_db, page) == 400
+
+
+def test_count_cache_serves_stale_while_refreshing():
+    counts = itertools.count(1)
+
+    async def count():
+        return next(counts)
+
+    async def main():
+        cache = CountCache(ttl=0)
+        first = await cache.get("q", count)
+        stale = await cache.get("q", count)
+        await asyncio.sleep(0)
+        fresh = await cache.get("q", count)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(main())
+
+    assert (first, stale) == (1, 1)
+    assert fresh == 2
+
+
+def test_count_cache_is_bounded():
+    async def count():
+        return 0
+
+    async def main():
+        cache = CountCache(maxsize=2)
+        for key in "abac":
+            await cache.get(key, count)
+        return list(cache._counts)
+
+    assert asyncio.run(main()) == ["a", "c"]
+
+
+def test_endpoints_serialize_model_pages(tortoise_db):
+    from fastapi import Depends, FastAPI
+    from pydantic import BaseModel
+
+    from fastapi_backend.core.pagination import CursorPage, Page
+
+    class EntrySchema(BaseModel):
+        id: int
+
+    paginate = CursorPagination(ordering=("-score",), default_limit=2)
+    app = FastAPI()
+
+    @app.get("/entries")
+    async def entries(page: CursorPage = Depends(paginate)) -> Page:
+        return await page.paginate(Entry.all())
+
+    @app.get("/ids")
+    async def entry_ids(page: CursorPage = Depends(paginate)) -> Page[EntrySchema]:
+        return await page.paginate(Entry.all())
+
+    async def get(path):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+        }
+        await app(scope, receive, send)
+        return messages[0]["status"], json.loads(messages[1]["body"])
+
+    async def pages():
+        return await get("/entries"), await get("/ids")
+
+    (status, body), (_, ids) = run(tortoise_db, pages)
+
+    assert status == 200
+    assert body["items"] == [{"id": 5, "score": 3}, {"id": 3, "score": 3}]
+    assert body["next_cursor"] is not None
+    assert ids["items"] == [{"id": 5}, {"id": 3}]
@@ -0,0 +1,320 @@
+import asyncio
+import stat
+
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from fastapi_backend.core.cache import (
+    ResponseCacheMiddleware,
+    cache_response,
+    get_cache,
+    invalidate_tags,
+    model_tag,
+)
+from fastapi_backend.core.cache import caches
+from fastapi_backend.core.cache.backends import MISSING, FileBasedCache, LocMemCache
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+
+
+class Product(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+
+    class Meta:
+        app = "responsecachetest"
+        table = "responsecache_product"
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(caches, "_caches", {})
+    monkeypatch.setattr(caches, "_tagged_aliases", set())
+
+
+async def _get(app, path, headers=(), method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+    response_headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], response_headers, body
+
+
+def _app(calls):
+    app = FastAPI()
+
+    @app.get("/products/{product_id}")
+    @cache_response(60, tags=[Product, "catalogue"], vary=["accept-language"])
+    async def product(product_id: int):
+        calls.append(product_id)
+        return {"id": product_id, "calls": len(calls)}
+
+    @app.get("/uncached")
+    async def uncached():
+        calls.append(None)
+        return len(calls)
+
+    app.add_middleware(ResponseCacheMiddleware)
+    return app
+
+
+def test_responses_are_stored_after_learning_the_endpoint():
+    calls = []
+    app = _app(calls)
+
+    async def main():
+        first = await _get(app, "/products/1")
+        second = await _get(app, "/products/1")
+        third = await _get(app, "/products/1")
+        assert len(calls) == 2
+        assert third[2] == second[2] != first[2]
+        assert "etag" in third[1] and third[1]["vary"] == "accept-language"
+
+        status, _, body = await _get(
+            app, "/products/1", [("if-none-match", third[1]["etag"])]
+        )
+        assert (status, body) == (304, b"")
+        status, _, body = await _get(app, "/products/1", method="HEAD")
+        assert (status, body) == (200, b"")
+
+        await _get(app, "/products/1", [("accept-language", "de")])
+        assert len(calls) == 3
+
+        await _get(app, "/uncached")
+        await _get(app, "/uncached")
+        assert calls[-2:] == [None, None]
+
+    asyncio.run(main())
+
+
+def test_tags_invalidate_stored_responses():
+    calls = []
+    app = _app(calls)
+
+    async def main():
+        for _ in range(3):
+            await _get(app, "/products/2")
+        assert len(calls) == 2
+
+        await invalidate_tags(model_tag(Product))
+        await _get(app, "/products/2")
+        await _get(app, "/products/2")
+        assert len(calls) == 3
+
+    asyncio.run(main())
+
+
+def test_credentials_and_response_vary_are_respected():
+    from fastapi import Response
+
+    calls = []
+    app = FastAPI()
+
+    @app.get("/tenant")
+    @cache_response(60)
+    async def tenant(response: Response):
+        calls.append("tenant")
+        response.headers["vary"] = "x-tenant"
+        return len(calls)
+
+    @app.get("/me")
+    @cache_response(60, vary=["authorization"])
+    async def me():
+        calls.append("me")
+        return len(calls)
+
+    @app.get("/session")
+    @cache_response(60)
+    async def session(response: Response):
+        calls.append("session")
+        response.headers["vary"] = "cookie"
+        return len(calls)
+
+    app.add_middleware(ResponseCacheMiddleware)
+
+    async def body(path, *headers):
+        return (await _get(app, path, headers))[2]
+
+    async def main():
+        a = ("x-tenant", "a")
+        b = ("x-tenant", "b")
+        await body("/tenant", a)
+        first_a = await body("/tenant", a)
+        assert await body("/tenant", a) == first_a
+        assert await body("/tenant", b) != first_a
+
+        # hits would skip the endpoint's authentication
+        token = ("authorization", "Bearer one")
+        for _ in range(3):
+            await body("/tenant", a, token)
+        assert calls.count("tenant") == 6
+
+        await body("/me", token)
+        mine = await body("/me", token)
+        assert await body("/me", token) == mine
+        assert await body("/me", ("authorization", "Bearer two")) != mine
+
+        for _ in range(3):
+            await body("/session")
+        assert calls.count("session") == 3
+
+    asyncio.run(main())
+
+
+def test_endpoints_with_dependencies_are_refused():
+    from fastapi import APIRouter, Depends, Header
+
+    def api_key(x_api_key: str = Header()):
+        if x_api_key != "secret":
+            raise HTTPException(403)
+
+    with pytest.raises(RuntimeError, match="skip_dependencies"):
+
+        @cache_response(60)
+        async def report(key=Depends(api_key)):
+            return "private"
+
+    calls = []
+    app = FastAPI()
+    router = APIRouter(dependencies=[Depends(api_key)])
+
+    @router.get("/report")
+    @cache_response(60)
+    async def guarded_report():
+        calls.append("report")
+        return "private"
+
+    @app.get("/catalogue")
+    @cache_response(60, skip_dependencies=True)
+    async def catalogue(page: int = Depends(lambda: 1)):
+        calls.append("catalogue")
+        return len(calls)
+
+    app.include_router(router, prefix="/admin")
+    app.add_middleware(ResponseCacheMiddleware)
+
+    async def main():
+        key = [("x-api-key", "secret")]
+        with pytest.warns(UserWarning, match="/admin/report is not cached"):
+            for _ in range(3):
+                assert (await _get(app, "/admin/report", key))[0] == 200
+        assert calls.count("report") == 3
+        assert (await _get(app, "/admin/report"))[0] == 422
+
+        for _ in range(3):
+            await _get(app, "/catalogue")
+        assert calls.count("catalogue") == 2
+
+    asyncio.run(main())
+
+
+def test_only_paths_of_cached_routes_are_looked_up(monkeypatch):
+    calls = []
+    app = _app(calls)
+    lookups = []
+    cache = get_cache()
+    get = cache.get
+
+    async def recording_get(key):
+        lookups.append(key)
+        return await get(key)
+
+    monkeypatch.setattr(cache, "get", recording_get)
+
+    async def main():
+        await _get(app, "/uncached")
+        await _get(app, "/missing")
+        assert lookups == []
+        await _get(app, "/products/1")
+        assert lookups == ["response-options:/products/1"]
+
+    asyncio.run(main())
+
+
+def test_model_writes_bump_their_tag(tortoise_db, monkeypatch):
+    from fastapi_backend.conf import settings
+
+    backend = {"BACKEND": "fastapi_backend.core.cache.backends.LocMemCache"}
+    monkeypatch.setattr(settings, "CACHES", {"default": backend, "other": backend})
+
+    @cache_response(60, tags=[Product])
+    async def product():
+        return None
+
+    async def main():
+        cache = get_cache()
+        tag = model_tag(Product)
+        before = await cache.get_tag_versions([tag])
+        await Product.create(name="lamp")
+        assert await cache.get_tag_versions([tag]) != before
+        # no endpoint stores tagged responses there
+        assert await get_cache("other").get_tag_versions([tag]) == [0]
+
+    tortoise_db({"responsecachetest": [__name__]}, main)
+
+
+def test_locmem_cache_evicts_by_count_and_size():
+    async def main():
+        cache = LocMemCache(max_entries=2, max_size=None)
+        for key in "abc":
+            await cache.set(key, key)
+        assert [await cache.get(key) for key in "abc"] == [MISSING, "b", "c"]
+
+        cache = LocMemCache(max_size=200)
+        await cache.set("small", b"x")
+        await cache.set("big", b"x" * 150)
+        await cache.set("bigger", b"x" * 150)
+        assert await cache.get("small") is MISSING
+        assert await cache.get("bigger") == b"x" * 150
+
+        await cache.set("expired", 1, timeout=-1)
+        assert await cache.get("expired") is MISSING
+
+    asyncio.run(main())
+
+
+def test_file_cache_is_shared_between_instances(tmp_path):
+    async def main():
+        worker_a = FileBasedCache(tmp_path, key_prefix="app")
+        worker_b = FileBasedCache(tmp_path, key_prefix="app")
+
+        await worker_a.set("key", {"value": 1})
+        assert await worker_b.get("key") == {"value": 1}
+        # entries are unpickled, so only their user may write or read them
+        (entry,) = tmp_path.glob("*.cache")
+        assert stat.S_IMODE(entry.stat().st_mode) == 0o600
+
+        versions = await worker_a.get_tag_versions(["t"])
+        await worker_b.bump_tags(["t"])
+        assert await worker_a.get_tag_versions(["t"]) != versions
+
+        await worker_b.delete("key")
+        assert await worker_a.get("key") is MISSING
+
+        worker_a.max_entries, worker_a.cull_every = 3, 1
+        for i in range(5):
+            await worker_a.set(f"k{i}", i)
+        assert len(list(tmp_path.glob("*.cache"))) <= 3
+
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+import asyncio
+import sys
+
+from fastapi import APIRouter, FastAPI
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount
+
+from fastapi_backend.core.routing import RouteIndex, install_radix_dispatcher
+from fastapi_backend.modules import ModuleConfig
+
+ROUTES_PY = """from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/items/{item_id}")
+async def item(item_id: int):
+    return {"item": item_id}
+"""
+
+
+async def _request(app, path, method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], body.decode()
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/users/me")
+    async def me():
+        return "me"
+
+    @app.get("/users/{user_id}")
+    async def user(user_id: int):
+        return user_id
+
+    @app.post("/users/{user_id}/posts")
+    async def post(user_id: int):
+        return "posted"
+
+    @app.get("/files/{name:path}")
+    async def file(name: str):
+        return name
+
+    @app.get("/slash/")
+    async def slash():
+        return "slash"
+
+    shop = APIRouter()
+
+    @shop.get("/orders/{order_id}")
+    async def order(order_id: int):
+        return order_id
+
+    app.include_router(shop, prefix="/shop")
+
+    async def static(scope, receive, send):
+        await PlainTextResponse(scope["path"])(scope, receive, send)
+
+    app.router.routes.append(Mount("/static", app=static))
+    return app
+
+
+PATHS = [
+    ("GET", "/users/me"),
+    ("GET", "/users/7"),
+    ("GET", "/users/7/posts"),
+    ("POST", "/users/7/posts"),
+    ("GET", "/files/a/b.txt"),
+    ("GET", "/slash"),
+    ("GET", "/shop/orders/3"),
+    ("GET", "/shop/orders"),
+    ("GET", "/static/css/site.css"),
+    ("GET", "/missing"),
+]
+
+
+def test_radix_dispatch_matches_linear_scan():
+    linear = _app()
+    radix = _app()
+    install_radix_dispatcher(radix)
+
+    async def main():
+        for method, path in PATHS:
+            expected = await _request(linear, path, method)
+            assert await _request(radix, path, method) == expected, path
+
+    asyncio.run(main())
+
+
+def test_route_index_narrows_candidates():
+    app = _app()
+    index = RouteIndex(app.router.routes)
+    paths = [getattr(r, "path", None) for r in index.candidates("/users/me")]
+    assert paths == ["/users/me", "/users/{user_id}"]
+    assert [getattr(r, "path", None) for r in index.candidates("/nope/x")] == []
+
+
+def test_module_routes_are_discovered(tmp_path, monkeypatch):
+    pkg = tmp_path / "catalog"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "routes.py").write_text(ROUTES_PY)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        cfg = ModuleConfig.create("catalog")
+        assert cfg.get_routes_prefix() == "/catalog"
+        assert isinstance(cfg.router, APIRouter)
+
+        app = FastAPI()
+        app.include_router(cfg.router, prefix=cfg.get_routes_prefix())
+        install_radix_dispatcher(app)
+        status, body = asyncio.run(_request(app, "/catalog/items/5"))
+        assert (status, body) == (200, '{"item":5}')
+    finally:
+        for name in list(sys.modules):
+            if name == "catalog" or name.startswith("catalog."):
+                sys.modules.pop(name)
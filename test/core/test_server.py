@@ -0,0 +1,101 @@
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from fastapi_backend.core.server import load_application
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+
+ARBITER_SCRIPT = textwrap.dedent(
+    """
+    import os, sys, time
+    from pathlib import Path
+    from fastapi_backend.core.server import Arbiter
+
+    out = Path(sys.argv[1])
+
+    def factory():
+        (out / f"load-{os.getpid()}").touch()
+        return "app"
+
+    class RecordingArbiter(Arbiter):
+        def serve(self, sock, app):
+            (out / f"serve-{os.getpid()}").write_text(app)
+            if not self.max_requests:
+                time.sleep(60)
+
+    arbiter = RecordingArbiter(
+        "__main__.factory",
+        port=0,
+        workers=2,
+        preload=sys.argv[2] == "preload",
+        max_requests=int(sys.argv[3]) or None,
+        graceful_timeout=5,
+    )
+    sys.exit(arbiter.run())
+    """
+)
+
+
+def start(tmp_path, mode="preload", max_requests=0):
+    return subprocess.Popen(
+        [sys.executable, "-c", ARBITER_SCRIPT, str(tmp_path), mode, str(max_requests)]
+    )
+
+
+def files(tmp_path, prefix):
+    return {int(p.name.split("-")[1]) for p in tmp_path.glob(f"{prefix}-*")}
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def application_factory():
+    return "app"
+
+
+def test_load_application_calls_factories():
+    assert load_application(f"{__name__}.application_factory") == "app"
+    assert load_application("os.path.join") is os.path.join
+
+
+def test_preload_forks_workers_and_restarts_them_on_hup(tmp_path):
+    proc = start(tmp_path)
+    try:
+        wait_for(lambda: len(files(tmp_path, "serve")) == 2)
+        # the application was built once, in the arbiter
+        assert files(tmp_path, "load") == {proc.pid}
+        first = files(tmp_path, "serve")
+
+        proc.send_signal(signal.SIGHUP)
+        wait_for(lambda: len(files(tmp_path, "serve")) == 4)
+        assert files(tmp_path, "load") == {proc.pid}
+        for pid in first:
+            wait_for(lambda pid=pid: not os.path.exists(f"/proc/{pid}"))
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=10) == 0
+    for pid in files(tmp_path, "serve"):
+        assert not os.path.exists(f"/proc/{pid}")
+
+
+def test_workers_load_after_fork_and_are_recycled(tmp_path):
+    proc = start(tmp_path, mode="fork", max_requests=10)
+    try:
+        wait_for(lambda: len(files(tmp_path, "serve")) >= 6)
+        # a worker just forked may have loaded but not served yet
+        loaded = files(tmp_path, "load")
+        wait_for(lambda: loaded <= files(tmp_path, "serve"))
+        assert proc.poll() is None
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=10) == 0
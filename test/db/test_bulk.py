@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fastapi_backend.db import fields
+from fastapi_backend.db.bulk import chunk_size
+from fastapi_backend.db.models import Model
+
+
+class Product(Model):
+    id = fields.IntField(primary_key=True)
+    sku = fields.CharField(max_length=16, unique=True)
+    price = fields.IntField(default=0)
+
+    class Meta:
+        app = "bulktest"
+
+
+APPS = {"bulktest": [__name__]}
+
+
+def test_chunk_size_respects_parameter_limits():
+    sqlite = SimpleNamespace(capabilities=SimpleNamespace(dialect="sqlite"))
+    postgres = SimpleNamespace(capabilities=SimpleNamespace(dialect="postgres"))
+
+    assert chunk_size(postgres, 3) == 10922
+    assert chunk_size(postgres, 3, batch_size=500) == 500
+    assert chunk_size(sqlite, 40000) == 1
+    assert chunk_size(sqlite, 1) in (999, 32766)
+
+
+def test_insert_many_returns_pks_in_order(tortoise_db):
+    async def insert():
+        products = [Product(sku=f"s{i}", price=i) for i in range(5)]
+        products.append(Product(id=100, sku="custom"))
+        pks = await Product.insert_many(products, batch_size=2)
+        rows = await Product.all().order_by("id").values_list("id", "sku")
+        return pks, [p.id for p in products], rows
+
+    pks, ids, rows = tortoise_db(APPS, insert)
+
+    assert pks == ids == [1, 2, 3, 4, 5, 100]
+    assert rows == [
+        (1, "s0"),
+        (2, "s1"),
+        (3, "s2"),
+        (4, "s3"),
+        (5, "s4"),
+        (100, "custom"),
+    ]
+
+
+def test_upsert_and_update_many(tortoise_db):
+    async def write():
+        await Product.insert_many(
+            [Product(sku="a", price=1), Product(sku="b", price=2)]
+        )
+        pks = await Product.upsert_many(
+            [Product(sku="b", price=20), Product(sku="c", price=30)],
+            on_conflict=("sku",),
+            update_fields=("price",),
+        )
+        ids = (
+            await Product.filter(sku__in=["b", "c"])
+            .order_by("sku")
+            .values_list("id", flat=True)
+        )
+        products = await Product.all().order_by("id")
+        for product in products:
+            product.price += 1
+        updated = await Product.update_many(products, ("price",), batch_size=2)
+        rows = await Product.all().order_by("id").values_list("sku", "price")
+        return pks, ids, updated, rows
+
+    pks, ids, updated, rows = tortoise_db(APPS, write)
+
+    assert pks == ids
+    assert updated == 3
+    assert rows == [("a", 2), ("b", 21), ("c", 31)]
+
+
+def test_atomic_insert_rolls_back_every_chunk(tortoise_db):
+    from tortoise.exceptions import IntegrityError
+
+    async def insert():
+        products = [Product(sku="x"), Product(sku="y"), Product(sku="x")]
+        with pytest.raises(IntegrityError):
+            await Product.insert_many(products, batch_size=2, atomic=True)
+        return await Product.all().count()
+
+    assert tortoise_db(APPS, insert) == 0
+
+
+def test_returned_rows_are_matched_whatever_their_order(tortoise_db):
+    from tortoise import Tortoise
+
+    class Reversing:
+        # RETURNING order is unspecified; hand rows back reversed
+        def __init__(self, db):
+            self.db = db
+
+        def __getattr__(self, name):
+            return getattr(self.db, name)
+
+        async def execute_query(self, sql, params):
+            count, rows = await self.db.execute_query(sql, params)
+            return count, list(reversed(rows))
+
+    async def insert():
+        db = Reversing(Tortoise.get_connection("default"))
+        products = [Product(sku=f"s{i}") for i in range(4)]
+        await Product.insert_many(products, using_db=db)
+        upserted = [Product(sku="s2", price=1), Product(sku="new", price=2)]
+        await Product.upsert_many(
+            upserted, on_conflict=("sku",), update_fields=("price",), using_db=db
+        )
+        skipped = [Product(sku="s3"), Product(sku="other")]
+        pks = await Product.upsert_many(
+            skipped, on_conflict=("sku",), update_fields=(), using_db=db
+        )
+        rows = dict(await Product.all().values_list("sku", "id"))
+        return products, upserted, skipped, pks, rows
+
+    products, upserted, skipped, pks, rows = tortoise_db(APPS, insert)
+
+    assert [p.id for p in products] == [rows[p.sku] for p in products] == [1, 2, 3, 4]
+    assert [p.id for p in upserted] == [3, rows["new"]]
+    # DO NOTHING returns no row for the skipped s3
+    assert pks == [None, rows["other"]]
+    assert skipped[0].id is None and skipped[1].id == rows["other"]
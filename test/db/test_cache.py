@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from fastapi_backend.db import cache as query_cache
+from fastapi_backend.db import fields
+from fastapi_backend.db.cache import MISSING, LocMemQueryCache, cached
+from fastapi_backend.db.models import Model
+from fastapi_backend.db.transaction import on_commit
+
+
+class Author(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+
+    class Meta:
+        app = "cachetest"
+
+
+class Book(Model):
+    id = fields.IntField(primary_key=True)
+    title = fields.CharField(max_length=32)
+    author = fields.ForeignKeyField("cachetest.Author", related_name="books")
+
+    class Meta:
+        app = "cachetest"
+
+
+APPS = {"cachetest": [__name__]}
+
+
+def test_locmem_evicts_least_recently_used_and_expired():
+    backend = LocMemQueryCache(max_entries=2)
+
+    async def main():
+        await backend.set("a", 1, ttl=None)
+        await backend.set("b", 2, ttl=None)
+        await backend.get("a")
+        await backend.set("c", 3, ttl=None)
+        values = [await backend.get(key) for key in "abc"]
+        await backend.set("c", 3, ttl=-1)
+        return values + [await backend.get("c")]
+
+    assert asyncio.run(main()) == [1, MISSING, 3, MISSING]
+
+
+def test_on_commit_runs_after_commit_only(tortoise_db):
+    from tortoise.transactions import in_transaction
+
+    calls = []
+
+    async def main():
+        await on_commit(lambda: calls.append("outside"))
+        async with in_transaction():
+            await on_commit(lambda: calls.append("committed"))
+            assert calls == ["outside"]
+        with pytest.raises(RuntimeError):
+            async with in_transaction():
+                await on_commit(lambda: calls.append("rolled back"))
+                raise RuntimeError
+
+    tortoise_db(APPS, main, generate_schemas=False)
+
+    assert calls == ["outside", "committed"]
+
+
+def test_cached_queries_invalidate_on_writes(tortoise_db, monkeypatch):
+    from tortoise import Tortoise
+    from tortoise.transactions import in_transaction
+
+    backend = LocMemQueryCache()
+    monkeypatch.setattr(query_cache, "get_query_cache", lambda: backend)
+    seen = {}
+
+    def titles():
+        return cached(
+            Book.filter(author__name="ann")
+            .order_by("id")
+            .values_list("title", flat=True)
+        )
+
+    async def main():
+        ann = await Author.create(name="ann")
+        await Book.create(title="one", author=ann)
+        conn = Tortoise.get_connection("default")
+
+        seen["first"] = await titles()
+        # untracked raw write: the cached result is served
+        await conn.execute_query("UPDATE book SET title = 'raw'")
+        seen["cached"] = await titles()
+
+        # a write to a joined model invalidates too
+        ann.name = "ann"
+        await ann.save()
+        seen["after_author_save"] = await titles()
+
+        await Book.filter(title="raw").update(title="two")
+        seen["after_update"] = await titles()
+
+        async with in_transaction():
+            await Book.create(title="three", author=ann)
+        seen["after_transaction"] = await titles()
+
+        await Book.filter(title="two").delete()
+        seen["after_delete"] = await titles()
+        seen["count"] = await cached(Book.all().count())
+
+    tortoise_db(APPS, main)
+
+    assert seen["first"] == ["one"]
+    assert seen["cached"] == ["one"]
+    assert seen["after_author_save"] == ["raw"]
+    assert seen["after_update"] == ["two"]
+    assert seen["after_transaction"] == ["two", "three"]
+    assert seen["after_delete"] == ["three"]
+    assert seen["count"] == 1
@@ -0,0 +1,124 @@
+import datetime
+import io
+import json
+
+import pytest
+
+from fastapi_backend.db import fields
+from fastapi_backend.db.fixtures import dependency_order, dump, load, resolve_models
+from fastapi_backend.db.models import Model
+from fastapi_backend.modules import modules
+
+
+class Author(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+    born = fields.DateField(null=True)
+    career = fields.TimeDeltaField(null=True)
+    portrait = fields.BinaryField(null=True)
+
+    class Meta:
+        app = "fixturetest"
+        table = "fixture_author"
+
+
+class Book(Model):
+    id = fields.IntField(primary_key=True)
+    title = fields.CharField(max_length=32)
+    author = fields.ForeignKeyField("fixturetest.Author", related_name="books")
+    sequel = fields.ForeignKeyField("fixturetest.Book", null=True)
+
+    class Meta:
+        app = "fixturetest"
+        table = "fixture_book"
+
+
+APPS = {"fixturetest": [__name__]}
+
+
+def test_resolve_models_and_dependency_order():
+    assert set(resolve_models(modules, ["fixturetest"])) == {Author, Book}
+    assert resolve_models(modules, ["fixturetest.Book"]) == [Book]
+    with pytest.raises(ValueError):
+        resolve_models(modules, ["nosuchlabel"])
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_dump_and_load_round_trip(tortoise_db, workers):
+    async def populate():
+        assert dependency_order([Book, Author]) == [Author, Book]
+        authors = [
+            Author(
+                id=i,
+                name=f"author {i}",
+                born=datetime.date(1900 + i, 1, 1),
+                career=datetime.timedelta(days=365 * i, seconds=0.5),
+                portrait=bytes([i, 255]),
+            )
+            for i in range(1, 6)
+        ]
+        await Author.bulk_create(authors)
+        await Book.bulk_create(
+            [Book(id=i, title=f"book {i}", author_id=i % 5 + 1) for i in range(1, 21)]
+        )
+        await Book.filter(id=2).update(sequel_id=1)
+        out = io.StringIO()
+        count = await dump(resolve_models(modules, ["fixturetest"]), out, batch_size=7)
+        return count, out.getvalue()
+
+    count, text = tortoise_db(APPS, populate, name="source.sqlite")
+    lines = text.splitlines()
+    assert count == len(lines) == 25
+    assert [json.loads(line)["model"] for line in lines] == (
+        ["fixturetest.Author"] * 5 + ["fixturetest.Book"] * 20
+    )
+
+    async def restore():
+        counts = await load(modules, lines, batch_size=3, workers=workers)
+        books = await Book.all().order_by("id").values("id", "author_id", "sequel_id")
+        author = await Author.get(id=3)
+        return counts, books, author
+
+    counts, books, author = tortoise_db(APPS, restore, name=f"target{workers}.sqlite")
+    assert counts == {"fixturetest.Author": 5, "fixturetest.Book": 20}
+    assert len(books) == 20
+    assert books[1] == {"id": 2, "author_id": 3, "sequel_id": 1}
+    assert author.born == datetime.date(1903, 1, 1)
+    assert author.career == datetime.timedelta(days=3 * 365, seconds=0.5)
+    assert author.portrait == b"\x03\xff"
+
+
+def test_load_rejects_rows_out_of_dependency_order(tortoise_db):
+    lines = [
+        '{"model": "fixturetest.Author", "fields": {"id": 1, "name": "a"}}',
+        '{"model": "fixturetest.Book", "fields": {"id": 1, "title": "b", "author_id": 1}}',
+        '{"model": "fixturetest.Author", "fields": {"id": 2, "name": "c"}}',
+    ]
+
+    async def restore():
+        await load(modules, lines)
+
+    with pytest.raises(ValueError, match="line 3"):
+        tortoise_db(APPS, restore)
+
+
+def test_load_holds_rows_back_until_their_own_model_references_exist(tortoise_db):
+    def book(id, sequel_id):
+        fields = {"id": id, "title": f"b{id}", "author_id": 1, "sequel_id": sequel_id}
+        return json.dumps({"model": "fixturetest.Book", "fields": fields})
+
+    lines = [
+        '{"model": "fixturetest.Author", "fields": {"id": 1, "name": "a"}}',
+        book(1, 3),
+        book(2, 1),
+        book(4, 4),
+        book(3, None),
+    ]
+
+    async def restore():
+        counts = await load(modules, lines, batch_size=2)
+        return counts, await Book.all().order_by("id").values_list("id", "sequel_id")
+
+    counts, books = tortoise_db(APPS, restore)
+    assert counts == {"fixturetest.Author": 1, "fixturetest.Book": 4}
+    assert books == [(1, 3), (2, 1), (3, None), (4, 4)]
@@ -0,0 +1,122 @@
+import asyncio
+
+from fastapi_backend.db import fields
+from fastapi_backend.db.loader import loader_scope
+from fastapi_backend.db.models import Model
+from fastapi_backend.db.nplusone import assert_max_queries
+
+
+class Shelf(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=16)
+
+    class Meta:
+        app = "loadertest"
+        table = "loader_shelf"
+
+
+class Item(Model):
+    id = fields.IntField(primary_key=True)
+    shelf = fields.ForeignKeyField("loadertest.Shelf", related_name="items")
+    label = fields.OneToOneField("loadertest.Label", null=True, related_name="item")
+
+    class Meta:
+        app = "loadertest"
+        table = "loader_item"
+
+
+class Label(Model):
+    id = fields.IntField(primary_key=True)
+    text = fields.CharField(max_length=16)
+
+    class Meta:
+        app = "loadertest"
+        table = "loader_label"
+
+
+def run(tortoise_db, coro_factory):
+    async def main():
+        shelves = [await Shelf.create(name=f"s{i}") for i in range(3)]
+        label = await Label.create(text="fragile")
+        for i in range(9):
+            await Item.create(shelf=shelves[i % 3], label=label if i == 0 else None)
+        return await coro_factory()
+
+    return tortoise_db({"loadertest": [__name__]}, main)
+
+
+def test_gathered_loads_are_batched_and_remembered(tortoise_db):
+    async def main():
+        items = await Item.all().order_by("id")
+        with loader_scope():
+            with assert_max_queries(1):
+                shelves = await asyncio.gather(*(item.shelf for item in items))
+            fetched_again = await Item.get(id=2)
+            with assert_max_queries(0):
+                again = await items[4].shelf
+                shelf_of_new = await fetched_again.shelf
+            with assert_max_queries(2):
+                labels = await asyncio.gather(*(item.label for item in items))
+                reverse = await asyncio.gather(*(label.item for label in labels[:1]))
+        return items, shelves, again, shelf_of_new, labels, reverse
+
+    items, shelves, again, shelf_of_new, labels, reverse = run(tortoise_db, main)
+    assert [shelf.id for shelf in shelves] == [1, 2, 3] * 3
+    assert again is shelves[4]
+    assert shelf_of_new is shelves[1]
+    assert items[4].shelf is shelves[4]
+    assert [label and label.text for label in labels] == ["fragile"] + [None] * 8
+    assert reverse[0].id == items[0].id
+
+
+def test_reverse_relations_are_batched(tortoise_db):
+    async def main():
+        shelves = await Shelf.all().order_by("id")
+        with loader_scope():
+            with assert_max_queries(1):
+                items = await asyncio.gather(*(shelf.items for shelf in shelves))
+            # loaded relations can be iterated like prefetched ones
+            listed = [len(list(shelf.items)) for shelf in shelves]
+            await Item.filter(id=1).update(shelf_id=2)
+            with assert_max_queries(1):
+                after_update = await asyncio.gather(*(shelf.items for shelf in shelves))
+        return items, listed, after_update
+
+    items, listed, after_update = run(tortoise_db, main)
+    assert [[item.id for item in group] for group in items] == [
+        [1, 4, 7],
+        [2, 5, 8],
+        [3, 6, 9],
+    ]
+    assert listed == [3, 3, 3]
+    assert [len(group) for group in after_update] == [2, 4, 3]
+
+
+def test_single_relations_keep_their_queryset_api(tortoise_db):
+    async def main():
+        item = await Item.get(id=1)
+        with loader_scope():
+            only = await item.shelf.only("id")
+            values = await item.shelf.values("name")
+            prefetched = await item.label.prefetch_related("item")
+        return only, values, prefetched
+
+    only, values, prefetched = run(tortoise_db, main)
+    assert only.id == 1
+    assert values == {"name": "s0"}
+    assert prefetched.item.id == 1
+
+
+def test_loads_query_directly_outside_scopes_and_transactions(tortoise_db):
+    from tortoise.transactions import in_transaction
+
+    async def main():
+        items = await Item.all().order_by("id").limit(3)
+        with assert_max_queries(3):
+            await asyncio.gather(*(item.shelf for item in items))
+        with loader_scope():
+            async with in_transaction():
+                with assert_max_queries(3):
+                    await asyncio.gather(*(item.shelf for item in items))
+
+    run(tortoise_db, main)
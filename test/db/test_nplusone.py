@@ -0,0 +1,119 @@
+import pytest
+
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+from fastapi_backend.db.nplusone import (
+    NPlusOneError,
+    NPlusOneWarning,
+    assert_max_queries,
+    detect_n_plus_one,
+    fingerprint,
+)
+
+
+class Team(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=16)
+
+    class Meta:
+        app = "nplusonetest"
+        table = "nplusone_team"
+
+
+class Player(Model):
+    id = fields.IntField(primary_key=True)
+    team = fields.ForeignKeyField("nplusonetest.Team", related_name="players")
+
+    class Meta:
+        app = "nplusonetest"
+        table = "nplusone_player"
+
+
+def run(tortoise_db, coro_factory, **options):
+    async def main():
+        teams = [await Team.create(name=f"t{i}") for i in range(3)]
+        for i in range(6):
+            await Player.create(team=teams[i % 3])
+        return await coro_factory()
+
+    return tortoise_db({"nplusonetest": [__name__]}, main, **options)
+
+
+def test_fingerprint_ignores_literals():
+    assert fingerprint("SELECT * FROM t WHERE id = 3 AND name = 'a''b'") == (
+        fingerprint("SELECT *  FROM t WHERE id = 14 AND name = 'c'")
+    )
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == (
+        "SELECT ? FROM t WHERE id IN (...)"
+    )
+
+
+def test_lazy_foreign_key_loop_is_reported(tortoise_db):
+    async def main():
+        with detect_n_plus_one(threshold=3, action="raise"):
+            for player in await Player.all():
+                await player.team
+
+    with pytest.raises(NPlusOneError) as info:
+        run(tortoise_db, main)
+    message = str(info.value)
+    assert "test_nplusone.py" in message
+    assert "Player querysets: .select_related('team')" in message
+
+
+def test_batched_loads_report_the_loop_and_relation(tortoise_db):
+    import inspect
+
+    from fastapi_backend.db.loader import loader_scope
+
+    async def main():
+        with detect_n_plus_one(threshold=3, action="log") as detector:
+            with loader_scope():
+                for player in await Player.all():
+                    await player.team  # the reported line
+                for team in await Team.all():
+                    await team.players
+        return detector.reports
+
+    reports = run(tortoise_db, main)
+    source, start = inspect.getsourcelines(
+        test_batched_loads_report_the_loop_and_relation
+    )
+    fk_line = start + next(
+        i for i, line in enumerate(source) if "reported line" in line
+    )
+    assert len(reports) == 2
+    assert f"test_nplusone.py:{fk_line} in main" in reports[0]
+    assert "Player querysets: .select_related('team')" in reports[0]
+    assert "Team querysets: .prefetch_related('players')" in reports[1]
+
+
+def test_reverse_relation_loop_warns_and_prefetch_does_not(tortoise_db):
+    async def loop():
+        with detect_n_plus_one(threshold=3) as detector:
+            for team in await Team.all():
+                await team.players.all()
+        return detector.reports
+
+    async def prefetched():
+        with detect_n_plus_one(threshold=3) as detector:
+            for team in await Team.all().prefetch_related("players"):
+                list(team.players)
+        return detector.reports
+
+    with pytest.warns(NPlusOneWarning, match=r"prefetch_related\('players'\)"):
+        reports = run(tortoise_db, loop)
+    assert len(reports) == 1
+    assert run(tortoise_db, prefetched, name="prefetched.sqlite") == []
+
+
+def test_assert_max_queries(tortoise_db):
+    async def main():
+        with assert_max_queries(2):
+            await Player.all().select_related("team")
+        with assert_max_queries(1):
+            for player in await Player.all().limit(2):
+                await player.team
+
+    with pytest.raises(AssertionError, match="3 queries executed, at most 1"):
+        run(tortoise_db, main)
@@ -0,0 +1,206 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from fastapi_backend.db.backends.pool import (
+    InstrumentedLock,
+    InstrumentedPool,
+    PoolMetrics,
+    get_pool_metrics,
+)
+from fastapi_backend.db.config import _connection_config
+
+
+def test_lock_counts_waiters_and_times_out():
+    metrics = PoolMetrics()
+    lock = InstrumentedLock(metrics, timeout=0.01)
+    seen = {}
+
+    async def main():
+        await lock.acquire()
+        waiter = asyncio.create_task(lock.acquire())
+        await asyncio.sleep(0)
+        seen["waiters"] = metrics.waiters
+        with pytest.raises(TimeoutError):
+            await waiter
+        lock.release()
+
+    asyncio.run(main())
+
+    assert seen["waiters"] == 1
+    assert metrics.snapshot(size=1) | {"acquire_seconds_total": 0} == {
+        "size": 1,
+        "in_use": 0,
+        "idle": 1,
+        "waiters": 0,
+        "acquired": 1,
+        "timeouts": 1,
+        "acquire_seconds_total": 0,
+        "acquire_seconds_max": metrics.acquire_seconds_max,
+    }
+    assert metrics.acquire_seconds_max >= 0.01
+
+
+def test_pool_proxy_tracks_connections_in_use():
+    class FakePool:
+        def __init__(self):
+            self.released = []
+
+        async def acquire(self):
+            return "conn"
+
+        async def release(self, connection):
+            self.released.append(connection)
+
+        def get_size(self):
+            return 4
+
+    metrics = PoolMetrics()
+    pool = InstrumentedPool(FakePool(), metrics)
+
+    async def main():
+        conn = await pool.acquire()
+        assert metrics.snapshot(pool.get_size())["in_use"] == 1
+        await pool.release(conn)
+
+    asyncio.run(main())
+
+    assert pool.released == ["conn"]
+    assert metrics.snapshot(pool.get_size())["idle"] == 4
+
+
+def test_postgres_connection_config_carries_pool_settings():
+    settings = SimpleNamespace(
+        DB_PROVIDER="postgresql",
+        DB_ASYNC_DRIVER="asyncpg",
+        DB_HOST="db",
+        DB_PORT=None,
+        DB_USER="app",
+        DB_PASSWORD="secret",
+        DB_NAME="app",
+        DB_POOL_MIN_SIZE=2,
+        DB_POOL_MAX_SIZE=20,
+        DB_POOL_MAX_IDLE_LIFETIME=60.0,
+        DB_POOL_ACQUIRE_TIMEOUT=5.0,
+        DB_STATEMENT_CACHE_SIZE=0,
+        DB_CONNECT_TIMEOUT=3.0,
+    )
+
+    config = _connection_config(settings)
+
+    assert config["engine"] == "fastapi_backend.db.backends.asyncpg"
+    assert config["credentials"] == {
+        "host": "db",
+        "port": 5432,
+        "user": "app",
+        "password": "secret",
+        "database": "app",
+        "minsize": 2,
+        "maxsize": 20,
+        "max_inactive_connection_lifetime": 60.0,
+        "acquire_timeout": 5.0,
+        "statement_cache_size": 0,
+        "timeout": 3.0,
+    }
+
+
+@pytest.mark.filterwarnings("ignore:Module .* has no models")
+def test_sqlite_client_reports_metrics(tmp_path):
+    from tortoise import Tortoise
+    from tortoise.transactions import in_transaction
+
+    config = {
+        "connections": {
+            "default": {
+                "engine": "fastapi_backend.db.backends.sqlite",
+                "credentials": {"file_path": str(tmp_path / "db.sqlite")},
+            }
+        },
+        "apps": {"empty": {"models": ["fastapi_backend.db.fields"]}},
+    }
+    seen = {}
+
+    async def main():
+        await Tortoise.init(config=config)
+        try:
+            conn = Tortoise.get_connection("default")
+            await asyncio.gather(*(conn.execute_query("SELECT 1") for _ in range(5)))
+            async with in_transaction() as trx:
+                await trx.execute_query("SELECT 1")
+                seen["in_transaction"] = get_pool_metrics()["default"]
+            seen["after"] = get_pool_metrics()["default"]
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+    assert seen["in_transaction"]["in_use"] == 1
+    assert seen["after"]["in_use"] == 0
+    assert seen["after"]["acquired"] == 6
+
+
+def _sqlite_config(path, **credentials):
+    return {
+        "connections": {
+            "default": {
+                "engine": "fastapi_backend.db.backends.sqlite",
+                "credentials": {"file_path": str(path), **credentials},
+            }
+        },
+        "apps": {"empty": {"models": ["fastapi_backend.db.fields"]}},
+    }
+
+
+@pytest.mark.filterwarnings("ignore:Module .* has no models")
+def test_sqlite_reads_use_read_pool_outside_transactions(tmp_path):
+    from tortoise import Tortoise
+    from tortoise.transactions import in_transaction
+
+    config = _sqlite_config(
+        tmp_path / "db.sqlite", read_pool_size=2, busy_timeout=1000, mmap_size=0
+    )
+    seen = {}
+
+    async def main():
+        await Tortoise.init(config=config)
+        try:
+            conn = Tortoise.get_connection("default")
+            await conn.execute_script("CREATE TABLE t (v INTEGER)")
+            await conn.execute_query("INSERT INTO t VALUES (1)")
+            results = await asyncio.gather(
+                *(conn.execute_query_dict("SELECT v FROM t") for _ in range(5))
+            )
+            seen["results"] = results
+            async with in_transaction() as trx:
+                await trx.execute_query("INSERT INTO t VALUES (2)")
+                _, rows = await trx.execute_query("SELECT v FROM t")
+                seen["in_transaction"] = len(rows)
+            _, rows = await conn.execute_query("SELECT * FROM pragma_busy_timeout")
+            seen["busy_timeout"] = rows[0][0]
+            seen["metrics"] = get_pool_metrics()
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+    assert seen["results"] == [[{"v": 1}]] * 5
+    assert seen["in_transaction"] == 2
+    assert seen["busy_timeout"] == 1000
+    assert seen["metrics"]["default:read"]["size"] == 2
+    assert seen["metrics"]["default:read"]["acquired"] == 6
+
+
+def test_sqlite_read_pool_requires_wal(tmp_path):
+    from fastapi_backend.db.backends.sqlite import SqliteClient
+
+    rollback = SqliteClient(
+        str(tmp_path / "db.sqlite"),
+        connection_name="default",
+        read_pool_size=2,
+        journal_mode="DELETE",
+    )
+    memory = SqliteClient(":memory:", connection_name="default", read_pool_size=2)
+
+    assert rollback.read_pool is None
+    assert memory.read_pool is None
@@ -0,0 +1,138 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from tortoise import fields
+from tortoise.models import Model as TortoiseModel
+
+from fastapi_backend.db.routers import (
+    BaseRouter,
+    ModulesRouter,
+    ReplicaRouter,
+    is_pinned,
+    routing_scope,
+)
+
+REPLICAS = ["replica1", "replica2"]
+
+
+class Item(TortoiseModel):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+
+    class Meta:
+        table = "item"
+
+
+class ReplicatedRouter(ModulesRouter):
+    def __init__(self):
+        super().__init__([ReplicaRouter(replicas=REPLICAS)])
+
+
+def fake_model(connection="default"):
+    return SimpleNamespace(_meta=SimpleNamespace(default_connection=connection))
+
+
+def test_replica_router_round_robins_reads():
+    router = ReplicaRouter(replicas=REPLICAS)
+
+    reads = [router.db_for_read(fake_model()) for _ in range(3)]
+
+    assert reads == ["replica1", "replica2", "replica1"]
+    assert router.db_for_write(fake_model()) == "default"
+    assert ReplicaRouter().db_for_read(fake_model()) is None
+
+
+def test_first_router_with_an_answer_wins():
+    class AnalyticsRouter(BaseRouter):
+        def db_for_write(self, model):
+            if model._meta.default_connection == "analytics":
+                return "analytics"
+
+    router = ModulesRouter([AnalyticsRouter(), ReplicaRouter(replicas=REPLICAS)])
+    analytics = fake_model("analytics")
+
+    assert router.db_for_write(analytics) == "analytics"
+    assert router.db_for_write(fake_model()) == "default"
+    assert router.db_for_read(fake_model()) == "replica1"
+
+
+def test_writes_pin_reads_to_primary_within_scope():
+    router = ModulesRouter([ReplicaRouter(replicas=REPLICAS)])
+
+    with routing_scope():
+        assert router.db_for_read(fake_model()) == "replica1"
+        router.db_for_write(fake_model())
+        assert is_pinned()
+        assert router.db_for_read(fake_model()) == "default"
+
+    with routing_scope():
+        assert router.db_for_read(fake_model()) == "replica2"
+
+
+def test_database_overrides_reject_unknown_settings():
+    from fastapi_backend.conf import settings
+    from fastapi_backend.db.config import _connections_config
+
+    databases = {"replica1": {"DB_NAME": "replica1.sqlite", "REPLICA": True}}
+    connections = _connections_config(
+        settings.model_copy(update={"DATABASES": databases})
+    )
+    assert connections["replica1"]["credentials"]["file_path"].endswith(
+        "replica1.sqlite"
+    )
+
+    databases = {"replica1": {"NAME": "replica1.sqlite"}}
+    with pytest.raises(ValueError, match="unknown settings: NAME"):
+        _connections_config(settings.model_copy(update={"DATABASES": databases}))
+
+
+def test_sqlite_files_as_replicas(tmp_path):
+    from tortoise import Tortoise
+    from tortoise.transactions import in_transaction
+
+    config = {
+        "connections": {
+            alias: {
+                "engine": "fastapi_backend.db.backends.sqlite",
+                "credentials": {"file_path": str(tmp_path / f"{alias}.sqlite")},
+            }
+            for alias in ["default", *REPLICAS]
+        },
+        "apps": {"test": {"models": [__name__]}},
+        "routers": [ReplicatedRouter],
+    }
+    seen = {}
+
+    async def names():
+        return await Item.all().values_list("name", flat=True)
+
+    async def main():
+        await Tortoise.init(config=config)
+        try:
+            await Tortoise.generate_schemas()
+            for alias in REPLICAS:
+                conn = Tortoise.get_connection(alias)
+                await conn.execute_script(
+                    f"CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT);"
+                    f"INSERT INTO item (name) VALUES ('{alias}');"
+                )
+
+            with routing_scope():
+                seen["before_write"] = [await names(), await names()]
+                await Item.create(name="primary")
+                seen["after_write"] = await names()
+
+            with routing_scope():
+                seen["next_request"] = await names()
+                async with in_transaction("default"):
+                    seen["in_transaction"] = await names()
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+    assert seen["before_write"] == [["replica1"], ["replica2"]]
+    assert seen["after_write"] == ["primary"]
+    assert seen["next_request"] == ["replica1"]
+    assert seen["in_transaction"] == ["primary"]
@@ -0,0 +1,162 @@
+import datetime
+import decimal
+import json
+import uuid
+from enum import Enum, IntEnum
+
+import pytest
+
+from fastapi_backend.core.responses import ModelJSONResponse
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+from fastapi_backend.db.serializers import get_serializer
+
+
+class Color(str, Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Size(IntEnum):
+    SMALL = 1
+    LARGE = 2
+
+
+class Maker(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+
+    class Meta:
+        app = "serializertest"
+        table = "serializer_maker"
+
+
+class Widget(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+    notes = fields.TextField(null=True)
+    active = fields.BooleanField(default=True)
+    ratio = fields.FloatField(null=True)
+    price = fields.DecimalField(max_digits=8, decimal_places=2)
+    created = fields.DatetimeField()
+    day = fields.DateField(null=True)
+    token = fields.UUIDField()
+    color = fields.CharEnumField(Color)
+    size = fields.IntEnumField(Size)
+    extra = fields.JSONField(null=True)
+    maker = fields.ForeignKeyField("serializertest.Maker", null=True)
+
+    class Meta:
+        app = "serializertest"
+        table = "serializer_widget"
+
+
+class Clip(Model):
+    id = fields.IntField(primary_key=True)
+    length = fields.TimeDeltaField()
+    data = fields.BinaryField(null=True)
+
+    class Meta:
+        app = "serializertest"
+        table = "serializer_clip"
+
+
+TOKEN = uuid.UUID("12345678-1234-5678-1234-567812345678")
+CREATED = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
+
+def run(tortoise_db, coro_factory):
+    async def main():
+        maker = await Maker.create(name="acme")
+        await Widget.create(
+            name='say "hi" é',
+            price=decimal.Decimal("9.50"),
+            created=CREATED,
+            token=TOKEN,
+            color=Color.BLUE,
+            size=Size.LARGE,
+            ratio=float("nan"),
+            extra={"tags": ["a"]},
+            maker=maker,
+        )
+        return await coro_factory()
+
+    return tortoise_db({"serializertest": [__name__]}, main)
+
+
+def test_serializer_encodes_every_field_type(tortoise_db):
+    async def main():
+        widget = await Widget.get(id=1)
+        row = await Widget.filter(id=1).values("id", "name", "price", "maker_id")
+        return widget, row
+
+    widget, rows = run(tortoise_db, main)
+    serializer = get_serializer(Widget)
+
+    assert serializer is get_serializer(Widget)
+    assert serializer.fields[-1] == "maker_id"
+    assert json.loads(serializer.dumps(widget)) == {
+        "id": 1,
+        "name": 'say "hi" é',
+        "notes": None,
+        "active": True,
+        "ratio": None,
+        "price": "9.50",
+        "created": CREATED.isoformat(),
+        "day": None,
+        "token": str(TOKEN),
+        "color": "blue",
+        "size": 2,
+        "extra": {"tags": ["a"]},
+        "maker_id": 1,
+    }
+
+    subset = get_serializer(Widget, ("id", "name", "price", "maker_id"))
+    assert json.loads(subset.dumps_many(rows)) == [
+        {"id": 1, "name": 'say "hi" é', "price": "9.50", "maker_id": 1}
+    ]
+    assert subset.dumps_many([]) == b"[]"
+    with pytest.raises(ValueError, match="maker"):
+        get_serializer(Widget, ("maker",))
+
+
+def test_model_json_response(tortoise_db):
+    async def main():
+        return await Widget.all(), await Widget.all().values("id", "name")
+
+    widgets, rows = run(tortoise_db, main)
+
+    body = ModelJSONResponse(widgets, fields=("id", "size")).body
+    assert body == b'[{"id":1,"size":2}]'
+    assert ModelJSONResponse(widgets[0], fields=("id",)).body == b'{"id":1}'
+    assert ModelJSONResponse([]).body == b"[]"
+    rows_body = ModelJSONResponse(rows, model=Widget, fields=("id", "name")).body
+    assert json.loads(rows_body)[0]["id"] == 1
+    with pytest.raises(ValueError):
+        ModelJSONResponse(rows)
+
+
+def test_durations_and_bytes(tortoise_db):
+    from fastapi_backend.utils.encoding import json_default
+
+    length = datetime.timedelta(days=1, minutes=2, seconds=3.5)
+
+    async def main():
+        await Clip.create(length=length, data=b"\x00\xffclip")
+        await Clip.create(length=-datetime.timedelta(seconds=90))
+        return await Clip.all().order_by("id")
+
+    clips = run(tortoise_db, main)
+
+    assert json.loads(get_serializer(Clip).dumps_many(clips)) == [
+        {"id": 1, "length": "P1DT2M3.5S", "data": "AP9jbGlw"},
+        {"id": 2, "length": "-PT1M30S", "data": None},
+    ]
+    assert json.loads(ModelJSONResponse(clips[0]).body)["length"] == "P1DT2M3.5S"
+    assert (
+        json.dumps(
+            [clips[0].length, clips[0].data, datetime.timedelta(0)],
+            default=json_default,
+        )
+        == '["P1DT2M3.5S", "AP9jbGlw", "PT0S"]'
+    )
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from fastapi_backend.core.responses import NDJSONResponse
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+
+
+class Row(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+
+    class Meta:
+        app = "streamtest"
+
+
+def run_with_rows(tortoise_db, n, coro_factory):
+    async def main():
+        await Row.bulk_create([Row(id=i, name=f"row{i}") for i in range(1, n + 1)])
+        return await coro_factory()
+
+    return tortoise_db({"streamtest": [__name__]}, main)
+
+
+def test_stream_walks_table_in_keyset_batches(tortoise_db):
+    async def collect():
+        models = [row.id async for row in Row.stream(batch_size=3)]
+        values = [
+            row
+            async for row in Row.filter(id__gt=5).stream(batch_size=2, values=("name",))
+        ]
+        return models, values
+
+    models, values = run_with_rows(tortoise_db, 7, collect)
+
+    assert models == [1, 2, 3, 4, 5, 6, 7]
+    assert values == [{"id": 6, "name": "row6"}, {"id": 7, "name": "row7"}]
+
+
+def test_stream_rejects_offset(tortoise_db):
+    async def first():
+        with pytest.raises(ValueError, match="offset"):
+            await anext(Row.all().offset(1).stream())
+
+    run_with_rows(tortoise_db, 1, first)
+
+
+def test_ndjson_response_streams_models_and_dicts(tortoise_db):
+    async def body():
+        response = NDJSONResponse(Row.stream(batch_size=2), chunk_size=20)
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = run_with_rows(tortoise_db, 3, body)
+
+    assert len(chunks) > 1
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": i, "name": f"row{i}"} for i in (1, 2, 3)
+    ]
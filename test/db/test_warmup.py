@@ -0,0 +1,84 @@
+import asyncio
+from pathlib import Path
+from types import ModuleType
+
+from tortoise.backends.base.executor import EXECUTOR_CACHE
+
+from fastapi_backend.db import fields
+from fastapi_backend.db.models import Model
+from fastapi_backend.modules import ModuleConfig
+from fastapi_backend.modules.registry import ModulesRegistry
+
+
+class Widget(Model):
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=32)
+
+    class Meta:
+        app = "warmuptest"
+        table = "warmup_widget"
+
+
+def test_warmup_builds_model_state_and_runs_hooks(tortoise_db):
+    events = []
+
+    class WarmupConfig(ModuleConfig):
+        path = Path(".")
+
+        async def warmup(self):
+            events.append(self.label)
+
+    registry = ModulesRegistry([WarmupConfig("warmuptest", ModuleType("warmuptest"))])
+    registry.module_configs["warmuptest"].models = {"Widget": Widget}
+
+    async def main():
+        key = ("default", None, "warmup_widget")
+        EXECUTOR_CACHE.pop(key, None)
+
+        timings = await registry.run_warmup()
+
+        assert events == ["warmuptest"]
+        assert set(timings) == {"warmuptest"}
+        assert "" in EXECUTOR_CACHE[key][-1]  # update SQL of save()
+
+    tortoise_db({"warmuptest": [__name__]}, main, generate_schemas=False)
+
+
+def test_readiness_waits_for_startup():
+    from fastapi import FastAPI
+    from fastapi_backend.core.asgi import readiness
+
+    app = FastAPI()
+    app.add_route("/ready", readiness)
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def get():
+        messages.clear()
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/ready",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+        }
+        await app(scope, receive, send)
+        return messages[0]["status"], messages[1]["body"]
+
+    app.state.ready = False
+    assert asyncio.run(get()) == (503, b'{"ready":false}')
+
+    app.state.ready = True
+    app.state.ready_timings = {"warmuptest": 0.5}
+    app.state.warmup_timings = {"warmuptest": 0.25}
+    assert asyncio.run(get()) == (
+        200,
+        b'{"ready":true,"ready_timings":{"warmuptest":0.5},'
+        b'"warmup_timings":{"warmuptest":0.25}}',
+    )
@@ -0,0 +1,182 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from cyclopts import App
+
+from fastapi_backend.management.cli import discover
+from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
+from fastapi_backend.modules import ModuleConfig
+from fastapi_backend.utils.loaders import import_module
+
+
+COMMAND_PY = """from fastapi_backend.management.cli.command import BaseCommand, Bootstrap
+
+
+class Command(BaseCommand):
+    help = "{help}"
+    requires = Bootstrap.NOTHING
+
+    def handle(self):
+        return "{help}"
+"""
+
+
+@pytest.fixture
+def cmd_package(tmp_path: Path, monkeypatch):
+    pkg = tmp_path / "cmdpkg"
+    commands_dir = pkg / "management" / "commands"
+    commands_dir.mkdir(parents=True)
+    for folder in (pkg, pkg / "management", commands_dir):
+        (folder / "__init__.py").write_text("")
+    (commands_dir / "hello.py").write_text(COMMAND_PY.format(help="Say hello"))
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    for name in list(sys.modules):
+        if name.startswith("cmdpkg"):
+            sys.modules.pop(name)
+
+
+def _config(name: str) -> ModuleConfig:
+    return ModuleConfig(name, import_module(name))
+
+
+def test_manifest_maps_commands_to_dotted_paths(cmd_package):
+    manifest = discover.build_manifest([_config("cmdpkg")])
+
+    assert manifest["groups"]["cmdpkg"]["commands"] == [
+        {
+            "name": "hello",
+            "alias": None,
+            "help": "Say hello",
+            "path": "cmdpkg.management.commands.hello.Command",
+            "requires": Bootstrap.NOTHING,
+        }
+    ]
+
+
+def test_manifest_is_reused_while_fingerprint_matches(
+    cmd_package, tmp_path, monkeypatch
+):
+    path = tmp_path / "cache" / "commands.json"
+    first = discover.load_manifest([_config("cmdpkg")], path)
+    assert json.loads(path.read_text()) == first
+
+    def fail(configs):
+        raise AssertionError("manifest should not be rebuilt")
+
+    monkeypatch.setattr(discover, "build_manifest", fail)
+    assert discover.load_manifest([_config("cmdpkg")], path) == first
+
+
+def test_manifest_is_rebuilt_when_command_files_change(cmd_package, tmp_path):
+    path = tmp_path / "commands.json"
+    discover.load_manifest([_config("cmdpkg")], path)
+
+    new_command = cmd_package / "management" / "commands" / "bye.py"
+    new_command.write_text(COMMAND_PY.format(help="Say bye"))
+
+    manifest = discover.load_manifest([_config("cmdpkg")], path)
+    names = [c["name"] for c in manifest["groups"]["cmdpkg"]["commands"]]
+    assert names == ["bye", "hello"]
+
+
+def test_lazy_autodiscover_imports_only_the_executed_command(
+    cmd_package, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(discover, "_installed_modules", lambda: [_config("cmdpkg")])
+    path = tmp_path / "commands.json"
+    discover.load_manifest([_config("cmdpkg")], path)
+    sys.modules.pop("cmdpkg.management.commands.hello")
+
+    app = App(result_action="return_value")
+    discover.lazy_autodiscover(app, path)
+
+    assert "cmdpkg.management.commands.hello" not in sys.modules
+    assert app(["cmdpkg", "hello"]) == "Say hello"
+    assert "cmdpkg.management.commands.hello" in sys.modules
+
+
+def test_scaffolding_command_skips_registry_population(tmp_path, monkeypatch):
+    from fastapi_backend.management.commands.createproject import Command
+
+    calls = []
+    monkeypatch.setattr("fastapi_backend.setup", lambda: calls.append("setup"))
+    app = App(result_action="return_value")
+    Command(app)
+
+    app(["createproject", "demo", "--path", str(tmp_path)])
+
+    assert (tmp_path / "demo" / "manage.py").exists()
+    assert calls == []
+
+
+def test_scaffolding_command_skips_settings_and_module_configs(tmp_path):
+    import os
+    import subprocess
+
+    statement = (
+        "import atexit, sys\n"
+        "atexit.register(lambda: print(sorted(m for m in sys.modules if "
+        "m.startswith(('pydantic_settings', 'fastapi_backend.conf')))))\n"
+        "from fastapi_backend.management import cli\n"
+        f"cli(['createproject', 'demo', '--path', {str(tmp_path)!r}])"
+    )
+    env = dict(os.environ, CACHE_DIR=str(tmp_path / "cache"))
+    for _ in range(2):
+        proc = subprocess.run(
+            [sys.executable, "-c", statement],
+            capture_output=True,
+            text=True,
+            check=False,
+            env=env,
+        )
+        assert proc.stdout.splitlines()[-1] == "[]", proc.stderr
+    assert (tmp_path / "demo" / "manage.py").exists()
+
+
+def test_database_command_runs_inside_open_connection(monkeypatch):
+    from contextlib import asynccontextmanager
+    from fastapi_backend.management.cli import command
+
+    events = []
+    monkeypatch.setattr("fastapi_backend.setup", lambda: events.append("setup"))
+
+    @asynccontextmanager
+    async def open_database():
+        events.append("open")
+        yield
+        events.append("close")
+
+    monkeypatch.setattr(command, "open_database", open_database)
+
+    class DatabaseCommand(BaseCommand):
+        requires = Bootstrap.DATABASE
+
+        async def handle(self):
+            events.append("handle")
+            return "done"
+
+    app = App(result_action="return_value")
+    DatabaseCommand(app)
+
+    assert app(["database"]) == "done"
+    assert events == ["setup", "open", "handle", "close"]
+
+
+def test_profilestartup_writes_trace_events(tmp_path):
+    from fastapi_backend.management.commands.profilestartup import Command
+
+    output = tmp_path / "profile.json"
+    app = App(result_action="return_value")
+    Command(app)
+
+    result = app(["profilestartup", "--output", str(output), "--no-database"])
+
+    assert "Startup profile written" in result
+    profile = json.loads(output.read_text())
+    phases = {event["cat"] for event in profile["traceEvents"]}
+    assert {"startup", "setup", "create_app", "settings.validate"} <= phases
+    assert profile["imports"]["fastapi_backend"] > 0
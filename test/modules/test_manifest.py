@@ -0,0 +1,63 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from fastapi_backend.modules import ModuleConfig
+from fastapi_backend.modules import config as config_module
+from fastapi_backend.modules.manifest import load_manifest, save_manifest
+
+MODULES_PY = """from fastapi_backend.modules import ModuleConfig
+
+
+class ShopConfig(ModuleConfig):
+    name = "shop"
+    label = "store"
+"""
+
+
+@pytest.fixture
+def shop(tmp_path: Path, monkeypatch):
+    pkg = tmp_path / "shop"
+    (pkg / "migrations").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "migrations" / "__init__.py").write_text("")
+    (pkg / "modules.py").write_text(MODULES_PY)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    for name in list(sys.modules):
+        if name == "shop" or name.startswith("shop."):
+            sys.modules.pop(name)
+
+
+def test_warm_start_skips_probing(shop, tmp_path, monkeypatch):
+    path = tmp_path / "modules.json"
+    save_manifest(path, ["shop"], [ModuleConfig.create("shop")])
+
+    def fail(*args):
+        raise AssertionError("should be answered by the manifest")
+
+    monkeypatch.setattr(ModuleConfig, "create", fail)
+    monkeypatch.setattr(config_module, "module_has_submodule", fail)
+    monkeypatch.setattr(config_module, "_path_from_py_module", fail)
+
+    [cfg] = load_manifest(path, ["shop"])
+
+    assert type(cfg).__name__ == "ShopConfig"
+    assert (cfg.name, cfg.label, cfg.path) == ("shop", "store", shop.resolve())
+    assert cfg.migrations_module.__name__ == "shop.migrations"
+    assert cfg.commands_module is None
+
+
+def test_manifest_is_invalidated(shop, tmp_path):
+    path = tmp_path / "modules.json"
+    save_manifest(path, ["shop"], [ModuleConfig.create("shop")])
+
+    assert load_manifest(path, ["shop", "other"]) is None
+    assert load_manifest(path, ["shop"]) is not None
+
+    stat = (shop / "modules.py").stat()
+    os.utime(shop / "modules.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert load_manifest(path, ["shop"]) is None
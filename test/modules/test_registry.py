@@ -0,0 +1,141 @@
+import asyncio
+import time
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from fastapi_backend.modules import ModuleConfig
+from fastapi_backend.modules.registry import ModulesRegistry
+
+
+def make_config(label, depends_on=(), hook=None, **attrs):
+    async def ready(self):
+        if hook is not None:
+            await hook(self)
+
+    cls = type(
+        f"{label.capitalize()}Config",
+        (ModuleConfig,),
+        {"path": Path("."), "depends_on": depends_on, "ready": ready, **attrs},
+    )
+    return cls(label, ModuleType(label))
+
+
+def test_ready_levels_follow_depends_on():
+    registry = ModulesRegistry(
+        [
+            make_config("orders", depends_on=("users", "catalog")),
+            make_config("users"),
+            make_config("catalog", depends_on=("users",)),
+        ]
+    )
+
+    levels = [[cfg.label for cfg in level] for level in registry.ready_levels()]
+
+    assert levels == [["users"], ["catalog"], ["orders"]]
+
+
+@pytest.mark.parametrize(
+    "configs, message",
+    [
+        ([make_config("a", depends_on=("missing",))], "isn't in INSTALLED_MODULES"),
+        (
+            [make_config("a", depends_on=("b",)), make_config("b", depends_on=("a",))],
+            "Circular module dependencies: a, b",
+        ),
+    ],
+)
+def test_ready_levels_reject_invalid_dependencies(configs, message):
+    registry = ModulesRegistry(configs)
+
+    with pytest.raises(RuntimeError, match=message):
+        registry.ready_levels()
+
+
+def test_ready_hooks_run_concurrently_per_level():
+    events = []
+
+    async def sleepy(cfg):
+        events.append(f"start {cfg.label}")
+        await asyncio.sleep(0.05)
+        events.append(f"end {cfg.label}")
+
+    registry = ModulesRegistry(
+        [make_config(f"m{i}", depends_on=("base",), hook=sleepy) for i in range(10)]
+        + [make_config("base", hook=sleepy)]
+    )
+
+    start = time.perf_counter()
+    timings = asyncio.run(registry.run_ready_hooks())
+    elapsed = time.perf_counter() - start
+
+    assert events[:2] == ["start base", "end base"]
+    assert set(timings) == {"base", *(f"m{i}" for i in range(10))}
+    # base, then all ten dependants at once: two hook durations, not eleven.
+    assert elapsed < 0.3
+
+
+def test_failed_or_timed_out_hooks_abort_startup(caplog):
+    ran = []
+
+    async def boom(cfg):
+        raise ValueError("boom")
+
+    async def hang(cfg):
+        await asyncio.sleep(10)
+
+    async def record(cfg):
+        ran.append(cfg.label)
+
+    registry = ModulesRegistry(
+        [
+            make_config("broken", hook=boom),
+            make_config("stuck", hook=hang, ready_timeout=0.01),
+            make_config("after", depends_on=("broken",), hook=record),
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match="broken, stuck"):
+        asyncio.run(registry.run_ready_hooks(timeout=5))
+
+    assert ran == []
+    assert "broken.ready() failed" in caplog.text
+    assert "stuck.ready() timed out" in caplog.text
+
+
+def test_containing_module_config_prefers_innermost_module():
+    registry = ModulesRegistry(
+        [make_config("shop"), make_config("shop.orders"), make_config("shopping")]
+    )
+
+    def label(name):
+        cfg = registry.get_containing_module_config(name)
+        return cfg and cfg.name
+
+    assert label("shop.models") == "shop"
+    assert label("shop.orders.models") == "shop.orders"
+    assert label("shop.orders") == "shop.orders"
+    assert label("shopping.models") == "shopping"
+    assert label("shopper.models") is None
+
+
+def test_frozen_registry_resolves_references_and_rejects_changes():
+    product = type("Product", (), {"__module__": "shop.models"})
+
+    def import_models(self):
+        self.reg.register_model(self.label, product)
+        ModuleConfig.import_models(self)
+
+    registry = ModulesRegistry([make_config("shop", import_models=import_models)])
+
+    assert registry.frozen
+    assert registry.get_model("shop.Product") is product
+    assert registry.get_model("shop", "Product") is product
+    assert registry.get_module_models("shop") == {"Product": product}
+    with pytest.raises(ValueError):
+        registry.get_model("shop.Missing")
+    with pytest.raises(TypeError):
+        registry.all_models["shop"]["Other"] = product
+    with pytest.raises(RuntimeError, match="frozen"):
+        registry.register_model("shop", type("Other", (), {}))
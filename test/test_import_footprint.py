@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+from fastapi_backend.utils.profiling import parse_importtime
+
+HEAVY_PACKAGES = {"pydantic", "pydantic_settings", "tortoise", "mako", "inflect"}
+HEAVY_PACKAGES |= {"cyclopts", "fastapi", "starlette"}
+
+# Generous enough for slow CI machines, far below the ~250ms that loading
+# pydantic-settings alone costs.
+IMPORT_BUDGET_US = 100_000
+
+
+def import_times(statement: str):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import fastapi_backend.conf",
+        "import fastapi_backend.modules",
+        "import fastapi_backend.utils.string",
+    ],
+)
+def test_import_does_not_load_heavy_dependencies(statement):
+    imports = import_times(statement)
+
+    loaded = {name.partition(".")[0] for name, _, _ in imports}
+    assert not loaded & HEAVY_PACKAGES
+    # the last line is the imported module itself, with its cumulative cost
+    assert imports[-1][2] < IMPORT_BUDGET_US
+
+
+def test_settings_load_on_first_access():
+    imports = import_times(
+        "import fastapi_backend.conf as conf, sys;"
+        "assert 'pydantic_settings' not in sys.modules;"
+        "conf.settings.DEBUG"
+    )
+
+    assert "pydantic_settings" in {name for name, _, _ in imports}
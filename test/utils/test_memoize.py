@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from fastapi_backend.core.metrics import render_memoize_metrics
+from fastapi_backend.utils.memoize import get_memoize_metrics, memoize
+
+
+def test_concurrent_callers_share_one_load():
+    calls = []
+
+    @memoize(ttl=60)
+    async def lookup(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    async def main():
+        results = await asyncio.gather(*(lookup("a") for _ in range(20)))
+        assert results == ["A"] * 20
+        assert await lookup("a") == "A"
+
+    asyncio.run(main())
+    assert calls == ["a"]
+    assert lookup.stats() == {
+        "hits": 1,
+        "stale_hits": 0,
+        "misses": 20,
+        "evictions": 0,
+        "size": 1,
+    }
+
+
+def test_entries_expire_and_are_evicted():
+    calls = []
+
+    @memoize(ttl=0.01, maxsize=2)
+    async def lookup(key):
+        calls.append(key)
+        return key
+
+    async def main():
+        for key in ("a", "b", "a", "c", "b"):
+            await lookup(key)
+        assert calls == ["a", "b", "c", "b"]
+        assert lookup.evictions == 2
+
+        await asyncio.sleep(0.02)
+        await lookup("b")
+        assert calls[-1] == "b" and len(calls) == 5
+
+        lookup.invalidate("b")
+        await lookup("b")
+        assert len(calls) == 6
+
+    asyncio.run(main())
+
+
+def test_stale_results_are_served_while_one_refresh_runs():
+    version = 0
+
+    @memoize(ttl=0.2, stale_ttl=60)
+    async def config():
+        nonlocal version
+        version += 1
+        await asyncio.sleep(0.01)
+        return version
+
+    async def main():
+        assert await config() == 1
+        await asyncio.sleep(0.25)
+        assert await asyncio.gather(config(), config(), config()) == [1, 1, 1]
+        await asyncio.sleep(0.02)
+        assert await config() == 2
+
+    asyncio.run(main())
+    assert version == 2
+    assert config.stale_hits == 3
+
+
+def test_failed_loads_are_not_cached():
+    attempts = []
+
+    @memoize()
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError("down")
+        return "up"
+
+    async def main():
+        with pytest.raises(ValueError, match="down"):
+            await flaky()
+        assert await flaky() == "up"
+
+    asyncio.run(main())
+
+
+def test_counters_are_published():
+    @memoize()
+    async def published():
+        return 1
+
+    asyncio.run(published())
+    name = f"{__name__}.test_counters_are_published.<locals>.published"
+    assert get_memoize_metrics()[name]["misses"] == 1
+
+    lines = render_memoize_metrics({name: published.stats()})
+    assert f'memoize_misses_total{{function="{name}"}} 1' in lines
+    assert "# TYPE memoize_size gauge" in lines
+
+
+def test_sync_functions_are_rejected():
+    with pytest.raises(TypeError):
+        memoize()(lambda: None)